@@ -22,13 +22,13 @@ class AppsyncAPI(Construct):
         get_suggestions_lambda: lambda_.Function = kwargs.pop('get_suggestions_lambda', None)
         get_analytics_lambda: lambda_.Function = kwargs.pop('get_analytics_lambda', None)
         get_saved_profiles_lambda: lambda_.Function = kwargs.pop('get_saved_profiles_lambda', None)
-        suggestions_cron_lambda: lambda_.Function = kwargs.pop('suggestions_cron_lambda', None)
         email_queue: sqs.Queue = kwargs.pop('email_queue', None)
+        suggestion_queue: sqs.Queue = kwargs.pop('suggestion_queue', None)
 
         super().__init__(scope, construct_id, **kwargs)
 
         self.config = config
-        self.api = self._create_api(cognito_user_pool, entity_table, email_queue)
+        self.api = self._create_api(cognito_user_pool, entity_table, email_queue, suggestion_queue)
 
         # Set up data sources and resolvers
         entity_table_data_source = self._setup_entity_table_data_source(entity_table)
@@ -42,17 +42,12 @@ class AppsyncAPI(Construct):
             ),
         )
         email_queue.grant_send_messages(sqs_data_source.grant_principal)
-
-        # Create a Lambda data source for the suggestions cron
-        suggestions_cron_ds = self.api.add_lambda_data_source(
-            f'{self.config.prefix}-suggestions-cron-data-source',
-            suggestions_cron_lambda,
-        )
+        suggestion_queue.grant_send_messages(sqs_data_source.grant_principal)
 
         self._setup_llm_resolvers(llm_rag_api)
         self._setup_chat_resolvers(entity_table_data_source)
-        self._setup_startup_resolvers(entity_table_data_source, suggestions_cron_ds)
-        self._setup_enabler_resolvers(entity_table_data_source, suggestions_cron_ds)
+        self._setup_startup_resolvers(entity_table_data_source, sqs_data_source)
+        self._setup_enabler_resolvers(entity_table_data_source, sqs_data_source)
         self._setup_entity_list_resolvers(entity_table_data_source)
         self._setup_suggestion_resolvers(get_suggestions_lambda)
         self._setup_profile_resolvers(entity_table_data_source, get_saved_profiles_lambda)
@@ -70,6 +65,7 @@ class AppsyncAPI(Construct):
         cognito_user_pool: cognito.UserPool,
         entity_table: dynamodb.Table,
         email_queue: sqs.Queue,
+        suggestion_queue: sqs.Queue,
     ) -> appsync.GraphqlApi:
         """Creates and configures the GraphQL API."""
         graphql_api_name = f'{self.config.prefix}-graphql-service'
@@ -108,6 +104,8 @@ class AppsyncAPI(Construct):
                 'TABLE_NAME': entity_table.table_name,
                 'EMAIL_QUEUE_URL': email_queue.queue_url,
                 'EMAIL_QUEUE_NAME': email_queue.queue_name,
+                'SUGGESTION_QUEUE_URL': suggestion_queue.queue_url,
+                'SUGGESTION_QUEUE_NAME': suggestion_queue.queue_name,
                 'ACCOUNT_ID': self.config.account_id,
             },
         )
@@ -178,10 +176,13 @@ class AppsyncAPI(Construct):
     def _setup_startup_resolvers(
         self,
         entity_table_data_source: appsync.DynamoDbDataSource,
-        suggestions_cron_ds: appsync.LambdaDataSource,
+        sqs_data_source: appsync.HttpDataSource,
     ) -> None:
         """Sets up DynamoDB data source and resolvers for startup functionality."""
         folder_root = './infra/appsync/appsync_js/startups'
+        enqueue_suggestion_generation_js = (
+            './infra/appsync/appsync_js/entities/enqueueSuggestionGeneration.js'
+        )
 
         create_startup_js = f'{folder_root}/createStartup.js'
         entity_table_data_source.create_resolver(
@@ -209,22 +210,8 @@ class AppsyncAPI(Construct):
             f'{self.config.prefix}-TriggerSuggestionsFunction',
             name=f'{self.config.prefix_no_symbols}TriggerSuggestionsFunction',
             api=self.api,
-            data_source=suggestions_cron_ds,
-            code=appsync.Code.from_inline(
-                """
-                export function request(ctx) {
-                    return {
-                        operation: "Invoke",
-                        invocationType: "Event",
-                        payload: ctx,
-                    };
-                }
-
-                export function response(ctx) {
-                    return ctx.prev.result;
-                }
-                """
-            ),
+            data_source=sqs_data_source,
+            code=appsync.Code.from_asset(enqueue_suggestion_generation_js),
             runtime=appsync.FunctionRuntime.JS_1_0_0,
         )
 
@@ -260,10 +247,13 @@ class AppsyncAPI(Construct):
     def _setup_enabler_resolvers(
         self,
         entity_table_data_source: appsync.DynamoDbDataSource,
-        suggestions_cron_ds: appsync.LambdaDataSource,
+        sqs_data_source: appsync.HttpDataSource,
     ) -> None:
         """Sets up DynamoDB data source and resolvers for enabler functionality."""
         folder_root = './infra/appsync/appsync_js/enablers'
+        enqueue_suggestion_generation_js = (
+            './infra/appsync/appsync_js/entities/enqueueSuggestionGeneration.js'
+        )
 
         create_enabler_js = f'{folder_root}/createEnabler.js'
         entity_table_data_source.create_resolver(
@@ -291,22 +281,8 @@ class AppsyncAPI(Construct):
             f'{self.config.prefix}-TriggerEnablerSuggestionsFunction',
             name=f'{self.config.prefix_no_symbols}TriggerEnablerSuggestionsFunction',
             api=self.api,
-            data_source=suggestions_cron_ds,
-            code=appsync.Code.from_inline(
-                """
-                export function request(ctx) {
-                    return {
-                        operation: "Invoke",
-                        invocationType: "Event",
-                        payload: ctx,
-                    };
-                }
-
-                export function response(ctx) {
-                    return ctx.prev.result;
-                }
-                """
-            ),
+            data_source=sqs_data_source,
+            code=appsync.Code.from_asset(enqueue_suggestion_generation_js),
             runtime=appsync.FunctionRuntime.JS_1_0_0,
         )
 
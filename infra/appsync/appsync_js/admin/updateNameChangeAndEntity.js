@@ -37,6 +37,8 @@ export function request(ctx) {
 
   // If approved, update both the request status and the entity name using a transaction
   const nameField = entityType === 'STARTUP' ? 'startUpName' : 'enablerName';
+  // Stamped on the METADATA item too, so the catalog stream knows when it has applied this write
+  const catalogVersion = util.autoId();
 
   return {
     operation: 'TransactWriteItems',
@@ -68,13 +70,37 @@ export function request(ctx) {
           rangeKey: `${entityType}#METADATA`
         }),
         update: {
-          expression: `SET #${nameField} = :${nameField}, #updatedAt = :updatedAt`,
+          expression: `SET #${nameField} = :${nameField}, #catalogVersion = :catalogVersion, #GSI3PK = :GSI3PK, #updatedAt = :updatedAt`,
           expressionValues: {
             [`:${nameField}`]: util.dynamodb.toDynamoDB(newName),
+            ':catalogVersion': util.dynamodb.toDynamoDB(catalogVersion),
+            ':GSI3PK': util.dynamodb.toDynamoDB(entityType),
             ':updatedAt': util.dynamodb.toDynamoDB(updatedAt)
           },
           expressionNames: {
             [`#${nameField}`]: nameField,
+            '#catalogVersion': 'catalogVersion',
+            '#GSI3PK': 'GSI3PK',
+            '#updatedAt': 'updatedAt'
+          }
+        }
+      },
+      // Bump the catalog version so cached entity snapshots are refreshed
+      {
+        table: tableName,
+        operation: 'UpdateItem',
+        key: util.dynamodb.toMapValues({
+          hashKey: 'CATALOG',
+          rangeKey: 'CATALOG#VERSION'
+        }),
+        update: {
+          expression: 'SET #catalogVersion = :catalogVersion, #updatedAt = :updatedAt',
+          expressionValues: {
+            ':catalogVersion': util.dynamodb.toDynamoDB(catalogVersion),
+            ':updatedAt': util.dynamodb.toDynamoDB(updatedAt)
+          },
+          expressionNames: {
+            '#catalogVersion': 'catalogVersion',
             '#updatedAt': 'updatedAt'
           }
         }
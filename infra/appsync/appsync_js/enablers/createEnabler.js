@@ -6,6 +6,8 @@ export function request(ctx) {
     const createdAt = timestamp;
     const updatedAt = timestamp;
     const ksuid = util.autoKsuid();
+    // Stamped on the METADATA item too, so the catalog stream knows when it has applied this write
+    const catalogVersion = util.autoId();
 
     const tableName = ctx.env.TABLE_NAME;
 
@@ -31,8 +33,11 @@ export function request(ctx) {
             startupStagePreference: ctx.args.input.startupStagePreference,
             preferredBusinessModels: ctx.args.input.preferredBusinessModels,
             forSuggestionGeneration: true,
+            GSI4PK: 'SUGGESTION#PENDING',
             GSI1PK: ksuid,
+            GSI3PK: 'ENABLER',
             createdAt,
+            catalogVersion,
             updatedAt,
         })
     );
@@ -47,6 +52,7 @@ export function request(ctx) {
                 enablerId,
                 contacts: contacts,
                 GSI1PK: ksuid,
+                GSI3PK: 'ENABLER',
                 createdAt,
             })
         );
@@ -61,6 +67,7 @@ export function request(ctx) {
                 enablerId,
                 investmentCriteria: ctx.args.input.investmentCriteria,
                 GSI1PK: ksuid,
+                GSI3PK: 'ENABLER',
                 createdAt,
             })
         );
@@ -75,11 +82,22 @@ export function request(ctx) {
                 enablerId,
                 portfolio: ctx.args.input.portfolio,
                 GSI1PK: ksuid,
+                GSI3PK: 'ENABLER',
                 createdAt,
             })
         );
     }
 
+    // Bump the catalog version so cached entity snapshots are refreshed
+    batchPutItems.push(
+        util.dynamodb.toMapValues({
+            hashKey: 'CATALOG',
+            rangeKey: 'CATALOG#VERSION',
+            catalogVersion,
+            updatedAt,
+        })
+    );
+
     return {
         operation: 'BatchPutItem',
         tables: {
@@ -42,9 +42,25 @@ export function request(ctx) {
     ]
 
     const forSuggestionGenerationChanged = forSuggestionGenerationChangedFields.some(field => ctx.args.input[field] !== undefined);
-    updateExpression.push('#forSuggestionGeneration = :forSuggestionGeneration');
-    expressionValues[`:forSuggestionGeneration`] = forSuggestionGenerationChanged;
-    expressionNames[`#forSuggestionGeneration`] = 'forSuggestionGeneration';
+    // Flag the entity and add it to the sparse pending suggestion index, other edits leave
+    // a pending flag untouched
+    if (forSuggestionGenerationChanged) {
+        updateExpression.push('#forSuggestionGeneration = :forSuggestionGeneration');
+        expressionValues[`:forSuggestionGeneration`] = true;
+        expressionNames[`#forSuggestionGeneration`] = 'forSuggestionGeneration';
+        updateExpression.push('#GSI4PK = :GSI4PK');
+        expressionValues[':GSI4PK'] = 'SUGGESTION#PENDING';
+        expressionNames['#GSI4PK'] = 'GSI4PK';
+    }
+    // Stamped on the METADATA item too, so the catalog stream knows when it has applied this write
+    const catalogVersion = util.autoId();
+    updateExpression.push('#catalogVersion = :catalogVersion');
+    expressionValues[':catalogVersion'] = catalogVersion;
+    expressionNames['#catalogVersion'] = 'catalogVersion';
+    // Profiles created before the GSI3PK index get their entity type key on their next edit
+    updateExpression.push('#GSI3PK = :GSI3PK');
+    expressionValues[':GSI3PK'] = 'ENABLER';
+    expressionNames['#GSI3PK'] = 'GSI3PK';
     updateExpression.push('#updatedAt = :updatedAt');
     expressionValues[':updatedAt'] = updatedAt;
     expressionNames['#updatedAt'] = 'updatedAt';
@@ -82,9 +98,10 @@ export function request(ctx) {
                 rangeKey: 'ENABLER#CONTACTS'
             }),
             update: {
-                expression: 'SET contacts = :contacts',
+                expression: 'SET contacts = :contacts, GSI3PK = :GSI3PK',
                 expressionValues: util.dynamodb.toMapValues({
-                    ':contacts': ctx.args.input.contacts
+                    ':contacts': ctx.args.input.contacts,
+                    ':GSI3PK': 'ENABLER'
                 }),
             },
             condition: { expression: "attribute_exists(hashKey)" }
@@ -101,9 +118,10 @@ export function request(ctx) {
                 rangeKey: 'ENABLER#INVESTMENT_CRITERIA'
             }),
             update: {
-                expression: 'SET investmentCriteria = :investmentCriteria',
+                expression: 'SET investmentCriteria = :investmentCriteria, GSI3PK = :GSI3PK',
                 expressionValues: util.dynamodb.toMapValues({
-                    ':investmentCriteria': ctx.args.input.investmentCriteria
+                    ':investmentCriteria': ctx.args.input.investmentCriteria,
+                    ':GSI3PK': 'ENABLER'
                 }),
             },
             condition: { expression: "attribute_exists(hashKey)" }
@@ -120,15 +138,33 @@ export function request(ctx) {
                 rangeKey: 'ENABLER#PORTFOLIO'
             }),
             update: {
-                expression: 'SET portfolio = :portfolio',
+                expression: 'SET portfolio = :portfolio, GSI3PK = :GSI3PK',
                 expressionValues: util.dynamodb.toMapValues({
-                    ':portfolio': ctx.args.input.portfolio
+                    ':portfolio': ctx.args.input.portfolio,
+                    ':GSI3PK': 'ENABLER'
                 }),
             },
             condition: { expression: "attribute_exists(hashKey)" }
         });
     }
 
+    // Bump the catalog version so cached entity snapshots are refreshed
+    transactItems.push({
+        table: tableName,
+        operation: 'UpdateItem',
+        key: util.dynamodb.toMapValues({
+            hashKey: 'CATALOG',
+            rangeKey: 'CATALOG#VERSION'
+        }),
+        update: {
+            expression: 'SET catalogVersion = :catalogVersion, updatedAt = :updatedAt',
+            expressionValues: util.dynamodb.toMapValues({
+                ':catalogVersion': catalogVersion,
+                ':updatedAt': updatedAt
+            }),
+        }
+    });
+
     return {
         operation: 'TransactWriteItems',
         transactItems: transactItems
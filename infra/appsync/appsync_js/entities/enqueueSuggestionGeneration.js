@@ -0,0 +1,45 @@
+import { runtime, util } from '@aws-appsync/utils'
+
+export function request(ctx) {
+	const { id } = ctx.prev.result
+
+	// Nothing to regenerate when the update failed
+	if (!id) {
+		runtime.earlyReturn(ctx.prev.result)
+	}
+
+	const accountId = ctx.env.ACCOUNT_ID
+	const queueName = ctx.env.SUGGESTION_QUEUE_NAME
+	const queueUrl = ctx.env.SUGGESTION_QUEUE_URL
+
+	// The suggestion cron coalesces queued triggers per entity, so every edit can enqueue
+	const requestBody = {
+		'entity_id': id,
+	}
+
+	let body = 'Action=SendMessage&Version=2012-11-05'
+	const messageBody = util.urlEncode(JSON.stringify(requestBody))
+	const queueUrlEncoded = util.urlEncode(queueUrl)
+	body = `${body}&MessageBody=${messageBody}&QueueUrl=${queueUrlEncoded}`
+
+	return {
+		version: '2018-05-29',
+		method: 'POST',
+		resourcePath: `/${accountId}/${queueName}`,
+		params: {
+			body,
+			headers: {
+				'content-type': 'application/x-www-form-urlencoded',
+			},
+		},
+	}
+}
+
+export function response(ctx) {
+    // A failed enqueue leaves the entity pending for the nightly run, so the update still succeeds
+    if (ctx.error) {
+        console.log(`Failed to enqueue suggestion generation: ${ctx.error.message}`)
+    }
+
+    return ctx.prev.result
+}
@@ -6,6 +6,8 @@ export function request(ctx) {
     const createdAt = timestamp;
     const updatedAt = timestamp;
     const ksuid = util.autoKsuid();
+    // Stamped on the METADATA item too, so the catalog stream knows when it has applied this write
+    const catalogVersion = util.autoId();
 
     const tableName = ctx.env.TABLE_NAME;
 
@@ -26,8 +28,11 @@ export function request(ctx) {
             location: ctx.args.input.location,
             industries: ctx.args.input.industries,
             forSuggestionGeneration: true,
+            GSI4PK: "SUGGESTION#PENDING",
             GSI1PK: ksuid,
+            GSI3PK: "STARTUP",
             createdAt,
+            catalogVersion,
             updatedAt,
         })
     );
@@ -40,6 +45,7 @@ export function request(ctx) {
             startupId,
             founders: founders,
             GSI1PK: ksuid,
+            GSI3PK: "STARTUP",
             createdAt,
         })
     );
@@ -52,6 +58,7 @@ export function request(ctx) {
             startupId,
             contacts: contacts,
             GSI1PK: ksuid,
+            GSI3PK: "STARTUP",
             createdAt,
         })
     );
@@ -64,10 +71,21 @@ export function request(ctx) {
             startupId,
             milestones: milestones,
             GSI1PK: ksuid,
+            GSI3PK: "STARTUP",
             createdAt,
         })
     );
 
+    // Bump the catalog version so cached entity snapshots are refreshed
+    batchPutItems.push(
+        util.dynamodb.toMapValues({
+            hashKey: "CATALOG",
+            rangeKey: "CATALOG#VERSION",
+            catalogVersion,
+            updatedAt,
+        })
+    );
+
     return {
         operation: "BatchPutItem",
         tables: {
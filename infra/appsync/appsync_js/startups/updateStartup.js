@@ -33,9 +33,25 @@ export function request(ctx) {
         'milestones',
     ]
     const forSuggestionGenerationChanged = forSuggestionGenerationChangedFields.some(field => ctx.args.input[field] !== undefined);
-    updateExpression.push('#forSuggestionGeneration = :forSuggestionGeneration');
-    expressionValues[`:forSuggestionGeneration`] = forSuggestionGenerationChanged;
-    expressionNames[`#forSuggestionGeneration`] = 'forSuggestionGeneration';
+    // Flag the entity and add it to the sparse pending suggestion index, other edits leave
+    // a pending flag untouched
+    if (forSuggestionGenerationChanged) {
+        updateExpression.push('#forSuggestionGeneration = :forSuggestionGeneration');
+        expressionValues[`:forSuggestionGeneration`] = true;
+        expressionNames[`#forSuggestionGeneration`] = 'forSuggestionGeneration';
+        updateExpression.push('#GSI4PK = :GSI4PK');
+        expressionValues[':GSI4PK'] = 'SUGGESTION#PENDING';
+        expressionNames['#GSI4PK'] = 'GSI4PK';
+    }
+    // Stamped on the METADATA item too, so the catalog stream knows when it has applied this write
+    const catalogVersion = util.autoId();
+    updateExpression.push('#catalogVersion = :catalogVersion');
+    expressionValues[':catalogVersion'] = catalogVersion;
+    expressionNames['#catalogVersion'] = 'catalogVersion';
+    // Profiles created before the GSI3PK index get their entity type key on their next edit
+    updateExpression.push('#GSI3PK = :GSI3PK');
+    expressionValues[':GSI3PK'] = 'STARTUP';
+    expressionNames['#GSI3PK'] = 'GSI3PK';
     updateExpression.push('#updatedAt = :updatedAt');
     expressionValues[':updatedAt'] = updatedAt;
     expressionNames['#updatedAt'] = 'updatedAt';
@@ -74,9 +90,10 @@ export function request(ctx) {
                 rangeKey: 'STARTUP#FOUNDERS'
             }),
             update: {
-                expression: `SET founders = :founders`,
+                expression: `SET founders = :founders, GSI3PK = :GSI3PK`,
                 expressionValues: util.dynamodb.toMapValues({
-                    ':founders': ctx.args.input.founders
+                    ':founders': ctx.args.input.founders,
+                    ':GSI3PK': 'STARTUP'
                 }),
             },
             condition: { expression: "attribute_exists(hashKey)" }
@@ -93,9 +110,10 @@ export function request(ctx) {
                 rangeKey: 'STARTUP#CONTACTS'
             }),
             update: {
-                expression: `SET contacts = :contacts`,
+                expression: `SET contacts = :contacts, GSI3PK = :GSI3PK`,
                 expressionValues: util.dynamodb.toMapValues({
-                    ':contacts': ctx.args.input.contacts
+                    ':contacts': ctx.args.input.contacts,
+                    ':GSI3PK': 'STARTUP'
                 }),
             },
             condition: { expression: "attribute_exists(hashKey)" }
@@ -112,15 +130,33 @@ export function request(ctx) {
                 rangeKey: 'STARTUP#MILESTONES'
             }),
             update: {
-                expression: `SET milestones = :milestones`,
+                expression: `SET milestones = :milestones, GSI3PK = :GSI3PK`,
                 expressionValues: util.dynamodb.toMapValues({
-                    ':milestones': ctx.args.input.milestones
+                    ':milestones': ctx.args.input.milestones,
+                    ':GSI3PK': 'STARTUP'
                 }),
             },
             condition: { expression: "attribute_exists(hashKey)" }
         });
     }
 
+    // Bump the catalog version so cached entity snapshots are refreshed
+    transactItems.push({
+        table: tableName,
+        operation: 'UpdateItem',
+        key: util.dynamodb.toMapValues({
+            hashKey: 'CATALOG',
+            rangeKey: 'CATALOG#VERSION'
+        }),
+        update: {
+            expression: 'SET catalogVersion = :catalogVersion, updatedAt = :updatedAt',
+            expressionValues: util.dynamodb.toMapValues({
+                ':catalogVersion': catalogVersion,
+                ':updatedAt': updatedAt
+            }),
+        }
+    });
+
     return {
         operation: 'TransactWriteItems',
         transactItems: transactItems
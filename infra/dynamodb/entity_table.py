@@ -4,6 +4,14 @@ from constructs import Construct
 
 from infra.config import Config
 
+# Append-only: the index count context value stages these in order
+ENTITY_TABLE_INDEXES = (
+    ('GSI1PK', dynamodb.ProjectionType.ALL, None),
+    ('GSI2PK', dynamodb.ProjectionType.ALL, None),
+    ('GSI3PK', dynamodb.ProjectionType.ALL, None),
+    ('GSI4PK', dynamodb.ProjectionType.INCLUDE, ['updatedAt']),
+)
+
 
 class EntityTable(Construct):
     def __init__(self, scope: Construct, construct_id: str, config: Config, **kwargs) -> None:
@@ -20,19 +28,35 @@ class EntityTable(Construct):
             partition_key=dynamodb.Attribute(name='hashKey', type=dynamodb.AttributeType.STRING),
             sort_key=dynamodb.Attribute(name='rangeKey', type=dynamodb.AttributeType.STRING),
             billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
+            stream=dynamodb.StreamViewType.NEW_IMAGE,
+            time_to_live_attribute='expiresAt',
             removal_policy=RemovalPolicy.DESTROY,
         )
-        self.entity_table.add_global_secondary_index(
-            index_name='GSI1PK',
-            partition_key=dynamodb.Attribute(name='GSI1PK', type=dynamodb.AttributeType.STRING),
-            projection_type=dynamodb.ProjectionType.ALL,
-            sort_key=dynamodb.Attribute(name='rangeKey', type=dynamodb.AttributeType.STRING),
-        )
-        self.entity_table.add_global_secondary_index(
-            index_name='GSI2PK',
-            partition_key=dynamodb.Attribute(name='GSI2PK', type=dynamodb.AttributeType.STRING),
-            projection_type=dynamodb.ProjectionType.ALL,
-            sort_key=dynamodb.Attribute(name='rangeKey', type=dynamodb.AttributeType.STRING),
+        # CloudFormation creates or deletes at most one GSI per table update, so an existing
+        # table gets new indexes one deployment at a time through the entityTableIndexCount
+        # context value, which scripts/stage_entity_indexes.py sets before every deploy (see
+        # README). A new table is created with every index at once.
+        global_secondary_indexes = ENTITY_TABLE_INDEXES
+        index_count = int(
+            self.node.try_get_context('entityTableIndexCount') or len(global_secondary_indexes)
         )
+        if not 1 <= index_count <= len(global_secondary_indexes):
+            raise ValueError(
+                f'entityTableIndexCount must be between 1 and {len(global_secondary_indexes)}, '
+                f'got {index_count}'
+            )
+
+        for index_name, projection_type, non_key_attributes in global_secondary_indexes[
+            :index_count
+        ]:
+            self.entity_table.add_global_secondary_index(
+                index_name=index_name,
+                partition_key=dynamodb.Attribute(
+                    name=index_name, type=dynamodb.AttributeType.STRING
+                ),
+                projection_type=projection_type,
+                non_key_attributes=non_key_attributes,
+                sort_key=dynamodb.Attribute(name='rangeKey', type=dynamodb.AttributeType.STRING),
+            )
 
         self.table_arn = self.entity_table.table_arn
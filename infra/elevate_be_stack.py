@@ -7,6 +7,8 @@ from infra.cognito.user_pool import UserPoolConstruct
 from infra.config import Config
 from infra.dynamodb.entity_table import EntityTable
 from infra.functions.email_sender import EmailSender
+from infra.functions.entity_catalog_stream import EntityCatalogStream
+from infra.functions.entity_migrations import EntityMigrations
 from infra.functions.get_analytics import GetAnalytics
 from infra.functions.get_saved_profiles import GetSavedProfiles
 from infra.functions.get_suggestions import GetSuggestions
@@ -107,6 +109,24 @@ class ElevateBeStack(Stack):
             common_dependencies_layer=common_dependencies_layer,
         )
 
+        # Entity Catalog Stream Processor
+        EntityCatalogStream(
+            self,
+            'EntityCatalogStream',
+            config=self.config,
+            entity_table=entity_table,
+            common_dependencies_layer=common_dependencies_layer,
+        )
+
+        # Entity table data migrations, run by every deployment
+        EntityMigrations(
+            self,
+            'EntityMigrations',
+            config=self.config,
+            entity_table=entity_table,
+            common_dependencies_layer=common_dependencies_layer,
+        )
+
         # ---------------------------------------------------------------------------- #
         #                                Appsync Config                                #
         # ---------------------------------------------------------------------------- #
@@ -120,8 +140,8 @@ class ElevateBeStack(Stack):
             get_suggestions_lambda=get_suggestions.get_suggestions_lambda,
             get_analytics_lambda=get_analytics.get_analytics_lambda,
             get_saved_profiles_lambda=get_saved_profiles.get_saved_profiles_lambda,
-            suggestions_cron_lambda=suggestions_cron_lambda.lambda_suggestions_cron,
             email_queue=email_sender.email_queue,
+            suggestion_queue=suggestions_cron_lambda.suggestion_queue,
         )
 
         llm_rag_api.set_appsync_api(api)
@@ -0,0 +1,171 @@
+from aws_cdk import (
+    CfnOutput,
+    Duration,
+    aws_iam,
+    aws_lambda,
+    aws_lambda_event_sources,
+    aws_logs,
+    aws_sqs,
+)
+from aws_cdk.aws_lambda_python_alpha import (
+    BundlingOptions,
+    PythonFunction,
+    PythonLayerVersion,
+)
+from constructs import Construct
+
+from infra.config import Config
+from infra.dynamodb.entity_table import EntityTable
+from infra.functions.lambda_utils import LambdaUtils
+
+
+class EntityCatalogStream(Construct):
+    """
+    Class to create the infrastructure for the Entity Catalog stream processor Lambda function.
+    """
+
+    def __init__(self, scope: Construct, id: str, config: Config, **kwargs) -> None:
+        self.common_dependencies_layer: PythonLayerVersion = kwargs.pop(
+            'common_dependencies_layer', None
+        )
+        self.entity_table: EntityTable = kwargs.pop('entity_table', None)
+
+        super().__init__(scope, id, **kwargs)
+
+        self.config = config
+
+        self.create_dead_letter_queue()
+        self.create_lambda_function()
+        self.generate_cloudformation_outputs()
+
+    def create_dead_letter_queue(self):
+        """
+        Create the queue that keeps the details of stream batches that exhausted their retries
+        """
+        self.entity_catalog_stream_dead_letter_queue = aws_sqs.Queue(
+            self,
+            f'{self.config.prefix}-entity-catalog-stream-dlq',
+            queue_name=f'{self.config.prefix}-entity-catalog-stream-dlq',
+            retention_period=Duration.days(14),
+        )
+
+    def create_lambda_function(self):
+        """
+        Create the Lambda Function that applies entity table stream records to the
+        materialized entity catalog and create necessary IAM roles and permissions.
+        """
+        # Define the IAM role
+        lambda_role = aws_iam.Role(
+            self,
+            'LambdaExecutionRole',
+            assumed_by=aws_iam.ServicePrincipal('lambda.amazonaws.com'),
+            managed_policies=[
+                aws_iam.ManagedPolicy.from_aws_managed_policy_name(
+                    'service-role/AWSLambdaBasicExecutionRole'
+                ),
+                aws_iam.ManagedPolicy.from_aws_managed_policy_name(
+                    'service-role/AWSLambdaVPCAccessExecutionRole'
+                ),
+            ],
+        )
+
+        lambda_role.add_to_policy(
+            aws_iam.PolicyStatement(
+                actions=[
+                    'dynamodb:Query',
+                    'dynamodb:GetItem',
+                    'dynamodb:Scan',
+                    'dynamodb:UpdateItem',
+                    'dynamodb:DeleteItem',
+                    'dynamodb:BatchWriteItem',
+                ],
+                resources=[
+                    self.entity_table.table_arn,
+                    f'{self.entity_table.table_arn}/index/*',
+                ],
+            )
+        )
+
+        self.entity_catalog_stream_lambda = PythonFunction(
+            self,
+            f'{self.config.prefix}-entity-catalog-stream',
+            function_name=f'{self.config.prefix}-entity-catalog-stream',
+            runtime=aws_lambda.Runtime.PYTHON_3_12,
+            handler='handler',
+            entry='src',
+            index='entity_catalog_stream/handler.py',
+            timeout=Duration.minutes(2),
+            log_retention=aws_logs.RetentionDays.ONE_MONTH,
+            memory_size=512,
+            # A single writer keeps catalog revisions from conflicting across shards
+            reserved_concurrent_executions=1,
+            environment={
+                'STAGE': self.config.stage,
+                'LOG_LEVEL': self.config.log_level,
+                'REGION': self.config.region,
+                'ENTITIES_TABLE': self.entity_table.table_name,
+                'ENTITY_SCAN_SEGMENTS': '4',
+                'POWERTOOLS_LOG_LEVEL': 'DEBUG' if self.config.stage == 'dev' else 'INFO',
+                'POWERTOOLS_SERVICE_NAME': f'{self.config.prefix}-entity-catalog-stream-service',
+                'POWERTOOLS_LOGGER_LOG_EVENT': 'true' if self.config.stage == 'dev' else 'false',
+            },
+            role=lambda_role,
+            layers=[self.common_dependencies_layer],
+            bundling=BundlingOptions(
+                asset_excludes=LambdaUtils.get_asset_excludes(
+                    included_folders=['entity_catalog_stream', 'shared_modules']
+                ),
+            ),
+        )
+
+        # Only profile items and the catalog version item, never the catalog document itself
+        self.entity_catalog_stream_lambda.add_event_source(
+            aws_lambda_event_sources.DynamoEventSource(
+                self.entity_table.entity_table,
+                starting_position=aws_lambda.StartingPosition.TRIM_HORIZON,
+                batch_size=100,
+                max_batching_window=Duration.seconds(1),
+                retry_attempts=10,
+                # A failing record is split off from the rest of its batch and, once it exhausts
+                # its retries, sent to the dead letter queue instead of being dropped silently
+                bisect_batch_on_error=True,
+                on_failure=aws_lambda_event_sources.SqsDlq(
+                    self.entity_catalog_stream_dead_letter_queue
+                ),
+                filters=[
+                    aws_lambda.FilterCriteria.filter(
+                        {
+                            'dynamodb': {
+                                'Keys': {
+                                    'rangeKey': {
+                                        'S': [
+                                            {'prefix': 'STARTUP#'},
+                                            {'prefix': 'ENABLER#'},
+                                            'CATALOG#VERSION',
+                                        ]
+                                    }
+                                }
+                            }
+                        }
+                    )
+                ],
+            )
+        )
+
+    def generate_cloudformation_outputs(self):
+        """
+        Method to add the relevant CloudFormation outputs.
+        """
+        CfnOutput(
+            self,
+            'FunctionArn',
+            value=self.entity_catalog_stream_lambda.function_arn,
+            description='Function ARN',
+        )
+
+        CfnOutput(
+            self,
+            'DeadLetterQueueUrl',
+            value=self.entity_catalog_stream_dead_letter_queue.queue_url,
+            description='Entity Catalog Stream Dead Letter Queue URL',
+        )
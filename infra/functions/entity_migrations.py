@@ -0,0 +1,121 @@
+from aws_cdk import (
+    CfnOutput,
+    Duration,
+    aws_iam,
+    aws_lambda,
+    aws_logs,
+    triggers,
+)
+from aws_cdk.aws_lambda_python_alpha import (
+    BundlingOptions,
+    PythonFunction,
+    PythonLayerVersion,
+)
+from constructs import Construct
+
+from infra.config import Config
+from infra.dynamodb.entity_table import EntityTable
+from infra.functions.lambda_utils import LambdaUtils
+
+
+class EntityMigrations(Construct):
+    """
+    Class to create the infrastructure for the Entity Migrations Lambda function, which runs
+    the entity table data migrations as part of every deployment.
+    """
+
+    def __init__(self, scope: Construct, id: str, config: Config, **kwargs) -> None:
+        self.common_dependencies_layer: PythonLayerVersion = kwargs.pop(
+            'common_dependencies_layer', None
+        )
+        self.entity_table: EntityTable = kwargs.pop('entity_table', None)
+
+        super().__init__(scope, id, **kwargs)
+
+        self.config = config
+
+        self.create_lambda_function()
+        self.create_trigger()
+        self.generate_cloudformation_outputs()
+
+    def create_lambda_function(self):
+        """
+        Create the Lambda Function that runs the entity table data migrations and create
+        necessary IAM roles and permissions.
+        """
+        # Define the IAM role
+        lambda_role = aws_iam.Role(
+            self,
+            'LambdaExecutionRole',
+            assumed_by=aws_iam.ServicePrincipal('lambda.amazonaws.com'),
+            managed_policies=[
+                aws_iam.ManagedPolicy.from_aws_managed_policy_name(
+                    'service-role/AWSLambdaBasicExecutionRole'
+                ),
+            ],
+        )
+
+        lambda_role.add_to_policy(
+            aws_iam.PolicyStatement(
+                actions=[
+                    'dynamodb:GetItem',
+                    'dynamodb:Scan',
+                    'dynamodb:UpdateItem',
+                ],
+                resources=[self.entity_table.table_arn],
+            )
+        )
+
+        self.entity_migrations_lambda = PythonFunction(
+            self,
+            f'{self.config.prefix}-entity-migrations',
+            function_name=f'{self.config.prefix}-entity-migrations',
+            runtime=aws_lambda.Runtime.PYTHON_3_12,
+            handler='handler',
+            entry='src',
+            index='entity_migrations/handler.py',
+            timeout=Duration.minutes(10),
+            log_retention=aws_logs.RetentionDays.ONE_MONTH,
+            memory_size=512,
+            environment={
+                'STAGE': self.config.stage,
+                'LOG_LEVEL': self.config.log_level,
+                'REGION': self.config.region,
+                'ENTITIES_TABLE': self.entity_table.table_name,
+                'POWERTOOLS_LOG_LEVEL': 'DEBUG' if self.config.stage == 'dev' else 'INFO',
+                'POWERTOOLS_SERVICE_NAME': f'{self.config.prefix}-entity-migrations-service',
+            },
+            role=lambda_role,
+            layers=[self.common_dependencies_layer],
+            bundling=BundlingOptions(
+                asset_excludes=LambdaUtils.get_asset_excludes(
+                    included_folders=['entity_migrations', 'shared_modules']
+                ),
+            ),
+        )
+
+    def create_trigger(self):
+        """
+        Invoke the migrations once the entity table and its indexes are updated. A failed
+        migration fails the deployment. Completed migrations are skipped, so the trigger runs
+        on every deployment that changes the function.
+        """
+        triggers.Trigger(
+            self,
+            'EntityMigrationsTrigger',
+            handler=self.entity_migrations_lambda,
+            execute_after=[self.entity_table.entity_table],
+            execute_on_handler_change=True,
+            timeout=Duration.minutes(10),
+        )
+
+    def generate_cloudformation_outputs(self):
+        """
+        Method to add the relevant CloudFormation outputs.
+        """
+        CfnOutput(
+            self,
+            'FunctionArn',
+            value=self.entity_migrations_lambda.function_arn,
+            description='Function ARN',
+        )
@@ -84,8 +84,13 @@ class LLMRAGAPI(Construct):
                     'dynamodb:PutItem',
                     'dynamodb:Scan',
                     'dynamodb:UpdateItem',
+                    # Legacy chat messages are moved to time-ordered keys when first read
+                    'dynamodb:DeleteItem',
+                ],
+                resources=[
+                    self.entity_table.table_arn,
+                    f'{self.entity_table.table_arn}/index/*',
                 ],
-                resources=[self.entity_table.table_arn],
             )
         )
 
@@ -124,8 +129,19 @@ class LLMRAGAPI(Construct):
                 'BEDROCK_AWS_REGION': self.config.bedrock_region,
                 'ENTITIES_TABLE': self.entity_table.table_name,
                 'KNOWLEDGE_BASE_ID': 'ORGCXIYNDH',
+                'ENTITY_SCAN_SEGMENTS': '4',
+                'ENTITY_SNAPSHOT_TTL_SECONDS': '300',
+                'ENTITY_SNAPSHOT_SCAN_TTL_SECONDS': '30',
+                'ENTITY_CATALOG_ENABLED': 'true',
+                'KB_CACHE_TTL_SECONDS': '900',
+                'KB_CACHE_MAX_ENTRIES': '256',
+                'KB_TOPIC_CACHE_TTL_SECONDS': '600',
+                'KB_CACHE_SHARED_ENABLED': 'true',
+                'KB_CACHE_SHARED_TTL_SECONDS': '86400',
+                'CHAT_PROMPT_WRITE_AHEAD': 'false',
                 'POWERTOOLS_LOG_LEVEL': 'DEBUG' if self.config.stage == 'dev' else 'INFO',
                 'POWERTOOLS_SERVICE_NAME': f'{self.config.prefix}-llm-service',
+                'POWERTOOLS_METRICS_NAMESPACE': f'{self.config.prefix}-rag-api',
                 'POWERTOOLS_LOGGER_LOG_EVENT': 'true' if self.config.stage == 'dev' else 'false',
             },
             role=lambda_role,
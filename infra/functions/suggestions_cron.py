@@ -6,7 +6,9 @@ from aws_cdk import (
     aws_events_targets,
     aws_iam,
     aws_lambda,
+    aws_lambda_event_sources,
     aws_logs,
+    aws_sqs,
 )
 from aws_cdk.aws_lambda_python_alpha import (
     BundlingOptions,
@@ -35,10 +37,37 @@ class SuggestionsCron(Construct):
 
         self.config = config
 
+        self.create_sqs_queue()
         self.create_lambda_function()
         self.create_eventbridge_rule()
+        self.create_queue_event_source()
         self.generate_cloudformation_outputs()
 
+    def create_sqs_queue(self):
+        """
+        Create the SQS queue that debounces the suggestion triggers of profile updates
+        """
+        self.suggestion_dead_letter_queue = aws_sqs.Queue(
+            self,
+            f'{self.config.prefix}-suggestion-dlq',
+            queue_name=f'{self.config.prefix}-suggestion-dlq',
+            retention_period=Duration.days(14),
+        )
+
+        # Triggers only become visible after the delay, so the edits of one editing session
+        # land in the same batch
+        self.suggestion_queue = aws_sqs.Queue(
+            self,
+            f'{self.config.prefix}-suggestion-queue',
+            queue_name=f'{self.config.prefix}-suggestion-queue',
+            delivery_delay=Duration.seconds(120),
+            visibility_timeout=Duration.minutes(30),  # 6 times the function timeout
+            retention_period=Duration.days(1),
+            dead_letter_queue=aws_sqs.DeadLetterQueue(
+                max_receive_count=3, queue=self.suggestion_dead_letter_queue
+            ),
+        )
+
     def create_lambda_function(self):
         """
         Create the Lambda Function for the Suggestions Cron Job
@@ -83,9 +112,21 @@ class SuggestionsCron(Construct):
                     'dynamodb:Query',
                     'dynamodb:GetItem',
                     'dynamodb:Scan',
+                    'dynamodb:UpdateItem',
+                    'dynamodb:BatchGetItem',
                     'dynamodb:BatchWriteItem',
                 ],
-                resources=[self.entity_table.table_arn],
+                resources=[
+                    self.entity_table.table_arn,
+                    f'{self.entity_table.table_arn}/index/*',
+                ],
+            )
+        )
+
+        lambda_role.add_to_policy(
+            aws_iam.PolicyStatement(
+                actions=['sqs:ReceiveMessage', 'sqs:DeleteMessage', 'sqs:GetQueueAttributes'],
+                resources=[self.suggestion_queue.queue_arn],
             )
         )
 
@@ -114,7 +155,7 @@ class SuggestionsCron(Construct):
             handler='handler',
             entry='src',
             index='generate_suggestions/handler.py',
-            timeout=Duration.minutes(2),
+            timeout=Duration.minutes(5),
             log_retention=aws_logs.RetentionDays.ONE_MONTH,
             memory_size=512,
             environment={
@@ -123,6 +164,17 @@ class SuggestionsCron(Construct):
                 'REGION': self.config.region,
                 'ENTITIES_TABLE': self.entity_table.table_name,
                 'BEDROCK_AWS_REGION': self.config.bedrock_region,
+                'ENTITY_SCAN_SEGMENTS': '4',
+                'ENTITY_SNAPSHOT_TTL_SECONDS': '300',
+                'ENTITY_SNAPSHOT_SCAN_TTL_SECONDS': '30',
+                'ENTITY_CATALOG_ENABLED': 'true',
+                'SUGGESTION_SHARDING_ENABLED': 'true',
+                'SUGGESTION_SHARD_TOKEN_BUDGET': '8000',
+                'SUGGESTION_SHARD_CONCURRENCY': '4',
+                'SUGGESTION_CANDIDATE_TOP_K': '15',
+                'SUGGESTION_TEXT_MAX_TOKENS': '80',
+                'SUGGESTION_INCREMENTAL_ENABLED': 'true',
+                'SUGGESTION_QUEUE_GROUP_SIZE': '5',
                 'POWERTOOLS_LOG_LEVEL': 'DEBUG' if self.config.stage == 'dev' else 'INFO',
                 'POWERTOOLS_SERVICE_NAME': f'{self.config.prefix}-suggestions-service',
                 'POWERTOOLS_LOGGER_LOG_EVENT': 'true' if self.config.stage == 'dev' else 'false',
@@ -161,6 +213,23 @@ class SuggestionsCron(Construct):
             source_arn=rule.rule_arn,
         )
 
+    def create_queue_event_source(self):
+        """
+        Consume the suggestion queue in small batches, reporting the records of failed entities
+
+        A batch of 10 entities is at most two suggestion generation runs of
+        SUGGESTION_QUEUE_GROUP_SIZE entities, which fits the function timeout.
+        """
+        self.lambda_suggestions_cron.add_event_source(
+            aws_lambda_event_sources.SqsEventSource(
+                self.suggestion_queue,
+                batch_size=10,
+                max_batching_window=Duration.seconds(120),
+                max_concurrency=2,
+                report_batch_item_failures=True,
+            )
+        )
+
     def generate_cloudformation_outputs(self):
         """
         Method to add the relevant CloudFormation outputs.
@@ -171,3 +240,10 @@ class SuggestionsCron(Construct):
             value=self.lambda_suggestions_cron.function_arn,
             description='Function ARN',
         )
+
+        CfnOutput(
+            self,
+            'QueueUrl',
+            value=self.suggestion_queue.queue_url,
+            description='Suggestion SQS Queue URL',
+        )
@@ -0,0 +1,75 @@
+"""
+Adds the entity table GSIs that a stage is missing, one deployment per index, ahead of the
+regular deploy. CloudFormation rejects a table update that creates more than one GSI, so the
+stack is deployed with the entityTableIndexCount context value stepping up from the live
+table's index count. The regular deploy that follows adds the last index.
+
+Usage: python -m scripts.stage_entity_indexes <stage>
+"""
+
+import os
+import subprocess
+import sys
+
+import boto3
+
+from infra.dynamodb.entity_table import ENTITY_TABLE_INDEXES
+
+MAIN_RESOURCES_NAME = 'elevate'
+
+
+def get_live_index_count(stage: str) -> int:
+    """
+    Count the leading entity table indexes the live table already has.
+
+    :param stage: The deployment stage
+    :type stage: str
+    :return: The number of indexes in place, or the full count if the table does not exist yet
+    :rtype: int
+    """
+    client = boto3.client('dynamodb', region_name=os.getenv('AWS_REGION') or 'ap-southeast-1')
+    try:
+        table = client.describe_table(TableName=f'{MAIN_RESOURCES_NAME}-{stage}-EntityTable')
+    except client.exceptions.ResourceNotFoundException:
+        # A new table is created with every index in one go
+        return len(ENTITY_TABLE_INDEXES)
+
+    live_index_names = {
+        index['IndexName'] for index in table['Table'].get('GlobalSecondaryIndexes', [])
+    }
+    index_count = 0
+    for index_name, _, _ in ENTITY_TABLE_INDEXES:
+        if index_name not in live_index_names:
+            break
+        index_count += 1
+    return index_count
+
+
+def stage_entity_indexes(stage: str) -> None:
+    """
+    Deploy the stack once for each missing index except the last one.
+
+    :param stage: The deployment stage
+    :type stage: str
+    """
+    live_index_count = get_live_index_count(stage)
+    for index_count in range(max(live_index_count + 1, 1), len(ENTITY_TABLE_INDEXES)):
+        print(f'Adding entity table index {ENTITY_TABLE_INDEXES[index_count - 1][0]}')
+        subprocess.run(
+            [
+                'cdk',
+                'deploy',
+                f'{MAIN_RESOURCES_NAME}-backend-stack-{stage}',
+                '--context',
+                f'stage={stage}',
+                '--context',
+                f'entityTableIndexCount={index_count}',
+                '--require-approval',
+                'never',
+            ],
+            check=True,
+        )
+
+
+if __name__ == '__main__':
+    stage_entity_indexes(sys.argv[1])
@@ -0,0 +1,19 @@
+from aws_lambda_powertools import Logger
+from aws_lambda_powertools.utilities.data_classes import DynamoDBStreamEvent, event_source
+from aws_lambda_powertools.utilities.typing import LambdaContext
+from entity_catalog_stream.usecases.catalog_usecase import EntityCatalogUsecase
+
+logger = Logger()
+
+
+@logger.inject_lambda_context
+@event_source(data_class=DynamoDBStreamEvent)
+def handler(event: DynamoDBStreamEvent, context: LambdaContext) -> dict:
+    """
+    Lambda handler to apply entity table stream records to the materialized entity catalog.
+    A failed batch raises so the stream retries it in order.
+    """
+    _ = context
+
+    usecase = EntityCatalogUsecase()
+    return usecase.process_records(list(event.records))
@@ -0,0 +1,245 @@
+import time
+from http import HTTPStatus
+from typing import List, Optional
+
+from aws_lambda_powertools import Logger
+from aws_lambda_powertools.utilities.data_classes.dynamo_db_stream_event import DynamoDBRecord
+from shared_modules.constants.entity_constants import EntityConstants
+from shared_modules.repositories.entity_catalog_repository import EntityCatalogRepository
+from shared_modules.repositories.entity_repository import EntityRepository
+from shared_modules.utils.entity_assembler import EntityAssembler
+
+
+class EntityCatalogUsecase:
+    def __init__(self):
+        self.entity_catalog_repository = EntityCatalogRepository()
+        self.entity_repository = EntityRepository()
+        self.entity_assembler = EntityAssembler()
+        self.logger = Logger()
+
+        # Seconds a catalog version waits for the METADATA record of its write before the
+        # catalog is rebuilt without it, and how many early or completed versions are kept
+        self.pending_version_ttl_seconds = 300
+        self.applied_version_limit = 1_000
+        # Seconds a rebuilt catalog waits for the eventually consistent scan indexes to settle
+        self.rebuild_settle_seconds = 60
+
+    def rebuild_catalog(self, previous_catalog: Optional[dict] = None) -> dict:
+        """
+        Build the catalog from a full entity scan.
+
+        Used when no catalog exists yet and when a write was never applied. The catalog version
+        is read before the scan, but the scan reads eventually consistent indexes, so the
+        catalog is only stamped current once the rebuild settle time has passed. The version
+        bookkeeping of a previous catalog is kept, so records of writes that straddle the
+        rebuild still complete their versions.
+
+        :param Optional[dict] previous_catalog: The catalog being replaced, None if there is none
+        :return dict: The catalog document
+        """
+        previous_catalog = previous_catalog or {}
+        catalog_version = self.entity_repository.get_catalog_version()
+        entities = {
+            entity.hashKey: entity.model_dump(exclude_none=True)
+            for entity in self.entity_repository.iter_entities()
+        }
+        return {
+            'catalogVersion': None,
+            'latestCatalogVersion': catalog_version,
+            'pendingCatalogVersions': previous_catalog.get('pendingCatalogVersions', {}),
+            'appliedCatalogVersions': previous_catalog.get('appliedCatalogVersions', []),
+            'completedCatalogVersions': previous_catalog.get('completedCatalogVersions', []),
+            'rebuiltAt': time.time(),
+            'entities': entities,
+        }
+
+    def complete_version(self, catalog: dict, catalog_version: str) -> None:
+        """Record that both records of a catalog version were applied."""
+        completed_versions = catalog['completedCatalogVersions']
+        completed_versions.append(catalog_version)
+        del completed_versions[: -self.applied_version_limit]
+
+    def apply_version(self, catalog: dict, catalog_version: str, is_version_record: bool) -> None:
+        """
+        Track a catalog version seen on the catalog version item or on a METADATA item.
+
+        Every profile write stamps the same version on the METADATA item it writes and on the
+        catalog version item. The two items are on different stream shards, so either record
+        can be applied first. A version is pending from its version record until the METADATA
+        record of the same write is applied. Later writes that leave the version on the
+        METADATA item, like the suggestion flag updates, repeat a completed version and are
+        ignored.
+
+        :param dict catalog: The catalog document, updated in place
+        :param str catalog_version: The catalog version of the record
+        :param bool is_version_record: True for the catalog version item record
+        """
+        pending_versions = catalog['pendingCatalogVersions']
+        applied_versions = catalog['appliedCatalogVersions']
+
+        if is_version_record:
+            catalog['latestCatalogVersion'] = catalog_version
+            if catalog_version in applied_versions:
+                applied_versions.remove(catalog_version)
+                self.complete_version(catalog, catalog_version)
+            else:
+                pending_versions[catalog_version] = time.time()
+        elif catalog_version in pending_versions:
+            del pending_versions[catalog_version]
+            self.complete_version(catalog, catalog_version)
+        elif (
+            catalog_version not in applied_versions
+            and catalog_version not in catalog['completedCatalogVersions']
+        ):
+            # Versions whose METADATA record came first, kept until their version record comes
+            applied_versions.append(catalog_version)
+            del applied_versions[: -self.applied_version_limit]
+
+    def expire_pending_versions(self, catalog: dict) -> List[str]:
+        """
+        Drop the pending versions whose METADATA record did not arrive within the TTL.
+
+        :param dict catalog: The catalog document, expired pending versions are dropped
+        :return list: The expired catalog versions
+        """
+        expires_before = time.time() - self.pending_version_ttl_seconds
+        pending_versions = catalog['pendingCatalogVersions']
+        expired_versions = [
+            catalog_version
+            for catalog_version, pending_since in pending_versions.items()
+            if pending_since < expires_before
+        ]
+        for catalog_version in expired_versions:
+            del pending_versions[catalog_version]
+        return expired_versions
+
+    def get_current_version(self, catalog: dict) -> Optional[str]:
+        """
+        Get the catalog version the catalog entities are current at.
+
+        The catalog is only current at the latest catalog version once every write up to it
+        has been applied and a rebuild scan has settled.
+
+        :param dict catalog: The catalog document
+        :return Optional[str]: The latest catalog version, None while a write is still pending
+        """
+        if time.time() - (catalog.get('rebuiltAt') or 0) < self.rebuild_settle_seconds:
+            return None
+        return None if catalog['pendingCatalogVersions'] else catalog['latestCatalogVersion']
+
+    def apply_record(self, catalog: dict, record: DynamoDBRecord) -> bool:
+        """
+        Apply a single stream record to the catalog.
+
+        Profile item inserts and updates overwrite the fields of the item, removed METADATA
+        items drop the entity and removed sub-items clear their fields. Catalog versions on
+        the catalog version item and on METADATA items are tracked with apply_version.
+        Every other record is ignored.
+
+        :param dict catalog: The catalog document, updated in place
+        :param DynamoDBRecord record: The stream record
+        :return bool: Whether the catalog changed
+        """
+        stream_record = record.dynamodb.raw_event
+        keys = stream_record['Keys']
+        hash_key = keys['hashKey']['S']
+        range_key = keys['rangeKey']['S']
+        new_image = stream_record.get('NewImage')
+        entities = catalog['entities']
+
+        if (
+            hash_key == EntityConstants.CATALOG_VERSION_HASH_KEY
+            and range_key == EntityConstants.CATALOG_VERSION_RANGE_KEY
+        ):
+            if not new_image or 'catalogVersion' not in new_image:
+                return False
+            self.apply_version(catalog, new_image['catalogVersion']['S'], is_version_record=True)
+            return True
+
+        if not self.entity_assembler.is_profile_item(keys):
+            return False
+
+        if new_image:
+            self.entity_assembler.assemble(entities, new_image)
+            if range_key.endswith('#METADATA') and 'catalogVersion' in new_image:
+                self.apply_version(
+                    catalog, new_image['catalogVersion']['S'], is_version_record=False
+                )
+        elif range_key.endswith('#METADATA'):
+            entities.pop(hash_key, None)
+        elif hash_key in entities:
+            for field in self.entity_assembler.item_fields[range_key]:
+                entities[hash_key][field] = None
+
+        return True
+
+    def process_records(self, records: List[DynamoDBRecord]) -> dict:
+        """
+        Apply a batch of entity table stream records to the materialized entity catalog.
+
+        :param list records: The stream records, in stream order
+        :return dict: The number of records applied and the catalog entity count
+        """
+        status, catalog, message = self.entity_catalog_repository.get_catalog()
+        if status == HTTPStatus.INTERNAL_SERVER_ERROR:
+            raise RuntimeError(f'Unable to read entity catalog: {message}')
+
+        applied_count = 0
+        is_rebuilt = catalog is None
+        if catalog is None:
+            # A fresh scan already reflects every record in the batch
+            self.logger.info('Entity catalog not found, rebuilding from a full scan')
+            catalog = self.rebuild_catalog()
+            # A header whose chunks are missing is replaced at its next revision
+            header = self.entity_catalog_repository.get_catalog_header()
+            previous_revision = int(header.catalogRevision) if header else None
+            previous_chunk_set, previous_chunk_count, previous_version = None, 0, None
+        else:
+            previous_revision = catalog.pop('catalogRevision')
+            previous_chunk_set = catalog.pop('chunkSet')
+            previous_chunk_count = catalog.pop('chunkCount')
+            # Documents saved before versions were tracked are current at their version
+            catalog.setdefault('latestCatalogVersion', catalog['catalogVersion'])
+            catalog.setdefault('pendingCatalogVersions', {})
+            catalog.setdefault('appliedCatalogVersions', [])
+            catalog.setdefault('completedCatalogVersions', [])
+            previous_version = catalog['catalogVersion']
+
+            for record in records:
+                applied_count += self.apply_record(catalog, record)
+
+            # A write whose METADATA record never arrived (e.g. a batch that exhausted its
+            # retries) is missing from the entities, so they are rebuilt instead of stamped
+            expired_versions = self.expire_pending_versions(catalog)
+            if expired_versions:
+                self.logger.warning(
+                    {
+                        'message': 'Catalog versions pending too long, rebuilding the catalog',
+                        'versions': expired_versions,
+                    }
+                )
+                catalog = self.rebuild_catalog(catalog)
+                is_rebuilt = True
+
+        catalog['catalogVersion'] = self.get_current_version(catalog)
+        is_unchanged = not applied_count and catalog['catalogVersion'] == previous_version
+        if previous_revision is not None and not is_rebuilt and is_unchanged:
+            return {'applied_count': 0, 'entity_count': len(catalog['entities'])}
+
+        status, message = self.entity_catalog_repository.save_catalog(
+            catalog, previous_revision, previous_chunk_set, previous_chunk_count
+        )
+        if status != HTTPStatus.OK:
+            raise RuntimeError(f'Unable to save entity catalog: {message}')
+
+        self.logger.info(
+            {
+                'message': 'Entity catalog updated',
+                'record_count': len(records),
+                'applied_count': applied_count,
+                'entity_count': len(catalog['entities']),
+                'catalog_version': catalog['catalogVersion'],
+                'pending_version_count': len(catalog['pendingCatalogVersions']),
+            }
+        )
+        return {'applied_count': applied_count, 'entity_count': len(catalog['entities'])}
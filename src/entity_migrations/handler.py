@@ -0,0 +1,17 @@
+from aws_lambda_powertools import Logger
+from aws_lambda_powertools.utilities.typing import LambdaContext
+from entity_migrations.usecases.migration_usecase import EntityMigrationUsecase
+
+logger = Logger()
+
+
+@logger.inject_lambda_context
+def handler(event: dict, context: LambdaContext) -> dict:
+    """
+    Lambda handler to run the entity table data migrations, invoked by the deployment.
+    A failed migration raises so the deployment fails and is rolled back.
+    """
+    _, _ = event, context
+
+    usecase = EntityMigrationUsecase()
+    return usecase.run_migrations()
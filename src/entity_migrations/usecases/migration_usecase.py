@@ -0,0 +1,28 @@
+from aws_lambda_powertools import Logger
+from shared_modules.repositories.entity_repository import EntityRepository
+
+
+class EntityMigrationUsecase:
+    def __init__(self):
+        self.entity_repository = EntityRepository()
+        self.logger = Logger()
+
+    def run_migrations(self) -> dict:
+        """
+        Run the entity table data migrations that have not completed yet.
+
+        Every migration is idempotent and marks itself complete, so later deployments skip it.
+
+        :return dict: The number of items each migration updated
+        """
+        gsi3pk_backfilled_count = 0
+        if not self.entity_repository.is_type_index_ready():
+            gsi3pk_backfilled_count = self.entity_repository.backfill_type_index()
+
+        self.logger.info(
+            {
+                'message': 'Entity migrations complete',
+                'gsi3pk_backfilled_count': gsi3pk_backfilled_count,
+            }
+        )
+        return {'gsi3pk_backfilled_count': gsi3pk_backfilled_count}
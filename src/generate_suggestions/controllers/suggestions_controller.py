@@ -1,16 +1,20 @@
 import logging
 import os
 import sys
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
 from aws_lambda_powertools import Logger
+from aws_lambda_powertools.utilities.data_classes.sqs_event import SQSRecord
 from generate_suggestions.usecases.suggestion_usecase import SuggestionUsecase
+from shared_modules.models.schema.message import ErrorResponse
 
 
 class SuggestionsController:
     def __init__(self):
         self.logger = Logger()
         self.suggestion_usecase = SuggestionUsecase()
+        # Queued entities are generated this many per call, a failed call only retries its group
+        self.queue_group_size = max(int(os.getenv('SUGGESTION_QUEUE_GROUP_SIZE') or 5), 1)
 
         is_local = os.getenv('IS_LOCAL')
         if is_local:
@@ -20,3 +24,95 @@ class SuggestionsController:
     def get_suggestions(self, entity_ids_selected: Optional[List[str]] = None):
         suggestions = self.suggestion_usecase.get_suggestions(entity_ids_selected)
         return suggestions.model_dump()
+
+    @staticmethod
+    def get_record_entity_id(record: SQSRecord) -> Optional[str]:
+        """
+        Read the entity ID of a queued profile update trigger.
+
+        :param SQSRecord record: The SQS record, with an entity_id in its JSON body.
+        :return Optional[str]: The entity ID, None if the body is malformed or has no entity_id.
+        """
+        try:
+            body = record.json_body
+        except (ValueError, TypeError):
+            return None
+
+        if not isinstance(body, dict):
+            return None
+        return body.get('entity_id') or None
+
+    @classmethod
+    def get_queued_entity_ids(cls, records: Iterable[SQSRecord]) -> List[str]:
+        """
+        Coalesce the queued profile update triggers into one ID per entity, in arrival order.
+
+        Records without a readable entity_id are skipped.
+
+        :param list records: The SQS records, each with an entity_id in its JSON body.
+        :return list: The distinct entity IDs.
+        """
+        entity_ids = (cls.get_record_entity_id(record) for record in records)
+        return list(dict.fromkeys(entity_id for entity_id in entity_ids if entity_id))
+
+    def get_queued_suggestions(self, records: List[SQSRecord]) -> dict:
+        """
+        Generate suggestions for the entities in a batch of queued triggers, a few per call.
+
+        The coalesced entities are split into groups of SUGGESTION_QUEUE_GROUP_SIZE and each
+        group is one suggestion generation run. The records of the entities whose group failed
+        with a server error are reported as batch item failures, so only they return to the
+        queue and are retried. Records without a readable entity_id are reported as failures on
+        their own, so they reach the dead letter queue without failing the rest of the batch.
+
+        :param list records: The SQS records of the batch.
+        :return dict: The batch item failures of the batch.
+        """
+        record_entity_ids = {
+            record.message_id: self.get_record_entity_id(record) for record in records
+        }
+        malformed_message_ids = [
+            message_id for message_id, entity_id in record_entity_ids.items() if not entity_id
+        ]
+        if malformed_message_ids:
+            self.logger.error(
+                {
+                    'message': 'Queued suggestion triggers without an entity_id',
+                    'message_ids': malformed_message_ids,
+                }
+            )
+
+        entity_ids = self.get_queued_entity_ids(records)
+        self.logger.info(
+            {
+                'message': 'Coalesced queued suggestion triggers',
+                'trigger_count': len(records),
+                'entity_count': len(entity_ids),
+            }
+        )
+
+        failed_entity_ids = set()
+        for start in range(0, len(entity_ids), self.queue_group_size):
+            group_entity_ids = entity_ids[start : start + self.queue_group_size]
+            try:
+                suggestions = self.suggestion_usecase.get_suggestions(group_entity_ids)
+                if isinstance(suggestions, ErrorResponse) and suggestions.status >= 500:
+                    raise RuntimeError(suggestions.response)
+
+            except Exception as e:
+                self.logger.error(
+                    {
+                        'message': 'Failed to generate queued suggestions',
+                        'entity_ids': group_entity_ids,
+                        'error': str(e),
+                    }
+                )
+                failed_entity_ids.update(group_entity_ids)
+
+        return {
+            'batchItemFailures': [
+                {'itemIdentifier': message_id}
+                for message_id, entity_id in record_entity_ids.items()
+                if not entity_id or entity_id in failed_entity_ids
+            ]
+        }
@@ -1,4 +1,5 @@
 from aws_lambda_powertools import Logger
+from aws_lambda_powertools.utilities.data_classes import SQSEvent
 from aws_lambda_powertools.utilities.typing import LambdaContext
 from generate_suggestions.controllers.suggestions_controller import (
     SuggestionsController,
@@ -11,8 +12,14 @@ logger = Logger()
 def handler(event: dict, context: LambdaContext) -> dict:
     _, _ = event, context
 
+    suggestions_controller = SuggestionsController()
+
+    # Debounced profile update triggers arrive from the suggestion queue in batches, the
+    # records of entities that failed are returned to be retried
+    if event.get('Records'):
+        return suggestions_controller.get_queued_suggestions(SQSEvent(event).records)
+
     entity_id = event.get('prev', {}).get('result', {}).get('id')
     entity_id_list = [entity_id] if entity_id else None
 
-    suggestions_controller = SuggestionsController()
     return suggestions_controller.get_suggestions(entity_id_list)
@@ -1,17 +1,18 @@
 import os
 
-import boto3
 from aws_lambda_powertools import Logger
 from mypy_boto3_bedrock_agent_runtime.client import AgentsforBedrockRuntimeClient
 from mypy_boto3_bedrock_agent_runtime.type_defs import RetrieveRequestTypeDef
+from shared_modules.utils.client_registry import client_registry
 
 
 class KnowledgeBaseUsecase:
     def __init__(self):
         self.logger = Logger()
         self.region_name = os.getenv('BEDROCK_AWS_REGION')
-        self.bedrock_agent_runtime_client: AgentsforBedrockRuntimeClient = boto3.client(
-            'bedrock-agent-runtime', region_name=self.region_name
+        # Shared across warm invocations, so a turn skips client creation and the TLS handshake
+        self.bedrock_agent_runtime_client: AgentsforBedrockRuntimeClient = (
+            client_registry.get_client('bedrock-agent-runtime', region_name=self.region_name)
         )
 
     def get_knowledge_base_data(self, prompt: str, number_of_results=5):
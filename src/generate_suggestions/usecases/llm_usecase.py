@@ -1,15 +1,27 @@
 import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
-from typing import List, Union
+from typing import List, Optional, Union
 
 import instructor
-from anthropic import AnthropicBedrock
+from anthropic import AnthropicBedrock, APIStatusError, RateLimitError
 from aws_lambda_powertools import Logger
+from botocore.exceptions import ClientError
+from generate_suggestions.utils.compatibility_scorer import CompatibilityScorer
+from generate_suggestions.utils.entity_serializer import (
+    DEFAULT_TEXT_MAX_TOKENS,
+    CompactEntitySerializer,
+)
 from instructor.utils import disable_pydantic_error_url
 from shared_modules.models.dynamodb.suggestions import Suggestions
 from shared_modules.models.schema.entity import EntitySchema
 from shared_modules.models.schema.message import ErrorResponse
-from shared_modules.models.schema.suggestions import SuggestionMatchList
+from shared_modules.models.schema.prompt import PromptSection
+from shared_modules.models.schema.suggestions import SuggestionMatch, SuggestionMatchList
+from shared_modules.utils.prompt_budgeter import PromptBudgeter
+from shared_modules.utils.token_estimator import estimate_tokens
 
 
 class LLMUsecase:
@@ -18,21 +30,45 @@ class LLMUsecase:
         self.bedrock_model_id = 'us.anthropic.claude-3-5-haiku-20241022-v1:0'
         self.bedrock_region = os.getenv('BEDROCK_AWS_REGION')
         self.max_tokens = 4096
+        self.prompt_token_budget = 100_000
+        self.selected_entities_token_budget = 30_000
+        self.available_entities_token_budget = 60_000
+        self.prompt_budgeter = PromptBudgeter(self.prompt_token_budget)
+        # Sharded mode splits the selected entities into prompts of at most this many tokens
+        self.sharding_enabled = os.getenv('SUGGESTION_SHARDING_ENABLED') == 'true'
+        self.shard_token_budget = int(os.getenv('SUGGESTION_SHARD_TOKEN_BUDGET') or 8_000)
+        self.shard_concurrency = int(os.getenv('SUGGESTION_SHARD_CONCURRENCY') or 4)
+        # Throttled LLM calls are retried with exponential backoff, sharded or not
+        self.llm_max_attempts = 4
+        self.llm_backoff_seconds = 1.0
+        self.llm_max_backoff_seconds = 8.0
+        # Only the best scored available entities of each selected entity reach the LLM, 0 sends all
+        self.candidate_top_k = int(os.getenv('SUGGESTION_CANDIDATE_TOP_K') or 0)
+        self.compatibility_scorer = CompatibilityScorer()
+        # Entities are written to the prompt with short keys and their free text truncated
+        self.entity_serializer = CompactEntitySerializer(
+            text_max_tokens=int(os.getenv('SUGGESTION_TEXT_MAX_TOKENS') or DEFAULT_TEXT_MAX_TOKENS)
+        )
+        disable_pydantic_error_url()  # instructor not include error url in response to save on tokens
+        # The client keeps its HTTP connection pool, so it is shared by every call and shard
+        self.client = instructor.from_anthropic(
+            AnthropicBedrock(aws_region=self.bedrock_region), mode=instructor.Mode.ANTHROPIC_TOOLS
+        )
 
-    def build_prompt(
-        self, entities_available: List[EntitySchema], entities_selected: List[EntitySchema]
-    ):
+    def assemble_prompt(self, entities_available: str, entities_selected: str) -> str:
         """
-        Build a prompt for the LLM to generate a list of suggested matches.
+        Assemble the matching prompt from the already fitted entity sections.
 
-        :param list entities_available: The entities available to generate a response for.
-        :param list entities_selected: The entities selected to generate a response for.
+        :param str entities_available: The available entities section text.
+        :param str entities_selected: The selected entities section text.
         :return str: The prompt for the LLM.
         """
         prompt = f"""
         You are an expert startup ecosystem matchmaker with deep knowledge of startup-enabler partnerships, specifically within Davao City's ecosystem.
         Your task is to analyze the provided entities (all based in Davao City) and suggest ideal partnerships based on their compatibility.
             ## Input Data:
+            Each entity is one line of JSON with these short keys: {self.entity_serializer.legend}
+
             Selected Entities (Primary Focus):
             {entities_selected}
 
@@ -107,6 +143,53 @@ class LLMUsecase:
             """
         return prompt
 
+    def build_prompt(
+        self, entities_available: List[EntitySchema], entities_selected: List[EntitySchema]
+    ):
+        """
+        Build a prompt for the LLM to generate a list of suggested matches.
+
+        The prompt is kept within the prompt token budget. Available entities are trimmed
+        before selected entities, dropping entries from the end of each list.
+
+        :param list entities_available: The entities available to generate a response for.
+        :param list entities_selected: The entities selected to generate a response for.
+        :return str: The prompt for the LLM.
+        """
+        sections = self.prompt_budgeter.fit(
+            [
+                PromptSection(
+                    name='entities_selected',
+                    items=[
+                        self.entity_serializer.serialize(entity) for entity in entities_selected
+                    ],
+                    max_tokens=self.selected_entities_token_budget,
+                    priority=2,
+                    omission_note='({count} more selected entities omitted)',
+                ),
+                PromptSection(
+                    name='entities_available',
+                    items=[
+                        self.entity_serializer.serialize(entity) for entity in entities_available
+                    ],
+                    max_tokens=self.available_entities_token_budget,
+                    priority=1,
+                    omission_note='({count} more available entities omitted)',
+                ),
+            ],
+            reserved_tokens=estimate_tokens(self.assemble_prompt('', '')),
+        )
+
+        prompt = self.assemble_prompt(sections['entities_available'], sections['entities_selected'])
+        self.logger.info(
+            {
+                'message': 'Built suggestion prompt',
+                'prompt_tokens': estimate_tokens(prompt),
+                'section_tokens': {name: estimate_tokens(text) for name, text in sections.items()},
+            }
+        )
+        return prompt
+
     def invoke_llm(
         self,
         prompt: str,
@@ -116,11 +199,7 @@ class LLMUsecase:
         :param str prompt: The prompt for the question generator.
         :return TaggedQuestionInstanceValidated: The validated output from the LLM.
         """
-        disable_pydantic_error_url()  # instructor not include error url in response to save on tokens
-
-        model = AnthropicBedrock(aws_region=self.bedrock_region)
-        client = instructor.from_anthropic(model, mode=instructor.Mode.ANTHROPIC_TOOLS)
-        resp, _ = client.chat.completions.create_with_completion(
+        resp, _ = self.client.chat.completions.create_with_completion(
             model=self.bedrock_model_id,
             max_tokens=self.max_tokens,
             messages=[
@@ -131,19 +210,215 @@ class LLMUsecase:
         )
         return resp
 
+    def select_candidates(
+        self, entities_available: List[EntitySchema], entities_selected: List[EntitySchema]
+    ) -> List[EntitySchema]:
+        """
+        Pre-filter the available entities to the top-K candidates of each selected entity.
+
+        :param list entities_available: The entities available to generate a response for.
+        :param list entities_selected: The entities selected to generate a response for.
+        :return list: The candidate entities, all available entities if pre-filtering is off.
+        """
+        if self.candidate_top_k <= 0:
+            return entities_available
+
+        start_time = time.perf_counter()
+        candidates = self.compatibility_scorer.select_candidates(
+            entities_selected, entities_available, self.candidate_top_k
+        )
+        self.logger.info(
+            {
+                'message': 'Pre-filtered suggestion candidates',
+                'available_count': len(entities_available),
+                'candidate_count': len(candidates),
+                'scoring_ms': round((time.perf_counter() - start_time) * 1000, 1),
+            }
+        )
+        return candidates
+
+    def shard_entities(self, entities_selected: List[EntitySchema]) -> List[List[EntitySchema]]:
+        """
+        Split the selected entities into shards that each fit the shard token budget.
+
+        :param list entities_selected: The entities selected to generate a response for.
+        :return list: The shards, in the order of the selected entities.
+        """
+        shards = []
+        shard = []
+        shard_tokens = 0
+        for entity in entities_selected:
+            entity_tokens = estimate_tokens(self.entity_serializer.serialize(entity))
+            if shard and shard_tokens + entity_tokens > self.shard_token_budget:
+                shards.append(shard)
+                shard = []
+                shard_tokens = 0
+            shard.append(entity)
+            shard_tokens += entity_tokens
+
+        if shard:
+            shards.append(shard)
+        return shards
+
+    @staticmethod
+    def is_throttling_error(error: Exception) -> bool:
+        """
+        Check if an error, or an error it was raised from, means Bedrock is throttling or
+        overloaded.
+
+        :param Exception error: The error raised by the LLM call.
+        :return bool: True if the call should be retried after a backoff.
+        """
+        while error is not None:
+            if isinstance(error, RateLimitError):
+                return True
+            if isinstance(error, APIStatusError) and error.status_code in (429, 503, 529):
+                return True
+            if isinstance(error, ClientError) and error.response.get('Error', {}).get('Code') in (
+                'ThrottlingException',
+                'ServiceUnavailableException',
+            ):
+                return True
+            error = error.__cause__ or error.__context__
+        return False
+
+    def invoke_llm_with_backoff(self, prompt: str) -> SuggestionMatchList:
+        """
+        Invoke the LLM, retrying with exponential backoff and full jitter while throttled.
+
+        :param str prompt: The prompt for the LLM.
+        :return SuggestionMatchList: The validated output from the LLM.
+        """
+        for attempt in range(self.llm_max_attempts):
+            try:
+                return self.invoke_llm(prompt)
+
+            except Exception as e:
+                if attempt == self.llm_max_attempts - 1 or not self.is_throttling_error(e):
+                    raise
+
+                backoff_seconds = random.uniform(
+                    0, min(self.llm_max_backoff_seconds, self.llm_backoff_seconds * 2**attempt)
+                )
+                self.logger.warning(
+                    {
+                        'message': 'LLM call throttled, backing off',
+                        'attempt': attempt + 1,
+                        'backoff_seconds': round(backoff_seconds, 2),
+                    }
+                )
+                time.sleep(backoff_seconds)
+
+    def generate_shard_response(
+        self, entities_available: List[EntitySchema], entities_selected: List[EntitySchema]
+    ) -> Optional[SuggestionMatchList]:
+        """
+        Generate the suggestions of one shard of the selected entities.
+
+        :param list entities_available: The entities available to generate a response for.
+        :param list entities_selected: The shard of selected entities.
+        :return Optional[SuggestionMatchList]: The response from the LLM, None if it failed.
+        """
+        try:
+            candidates = self.select_candidates(entities_available, entities_selected)
+            prompt = self.build_prompt(candidates, entities_selected)
+            return self.invoke_llm_with_backoff(prompt)
+
+        except Exception as e:
+            self.logger.error(
+                {
+                    'message': 'Error generating shard response',
+                    'shard_entities_count': len(entities_selected),
+                    'error': str(e),
+                }
+            )
+            return None
+
+    @staticmethod
+    def merge_matches(match_lists: List[SuggestionMatchList]) -> SuggestionMatchList:
+        """
+        Merge match lists, keeping the most certain match of every entity pair.
+
+        :param list match_lists: The match lists to merge.
+        :return SuggestionMatchList: The merged matches, most certain first.
+        """
+        matches_by_pair = {}
+        for match_list in match_lists:
+            for match in match_list.matches:
+                pair_key = frozenset(entity.entityId for entity in match.matchPair)
+                kept_match: Optional[SuggestionMatch] = matches_by_pair.get(pair_key)
+                if kept_match is None or match.certainty > kept_match.certainty:
+                    matches_by_pair[pair_key] = match
+
+        return SuggestionMatchList(
+            matches=sorted(
+                matches_by_pair.values(), key=lambda match: match.certainty, reverse=True
+            )
+        )
+
+    def generate_sharded_response(
+        self, entities_available: List[EntitySchema], entities_selected: List[EntitySchema]
+    ) -> Union[SuggestionMatchList, ErrorResponse]:
+        """
+        Generate a response from the LLM with one concurrent call per shard of selected entities.
+
+        Each call is small enough to finish within max_tokens and the Lambda timeout. Shards
+        that fail are logged and left out, so their entities are picked up by the caller's round
+        for entities missing suggestions.
+
+        :param list entities_available: The entities available to generate a response for.
+        :param list entities_selected: The entities selected to generate a response for.
+        :return Union[SuggestionMatchList, ErrorResponse]: The merged response from the LLM.
+        """
+        shards = self.shard_entities(entities_selected)
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(
+            max_workers=min(self.shard_concurrency, len(shards)),
+            thread_name_prefix='suggestion-shard',
+        ) as executor:
+            shard_responses = list(
+                executor.map(
+                    lambda shard: self.generate_shard_response(entities_available, shard), shards
+                )
+            )
+
+        match_lists = [response for response in shard_responses if response is not None]
+        self.logger.info(
+            {
+                'message': 'Generated sharded suggestions',
+                'shard_count': len(shards),
+                'failed_shard_count': len(shards) - len(match_lists),
+                'duration_ms': round((time.perf_counter() - start_time) * 1000),
+            }
+        )
+        if not match_lists:
+            return ErrorResponse(
+                response='Failed to generate suggestions for every shard',
+                status=HTTPStatus.INTERNAL_SERVER_ERROR,
+            )
+
+        return self.merge_matches(match_lists)
+
     def generate_response(
         self, entities_available: List[EntitySchema], entities_selected: List[EntitySchema]
     ) -> Union[SuggestionMatchList, ErrorResponse]:
         """
         Generate a response from the LLM.
 
+        In sharded mode, selected entities that do not fit one shard are split across
+        concurrent calls.
+
         :param list entities_available: The entities available to generate a response for.
         :param list entities_selected: The entities selected to generate a response for.
         :return Union[SuggestionMatchList, ErrorResponse]: The response from the LLM.
         """
+        if self.sharding_enabled and len(self.shard_entities(entities_selected)) > 1:
+            return self.generate_sharded_response(entities_available, entities_selected)
+
         try:
-            prompt = self.build_prompt(entities_available, entities_selected)
-            return self.invoke_llm(prompt)
+            candidates = self.select_candidates(entities_available, entities_selected)
+            prompt = self.build_prompt(candidates, entities_selected)
+            return self.invoke_llm_with_backoff(prompt)
 
         except Exception as e:
             self.logger.error(f'Error generating response: {e}')
@@ -1,8 +1,11 @@
+import os
 from http import HTTPStatus
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
 
 from aws_lambda_powertools import Logger
 from generate_suggestions.usecases.llm_usecase import LLMUsecase
+from shared_modules.constants.entity_constants import EntityConstants
+from shared_modules.models.schema.entity import EntitySchema
 from shared_modules.models.schema.message import ErrorResponse
 from shared_modules.models.schema.suggestions import SuggestionMatchList
 from shared_modules.repositories.entity_repository import EntityRepository
@@ -15,6 +18,71 @@ class SuggestionUsecase:
         self.llm_usecase = LLMUsecase()
         self.suggestion_repository = SuggestionRepository()
         self.logger = Logger()
+        # Only entities whose matching fields changed since their last suggestions are sent to
+        # the LLM, the others are just cleared from the pending index
+        self.incremental_enabled = os.getenv('SUGGESTION_INCREMENTAL_ENABLED') == 'true'
+
+    def get_changed_entities(
+        self, entities_selected: List[EntitySchema], fingerprints: Dict[str, str]
+    ) -> List[EntitySchema]:
+        """
+        Get the selected entities whose matching fields changed since their last suggestions.
+
+        :param list entities_selected: The entities selected to generate a response for.
+        :param dict fingerprints: The current fingerprint of each selected entity by hashKey.
+        :return list: The changed entities, all selected entities if the stored fingerprints
+            cannot be read.
+        """
+        status, stored_fingerprints, message = self.entity_repository.get_suggestion_fingerprints(
+            list(fingerprints)
+        )
+        if status != HTTPStatus.OK:
+            self.logger.warning(
+                {
+                    'message': 'Failed to get suggestion fingerprints, regenerating all',
+                    'error': message,
+                }
+            )
+            return entities_selected
+
+        return [
+            entity
+            for entity in entities_selected
+            if stored_fingerprints.get(entity.hashKey) != fingerprints[entity.hashKey]
+        ]
+
+    def clear_pending_entities(
+        self,
+        entities_selected: List[EntitySchema],
+        pending_entities: Dict[str, Optional[str]],
+        fingerprints: Dict[str, str],
+    ) -> Optional[ErrorResponse]:
+        """
+        Remove the selected entities from the pending index and store their fingerprints.
+
+        :param list entities_selected: The entities selected to generate a response for.
+        :param dict pending_entities: The updatedAt of each pending entity by hashKey.
+        :param dict fingerprints: The current fingerprint of each selected entity by hashKey.
+        :return Optional[ErrorResponse]: The error response, None if the update succeeded.
+        """
+        status, message = self.entity_repository.update_entity_for_suggestion_generation(
+            entity_hash_keys=[entity.hashKey for entity in entities_selected],
+            update_value=False,
+            expected_updated_at=pending_entities,
+            fingerprints=fingerprints,
+        )
+        if status != HTTPStatus.OK:
+            self.logger.error(
+                {
+                    'message': 'Failed to update entity for suggestion generation',
+                    'error': message,
+                }
+            )
+            return ErrorResponse(
+                response=message,
+                status=status,
+            )
+        return None
 
     def get_suggestions(
         self, entity_ids_selected: Optional[List[str]] = None
@@ -33,20 +101,36 @@ class SuggestionUsecase:
         )
 
         try:
-            status, entities_available, entities, message = self.entity_repository.get_entity_list()
+            # The sparse pending index is tiny, so most nights end here without a scan
+            status, pending_entities, message = (
+                self.entity_repository.get_pending_suggestion_entities()
+            )
             if status != HTTPStatus.OK:
-                self.logger.warning(
-                    {
-                        'message': 'Failed to get entity list',
-                        'status': status,
-                        'error_message': message,
-                    }
-                )
+                return ErrorResponse(response=message, status=status)
+
+            selected_entity_hash_key = {
+                hash_key
+                for hash_key in pending_entities
+                if not entity_ids_selected or hash_key.split('#')[1] in entity_ids_selected
+            }
+            if not selected_entity_hash_key:
+                self.logger.info({'message': 'No entities pending suggestion generation'})
                 return ErrorResponse(
-                    response=message,
-                    status=status,
+                    response='No entities selected',
+                    status=HTTPStatus.BAD_REQUEST,
                 )
 
+            # Every available entity is a match candidate for every prompt, so the whole list is
+            # needed and the cached snapshot serves it without a scan on most runs
+            entities_available = self.entity_repository.get_entity_snapshot(
+                fields=EntityConstants.MATCHING_FIELDS
+            )
+            entities_selected = [
+                entity
+                for entity in entities_available
+                if entity.hashKey in selected_entity_hash_key
+            ]
+
             self.logger.info(
                 {
                     'message': 'Successfully retrieved entity list',
@@ -54,23 +138,6 @@ class SuggestionUsecase:
                 }
             )
 
-            entities_selected = []
-            selected_entity_hash_key = []
-            for entity in entities_available:
-                is_in_selected_entity_list = (
-                    entity_ids_selected
-                    and (entity.startupId or entity.enablerId) in entity_ids_selected
-                )
-                entity_list_not_provided = not entity_ids_selected
-
-                is_add_to_entities_selected = (
-                    entity_list_not_provided or is_in_selected_entity_list
-                ) and entity.forSuggestionGeneration
-
-                if is_add_to_entities_selected:
-                    entities_selected.append(entity)
-                    selected_entity_hash_key.append(entity.hashKey)
-
             if not entities_selected:
                 self.logger.error(
                     {
@@ -82,20 +149,36 @@ class SuggestionUsecase:
                     status=HTTPStatus.BAD_REQUEST,
                 )
 
+            fingerprints = {
+                entity.hashKey: self.llm_usecase.entity_serializer.fingerprint(entity)
+                for entity in entities_selected
+            }
+            entities_changed = entities_selected
+            if self.incremental_enabled:
+                entities_changed = self.get_changed_entities(entities_selected, fingerprints)
+
             self.logger.info(
                 {
                     'message': 'Filtered selected entities',
                     'entities_selected_count': len(entities_selected),
+                    'entities_changed_count': len(entities_changed),
                 }
             )
 
+            if not entities_changed:
+                self.logger.info({'message': 'No matching fields changed, skipping generation'})
+                error_response = self.clear_pending_entities(
+                    entities_selected, pending_entities, fingerprints
+                )
+                return error_response or SuggestionMatchList(matches=[])
+
             # Track which selected entities have received suggestions
             entities_with_suggestions = set()
             all_matches = []
 
             # First attempt to get suggestions for all entities
             self.logger.debug('Generating initial suggestions for all entities')
-            suggestions = self.llm_usecase.generate_response(entities_available, entities_selected)
+            suggestions = self.llm_usecase.generate_response(entities_available, entities_changed)
             if isinstance(suggestions, ErrorResponse):
                 self.logger.warning(
                     {
@@ -123,7 +206,7 @@ class SuggestionUsecase:
             # Check if any selected entities didn't get suggestions
             entities_missing_suggestions = [
                 entity
-                for entity in entities_selected
+                for entity in entities_changed
                 if (entity.startupId or entity.enablerId) not in entities_with_suggestions
             ]
 
@@ -169,25 +252,11 @@ class SuggestionUsecase:
                     status=status,
                 )
 
-            entity_models_selected = []
-            for entity_model in entities:
-                if entity_model.hashKey and entity_model.hashKey in selected_entity_hash_key:
-                    entity_models_selected.append(entity_model)
-
-            status, message = self.entity_repository.update_entity_for_suggestion_generation(
-                entity_list=entity_models_selected, update_value=False
+            error_response = self.clear_pending_entities(
+                entities_selected, pending_entities, fingerprints
             )
-            if status != HTTPStatus.OK:
-                self.logger.error(
-                    {
-                        'message': 'Failed to update entity for suggestion generation',
-                        'error': message,
-                    }
-                )
-                return ErrorResponse(
-                    response=message,
-                    status=status,
-                )
+            if error_response:
+                return error_response
 
             self.logger.info(
                 {
@@ -0,0 +1,288 @@
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from shared_modules.models.schema.entity import EntitySchema
+
+# Weight of each feature in the compatibility score, the score is between 0 and 1
+FEATURE_WEIGHTS: Dict[str, float] = {
+    'industry': 0.4,
+    'stage': 0.25,
+    'business_model': 0.15,
+    'location': 0.2,
+}
+
+# Score of the location feature when either entity has no coordinates
+UNKNOWN_LOCATION_SCORE = 0.5
+EARTH_RADIUS_KM = 6371.0
+
+# Selected entities are scored in blocks of rows so memory stays flat for large catalogs
+BLOCK_ROWS = 512
+
+
+def normalize_value(value: str) -> str:
+    """Normalize a categorical value so that case and spacing variants match.
+
+    :param str value: The categorical value
+    :return str: The normalized value
+    """
+    return ' '.join(value.lower().split())
+
+
+class FeatureEncoder:
+    """Encodes sets of categorical values as multi-hot rows over a shared vocabulary."""
+
+    def __init__(self):
+        self.vocabulary: Dict[str, int] = {}
+
+    def encode(self, value_sets: List[Iterable[str]]) -> np.ndarray:
+        """Encode one set of values per entity.
+
+        :param List[Iterable[str]] value_sets: The values of each entity
+        :return np.ndarray: A float32 matrix with one row per entity and one column per value
+        """
+        indexed_rows = []
+        for values in value_sets:
+            indexed_rows.append(
+                {
+                    self.vocabulary.setdefault(normalize_value(value), len(self.vocabulary))
+                    for value in values
+                    if value
+                }
+            )
+
+        matrix = np.zeros((len(indexed_rows), max(len(self.vocabulary), 1)), dtype=np.float32)
+        for row, columns in enumerate(indexed_rows):
+            matrix[row, list(columns)] = 1
+        return matrix
+
+
+class EntityFeatures:
+    """The matching features of a list of entities as NumPy arrays."""
+
+    def __init__(
+        self,
+        industries: np.ndarray,
+        stage_have: np.ndarray,
+        stage_want: np.ndarray,
+        model_have: np.ndarray,
+        model_want: np.ndarray,
+        positions: np.ndarray,
+        keys: List[str],
+    ):
+        self.industries = industries
+        self.stage_have = stage_have
+        self.stage_want = stage_want
+        self.model_have = model_have
+        self.model_want = model_want
+        # Unit vectors of the locations on the globe, all zero when unknown
+        self.positions = positions
+        self.keys = keys
+
+
+class CompatibilityScorer:
+    """
+    Vectorized compatibility scoring of selected entities against available entities
+
+    Every pair is scored in one pass of matrix products over multi-hot feature matrices:
+    industry overlap, the stage of a startup against the stages an enabler prefers or funds,
+    the revenue model of a startup against the business models an enabler prefers, and the
+    distance between their coordinates. The score is deterministic and only used to pick which
+    candidates reach the matching LLM call.
+    """
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None, location_scale_km=10.0):
+        self.weights = weights or FEATURE_WEIGHTS
+        self.location_scale_km = location_scale_km
+
+    @staticmethod
+    def get_position(entity: EntitySchema) -> Tuple[float, float, float]:
+        """Get the location of an entity as a unit vector, so distances reduce to dot products.
+
+        :param EntitySchema entity: The entity
+        :return Tuple[float, float, float]: The unit vector, all zero when the location is unknown
+        """
+        latlng = entity.location.latlng if entity.location else None
+        if not latlng or latlng.get('lat') is None or latlng.get('lng') is None:
+            return 0.0, 0.0, 0.0
+
+        lat, lng = math.radians(latlng['lat']), math.radians(latlng['lng'])
+        return math.cos(lat) * math.cos(lng), math.cos(lat) * math.sin(lng), math.sin(lat)
+
+    def encode(
+        self,
+        entities_selected: List[EntitySchema],
+        entities_available: List[EntitySchema],
+    ) -> Tuple[EntityFeatures, EntityFeatures]:
+        """Encode the features of both entity lists over shared vocabularies.
+
+        :param List[EntitySchema] entities_selected: The selected entities
+        :param List[EntitySchema] entities_available: The available entities
+        :return Tuple[EntityFeatures, EntityFeatures]: The selected and available features
+        """
+        entities = entities_selected + entities_available
+        industry_encoder = FeatureEncoder()
+        stage_encoder = FeatureEncoder()
+        model_encoder = FeatureEncoder()
+
+        industries = industry_encoder.encode(
+            [(entity.industries or []) + (entity.industryFocus or []) for entity in entities]
+        )
+        stage_have = stage_encoder.encode(
+            [[entity.startupStage] if entity.startupStage else [] for entity in entities]
+        )
+        stage_want = stage_encoder.encode(
+            [
+                (entity.startupStagePreference or []) + (entity.fundingStageFocus or [])
+                for entity in entities
+            ]
+        )
+        model_have = model_encoder.encode([entity.revenueModel or [] for entity in entities])
+        model_want = model_encoder.encode(
+            [entity.preferredBusinessModels or [] for entity in entities]
+        )
+        positions = np.array(
+            [self.get_position(entity) for entity in entities], dtype=np.float32
+        ).reshape(-1, 3)
+        keys = [entity.hashKey for entity in entities]
+
+        # Values seen only after an earlier matrix was encoded widen the vocabulary
+        stage_have = self.pad_columns(stage_have, len(stage_encoder.vocabulary))
+        model_have = self.pad_columns(model_have, len(model_encoder.vocabulary))
+
+        selected_count = len(entities_selected)
+        return tuple(
+            EntityFeatures(
+                industries[rows],
+                stage_have[rows],
+                stage_want[rows],
+                model_have[rows],
+                model_want[rows],
+                positions[rows],
+                keys[rows],
+            )
+            for rows in (slice(0, selected_count), slice(selected_count, None))
+        )
+
+    @staticmethod
+    def pad_columns(matrix: np.ndarray, column_count: int) -> np.ndarray:
+        """Pad a multi-hot matrix with empty columns up to a vocabulary size."""
+        missing = max(column_count, 1) - matrix.shape[1]
+        return np.pad(matrix, ((0, 0), (0, missing))) if missing > 0 else matrix
+
+    @staticmethod
+    def overlap(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """Get the overlap coefficient of every pair of rows, 0 when either row is empty.
+
+        :param np.ndarray left: Multi-hot rows
+        :param np.ndarray right: Multi-hot rows over the same vocabulary
+        :return np.ndarray: The pairwise overlap, shaped (left rows, right rows)
+        """
+        shared = left @ right.T
+        smaller = np.minimum(left.sum(axis=1)[:, None], right.sum(axis=1)[None, :])
+        return np.divide(shared, smaller, out=np.zeros_like(shared), where=smaller > 0)
+
+    def fit(self, left_have, left_want, right_have, right_want) -> np.ndarray:
+        """Check if what one side has is wanted by the other, in either direction.
+
+        :return np.ndarray: 1 for every pair where a wanted value is present, else 0
+        """
+        return np.minimum(left_have @ right_want.T + left_want @ right_have.T, 1)
+
+    def location(self, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """Score the proximity of every pair of locations, decaying with distance.
+
+        Distances are chord lengths, which match great-circle distances to well under a percent
+        at the scale of a city.
+
+        :param np.ndarray left: Unit vector rows, all zero when unknown
+        :param np.ndarray right: Unit vector rows, all zero when unknown
+        :return np.ndarray: The pairwise proximity between 0 and 1
+        """
+        chord_squared = np.maximum(2 - 2 * (left @ right.T), 0)
+        proximity = np.exp(np.sqrt(chord_squared) * -(EARTH_RADIUS_KM / self.location_scale_km))
+        proximity[~left.any(axis=1), :] = UNKNOWN_LOCATION_SCORE
+        proximity[:, ~right.any(axis=1)] = UNKNOWN_LOCATION_SCORE
+        return proximity
+
+    def score_block(self, selected: EntityFeatures, available: EntityFeatures) -> np.ndarray:
+        """Score every pair of a block of selected entities and the available entities.
+
+        :param EntityFeatures selected: The features of a block of selected entities
+        :param EntityFeatures available: The features of the available entities
+        :return np.ndarray: The pairwise scores, -inf for an entity paired with itself
+        """
+        scores = self.weights['industry'] * self.overlap(selected.industries, available.industries)
+        scores += self.weights['stage'] * self.fit(
+            selected.stage_have, selected.stage_want, available.stage_have, available.stage_want
+        )
+        scores += self.weights['business_model'] * self.fit(
+            selected.model_have, selected.model_want, available.model_have, available.model_want
+        )
+        scores += self.weights['location'] * self.location(selected.positions, available.positions)
+
+        available_rows = {key: column for column, key in enumerate(available.keys)}
+        for row, key in enumerate(selected.keys):
+            column = available_rows.get(key)
+            if column is not None:
+                scores[row, column] = -np.inf
+        return scores
+
+    def top_candidates(
+        self,
+        entities_selected: List[EntitySchema],
+        entities_available: List[EntitySchema],
+        top_k: int,
+    ) -> np.ndarray:
+        """Get the indexes of the top-K available entities for every selected entity.
+
+        :param List[EntitySchema] entities_selected: The selected entities
+        :param List[EntitySchema] entities_available: The available entities
+        :param int top_k: The number of candidates per selected entity
+        :return np.ndarray: Available entity indexes shaped (selected, K), best first
+        """
+        top_k = min(top_k, len(entities_available))
+        if not entities_selected or top_k <= 0:
+            return np.zeros((len(entities_selected), 0), dtype=np.int64)
+
+        selected, available = self.encode(entities_selected, entities_available)
+        candidate_blocks = []
+        for start in range(0, len(entities_selected), BLOCK_ROWS):
+            rows = slice(start, start + BLOCK_ROWS)
+            block = EntityFeatures(
+                selected.industries[rows],
+                selected.stage_have[rows],
+                selected.stage_want[rows],
+                selected.model_have[rows],
+                selected.model_want[rows],
+                selected.positions[rows],
+                selected.keys[rows],
+            )
+            scores = self.score_block(block, available)
+
+            # Partition first so only the K best of each row are sorted
+            candidates = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+            candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+            order = np.argsort(-candidate_scores, axis=1, kind='stable')
+            candidate_blocks.append(np.take_along_axis(candidates, order, axis=1))
+
+        return np.vstack(candidate_blocks)
+
+    def select_candidates(
+        self,
+        entities_selected: List[EntitySchema],
+        entities_available: List[EntitySchema],
+        top_k: int,
+    ) -> List[EntitySchema]:
+        """Get the available entities that are a top-K candidate of any selected entity.
+
+        :param List[EntitySchema] entities_selected: The selected entities
+        :param List[EntitySchema] entities_available: The available entities
+        :param int top_k: The number of candidates per selected entity
+        :return List[EntitySchema]: The candidates, best ranked first
+        """
+        candidates = self.top_candidates(entities_selected, entities_available, top_k)
+
+        # Column by column, so every selected entity's best candidates come first
+        candidate_indexes = dict.fromkeys(int(index) for index in candidates.T.ravel())
+        return [entities_available[index] for index in candidate_indexes]
@@ -0,0 +1,125 @@
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from shared_modules.constants.entity_constants import EntityType
+from shared_modules.models.schema.entity import EntitySchema
+from shared_modules.utils.token_estimator import truncate_to_tokens
+
+# Short key of every field written to the matching prompt and what it stands for, in the order
+# the keys are written. The prompt explains the keys with this legend, so keep them stable.
+COMPACT_KEYS: Tuple[Tuple[str, str], ...] = (
+    ('id', 'entityId'),
+    ('t', 'entityType'),
+    ('n', 'name'),
+    ('d', 'description'),
+    ('loc', 'location'),
+    ('est', 'dateFounded'),
+    ('ind', 'industries'),
+    ('stg', 'startupStage'),
+    ('rev', 'revenueModel'),
+    ('ms', 'milestones'),
+    ('org', 'organizationType'),
+    ('foc', 'industryFocus'),
+    ('sup', 'supportType'),
+    ('fund', 'fundingStageFocus'),
+    ('pref', 'startupStagePreference'),
+    ('bm', 'preferredBusinessModels'),
+    ('amt', 'investmentAmount'),
+    ('crit', 'investmentCriteria'),
+    ('pf', 'portfolio'),
+)
+
+# Free text longer than this many estimated tokens is cut
+DEFAULT_TEXT_MAX_TOKENS = 80
+
+
+class CompactEntitySerializer:
+    """
+    Serializes entities for the matching prompt with only the fields used for matching
+
+    Every entity becomes one line of JSON with the short keys of COMPACT_KEYS. Empty fields
+    are dropped and free text is truncated. Contacts, founders, emails, coordinates and storage
+    keys are left out because they play no part in matching.
+    """
+
+    def __init__(self, text_max_tokens: int = DEFAULT_TEXT_MAX_TOKENS):
+        self.text_max_tokens = text_max_tokens
+
+    @property
+    def legend(self) -> str:
+        """Get the explanation of the short keys for the prompt.
+
+        :return str: The short keys and the fields they stand for
+        """
+        return ', '.join(f'{key}={field}' for key, field in COMPACT_KEYS)
+
+    def truncate(self, text: Optional[str]) -> Optional[str]:
+        """Collapse the whitespace of a free text field and cut it to the text token limit.
+
+        :param Optional[str] text: The text
+        :return Optional[str]: The truncated text, None if it is empty
+        """
+        if not text:
+            return None
+        return truncate_to_tokens(' '.join(text.split()), self.text_max_tokens) or None
+
+    def to_fields(self, entity: EntitySchema) -> Dict[str, Any]:
+        """Get the compact fields of an entity.
+
+        :param EntitySchema entity: The entity
+        :return Dict[str, Any]: The non-empty fields under their short keys
+        """
+        if entity.startupId:
+            entity_id, entity_type, name = entity.startupId, EntityType.STARTUP, entity.startUpName
+        else:
+            entity_id, entity_type, name = entity.enablerId, EntityType.ENABLER, entity.enablerName
+
+        amount = entity.investmentAmount
+        values = {
+            'id': entity_id,
+            't': entity_type.value,
+            'n': name,
+            'd': self.truncate(entity.description),
+            'loc': self.truncate(entity.location.address if entity.location else None),
+            'est': entity.dateFounded,
+            'ind': entity.industries,
+            'stg': entity.startupStage,
+            'rev': entity.revenueModel,
+            'ms': self.compact_list(milestone.title for milestone in entity.milestones or []),
+            'org': entity.organizationType,
+            'foc': entity.industryFocus,
+            'sup': entity.supportType,
+            'fund': entity.fundingStageFocus,
+            'pref': entity.startupStagePreference,
+            'bm': entity.preferredBusinessModels,
+            'amt': int(amount) if amount is not None and amount.is_integer() else amount,
+            'crit': self.compact_list(
+                criteria.criteriaName or criteria.details
+                for criteria in entity.investmentCriteria or []
+            ),
+            'pf': self.compact_list(
+                item.supportedStartupProject for item in entity.portfolio or []
+            ),
+        }
+        return {key: values[key] for key, _ in COMPACT_KEYS if values[key] not in (None, '', [])}
+
+    def compact_list(self, texts) -> List[str]:
+        """Truncate a list of texts, dropping the empty ones."""
+        return [text for text in (self.truncate(text) for text in texts) if text]
+
+    def serialize(self, entity: EntitySchema) -> str:
+        """Serialize an entity as one line of compact JSON.
+
+        :param EntitySchema entity: The entity
+        :return str: The compact JSON
+        """
+        return json.dumps(self.to_fields(entity), ensure_ascii=False, separators=(',', ':'))
+
+    def fingerprint(self, entity: EntitySchema) -> str:
+        """Hash the serialized entity, so the hash only changes when what the prompt sees changes.
+
+        :param EntitySchema entity: The entity
+        :return str: The hex SHA-256 of the compact JSON
+        """
+        return hashlib.sha256(self.serialize(entity).encode('utf-8')).hexdigest()
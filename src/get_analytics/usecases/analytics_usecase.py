@@ -24,6 +24,7 @@ class AnalyticsUsecase:
     def __init__(self):
         self.entity_repository = EntityRepository()
         self.suggestion_repository = SuggestionRepository()
+        self.entity_fields = ['startUpName', 'enablerName', 'startupStage']
 
     def get_analytics(self, entity_type: EntityType, entity_id: str) -> Analytics:
         """
@@ -58,7 +59,8 @@ class AnalyticsUsecase:
 
         for suggestion in suggestions:
             status, entity_list, message = self.entity_repository.batch_get_entities(
-                [(suggestion.matchPairId, f'{suggestion.matchPairType}#METADATA')]
+                [(suggestion.matchPairId, f'{suggestion.matchPairType}#METADATA')],
+                fields=self.entity_fields,
             )
             if status != HTTPStatus.OK or not entity_list:
                 return ErrorResponse(
@@ -2,7 +2,7 @@ from http import HTTPStatus
 from typing import List
 
 from aws_lambda_powertools import Logger
-from shared_modules.constants.entity_constants import EntityType
+from shared_modules.constants.entity_constants import EntityConstants, EntityType
 from shared_modules.models.schema.entity import EntitySchema
 from shared_modules.repositories.entity_repository import EntityRepository
 from shared_modules.repositories.profiles_repository import ProfilesRepository
@@ -13,18 +13,7 @@ class SavedProfilesUsecase:
         self.profiles_repository = ProfilesRepository()
         self.entity_repository = EntityRepository()
         self.logger = Logger()
-        self.entity_field_map = {
-            EntityType.STARTUP: {
-                'contacts': 'STARTUP#CONTACTS',
-                'milestones': 'STARTUP#MILESTONES',
-                'founders': 'STARTUP#FOUNDERS',
-            },
-            EntityType.ENABLER: {
-                'contacts': 'ENABLER#CONTACTS',
-                'investmentCriteria': 'ENABLER#INVESTMENT_CRITERIA',
-                'portfolio': 'ENABLER#PORTFOLIO',
-            },
-        }
+        self.entity_field_map = EntityConstants.ENTITY_FIELD_MAP
 
     def get_saved_profiles(
         self, entity_type: EntityType, entity_id: str, query_selection_set: str
@@ -44,6 +33,7 @@ class SavedProfilesUsecase:
             self.logger.error(f'Failed to get saved profiles: {status}')
             return []
 
+        selected_fields = EntityConstants.parse_selection_set(query_selection_set)
         profile_item_keys = []
         for profile in saved_profiles:
             hash_key = f'{profile.savedProfileType}#{profile.savedProfileId}'
@@ -54,10 +44,13 @@ class SavedProfilesUsecase:
             profile_item_keys.extend(
                 (hash_key, key_suffix)
                 for field, key_suffix in entity_fields.items()
-                if field in query_selection_set
+                if field in selected_fields
             )
 
-        status, entities, _ = self.entity_repository.batch_get_entities(item_keys=profile_item_keys)
+        status, entities, _ = self.entity_repository.batch_get_entities(
+            item_keys=profile_item_keys,
+            fields=EntityConstants.get_selected_fields(query_selection_set),
+        )
         if status != HTTPStatus.OK:
             self.logger.error(f'Failed to get entities: {status}')
             return []
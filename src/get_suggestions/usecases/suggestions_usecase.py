@@ -1,7 +1,7 @@
 from http import HTTPStatus
 from typing import List
 
-from shared_modules.constants.entity_constants import EntityType
+from shared_modules.constants.entity_constants import EntityConstants, EntityType
 from shared_modules.models.schema.entity import EntitySchema
 from shared_modules.repositories.entity_repository import EntityRepository
 from shared_modules.repositories.suggestion_repository import SuggestionRepository
@@ -11,18 +11,7 @@ class SuggestionsUsecase:
     def __init__(self):
         self.suggestion_repository = SuggestionRepository()
         self.entity_repository = EntityRepository()
-        self.entity_field_map = {
-            EntityType.STARTUP: {
-                'contacts': 'STARTUP#CONTACTS',
-                'milestones': 'STARTUP#MILESTONES',
-                'founders': 'STARTUP#FOUNDERS',
-            },
-            EntityType.ENABLER: {
-                'contacts': 'ENABLER#CONTACTS',
-                'investmentCriteria': 'ENABLER#INVESTMENT_CRITERIA',
-                'portfolio': 'ENABLER#PORTFOLIO',
-            },
-        }
+        self.entity_field_map = EntityConstants.ENTITY_FIELD_MAP
 
     def get_suggestions(
         self, entity_type: EntityType, entity_id: str, query_selection_set: str
@@ -42,6 +31,7 @@ class SuggestionsUsecase:
             return []
 
         saved_profile_ids = [saved_profile.savedProfileId for saved_profile in saved_profiles]
+        selected_fields = EntityConstants.parse_selection_set(query_selection_set)
         suggestion_item_keys = []
         for suggestion in suggestions:
             suggestion_item_keys.append(
@@ -53,11 +43,12 @@ class SuggestionsUsecase:
             suggestion_item_keys.extend(
                 (suggestion.matchPairId, key_suffix)
                 for field, key_suffix in entity_fields.items()
-                if field in query_selection_set
+                if field in selected_fields
             )
 
         status, entities, _ = self.entity_repository.batch_get_entities(
-            item_keys=suggestion_item_keys
+            item_keys=suggestion_item_keys,
+            fields=EntityConstants.get_selected_fields(query_selection_set),
         )
         if status != HTTPStatus.OK:
             return []
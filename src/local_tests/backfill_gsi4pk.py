@@ -0,0 +1,31 @@
+from dotenv import load_dotenv
+from shared_modules.constants.entity_constants import EntityConstants
+
+load_dotenv()
+
+from shared_modules.models.dynamodb.entity import Entity  # noqa: E402
+
+
+def main():
+    """Set GSI4PK on METADATA items flagged for suggestion generation before the sparse
+    GSI4PK index existed."""
+    items = Entity.scan(
+        filter_condition=Entity.rangeKey.is_in('STARTUP#METADATA', 'ENABLER#METADATA')
+        & (Entity.forSuggestionGeneration == True)  # noqa: E712
+        & Entity.GSI4PK.does_not_exist(),
+        attributes_to_get=['hashKey', 'rangeKey'],
+    )
+
+    updated_count = 0
+    for item in items:
+        item.update(
+            actions=[Entity.GSI4PK.set(EntityConstants.PENDING_SUGGESTION_GSI4PK)],
+            condition=Entity.hashKey.exists(),
+        )
+        updated_count += 1
+
+    print(f'Backfilled GSI4PK on {updated_count} pending METADATA items')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from rag_api.constants.chat_constants import ChatConstants, ChatStreamMode
+from rag_api.models.chat import SendChatChunkIn
+
+DELTA_COUNT = 400
+DELTAS_PER_CHUNK = 10
+DELTA_INTERVAL_SECONDS = 0.002
+MUTATION_LATENCY_SECONDS = 0.04
+
+received_chunks = []
+client_ports = set()
+
+
+class AppSyncStandInHandler(BaseHTTPRequestHandler):
+    """Answers sendChatChunk after a fixed delay, like an AppSync round-trip."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)))
+        chunk_input = request['variables']['input']
+        received_chunks.append(chunk_input)
+        client_ports.add(self.client_address[1])
+        time.sleep(MUTATION_LATENCY_SECONDS)
+
+        body = json.dumps({'data': {'sendChatChunk': chunk_input}}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def stream(send_chunk, stream_mode: ChatStreamMode = ChatStreamMode.CUMULATIVE) -> float:
+    """Replay a Bedrock stream, sending a chunk every DELTAS_PER_CHUNK deltas.
+
+    :param send_chunk: Called with each SendChatChunkIn
+    :param ChatStreamMode stream_mode: Whether chunks carry the response so far or the new text
+    :return float: Milliseconds the stream loop took
+    """
+    start = time.perf_counter()
+    response_text = ''
+    chunk_text = ''
+    for index in range(DELTA_COUNT):
+        time.sleep(DELTA_INTERVAL_SECONDS)
+        chunk_text += f'token{index} '
+        if (index + 1) % DELTAS_PER_CHUNK == 0:
+            response_text += chunk_text
+            is_delta = stream_mode == ChatStreamMode.DELTA
+            send_chunk(chunk(chunk_text if is_delta else response_text, stream_mode))
+            chunk_text = ''
+
+    end_of_message = chunk(ChatConstants.END_OF_MESSAGE, stream_mode)
+    if stream_mode == ChatStreamMode.DELTA:
+        end_of_message.totalLength = len(response_text.encode('utf-8'))
+        end_of_message.checksum = hashlib.sha256(response_text.encode('utf-8')).hexdigest()
+    send_chunk(end_of_message)
+    return (time.perf_counter() - start) * 1000
+
+
+def chunk(response_text: str, stream_mode: ChatStreamMode) -> SendChatChunkIn:
+    return SendChatChunkIn(
+        chatTopicId='benchmark-topic',
+        userId='benchmark-user',
+        entryId='1',
+        response=response_text,
+        streamMode=stream_mode if stream_mode == ChatStreamMode.DELTA else None,
+    )
+
+
+def is_complete() -> bool:
+    """Check the received chunks the way a subscriber would."""
+    *chunks, end_of_message = received_chunks
+    if end_of_message['response'] != ChatConstants.END_OF_MESSAGE:
+        return False
+
+    if end_of_message.get('streamMode') != ChatStreamMode.DELTA.value:
+        responses = [chunk_input['response'] for chunk_input in chunks]
+        return all(later.startswith(earlier) for earlier, later in zip(responses, responses[1:]))
+
+    sequences = [chunk_input['sequence'] for chunk_input in received_chunks]
+    response_bytes = ''.join(chunk_input['response'] for chunk_input in chunks).encode('utf-8')
+    return (
+        sequences == list(range(len(received_chunks)))
+        and len(response_bytes) == end_of_message['totalLength']
+        and hashlib.sha256(response_bytes).hexdigest() == end_of_message['checksum']
+    )
+
+
+def report(name: str, stream_ms: float, total_ms: float):
+    response_bytes = sum(len(chunk_input['response'].encode()) for chunk_input in received_chunks)
+    print(
+        f'{name:<22} stream {stream_ms:7.0f} ms   total {total_ms:7.0f} ms   '
+        f'mutations {len(received_chunks):3}   response bytes {response_bytes:7}   '
+        f'connections {len(client_ports):3}   complete {is_complete()}'
+    )
+    received_chunks.clear()
+    client_ports.clear()
+
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), AppSyncStandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ['GRAPHQL_URL'] = f'http://127.0.0.1:{server.server_address[1]}/graphql'
+    os.environ.setdefault('API_KEY', 'benchmark')
+
+    from rag_api.external.chat_chunk_publisher import ChatChunkPublisher
+    from rag_api.external.graphql_gateway import GraphQLGateway
+
+    print(
+        f'{DELTA_COUNT} deltas every {DELTA_INTERVAL_SECONDS * 1000:.0f} ms, '
+        f'{MUTATION_LATENCY_SECONDS * 1000:.0f} ms per mutation'
+    )
+
+    # Before: each chunk blocks the stream on a new session and a full round-trip
+    gateway = GraphQLGateway()
+    start = time.perf_counter()
+    stream_ms = stream(gateway.send_chat_chunk)
+    report('blocking send', stream_ms, (time.perf_counter() - start) * 1000)
+
+    # After: chunks are queued, coalesced and sent over one session in the background
+    publisher = ChatChunkPublisher()
+    start = time.perf_counter()
+    stream_ms = stream(publisher.publish)
+    publisher.flush()
+    report('background publisher', stream_ms, (time.perf_counter() - start) * 1000)
+
+    # Delta chunks carry only the new text, coalesced deltas are concatenated
+    start = time.perf_counter()
+    stream_ms = stream(publisher.publish, ChatStreamMode.DELTA)
+    publisher.flush()
+    report('background delta', stream_ms, (time.perf_counter() - start) * 1000)
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+import json
+import os
+import statistics
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'benchmark')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'benchmark')
+os.environ.setdefault('REGION', 'ap-southeast-1')
+os.environ.setdefault('ENTITIES_TABLE', 'benchmark-entity-table')
+
+TURN_COUNT = 50
+REQUEST_LATENCY_SECONDS = 0.008
+
+operations = Counter()
+transactions = []
+
+
+class DynamoDBStandInHandler(BaseHTTPRequestHandler):
+    """Answers chat writes after a fixed delay, like a DynamoDB round-trip."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)))
+        operation = self.headers['X-Amz-Target'].split('.')[-1]
+        operations[operation] += 1
+        if operation == 'TransactWriteItems':
+            transactions.append(request['TransactItems'])
+        time.sleep(REQUEST_LATENCY_SECONDS)
+
+        body = json.dumps(
+            {'Items': [], 'Count': 0, 'ScannedCount': 0} if operation == 'Query' else {}
+        ).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-amz-json-1.0')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def report(name: str, latencies: list):
+    latencies = sorted(latencies)
+    requests_per_turn = sum(operations.values()) / TURN_COUNT
+    print(
+        f'{name:<22} requests/turn {requests_per_turn:4.1f}   '
+        f'p50 {statistics.median(latencies):6.1f} ms   '
+        f'p99 {latencies[int(len(latencies) * 0.99) - 1]:6.1f} ms   {dict(operations)}'
+    )
+    operations.clear()
+
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), DynamoDBStandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host = f'http://127.0.0.1:{server.server_address[1]}'
+
+    from rag_api.models.chat import Chat, ChatIn
+    from rag_api.models.chat_topic import ChatTopic, ChatTopicIn
+    from rag_api.repositories.chat_repository import ChatRepository
+    from rag_api.repositories.chat_topic_repository import ChatTopicRepository
+    from shared_modules.utils.client_registry import client_registry
+
+    for model in (Chat, ChatTopic):
+        model.Meta.host = host
+    client_registry.get_connection(host=host)
+    chat_repository = ChatRepository()
+    chat_topic_repository = ChatTopicRepository()
+    chat_repository.conn = client_registry.get_connection(host=host)
+
+    def chat_ins(turn: int):
+        return [
+            ChatIn(userId='user', chatTopicId=f'topic-{turn}', message=text, type=chat_type)
+            for text, chat_type in (('prompt', 'USER_PROMPT'), ('response', 'LLM_RESPONSE'))
+        ]
+
+    # Before: query the topic, create or update it, then save each message
+    latencies = []
+    for turn in range(TURN_COUNT):
+        start = time.perf_counter()
+        _, chat_topic, _ = chat_topic_repository.query_chat_topic('user', f'topic-{turn}')
+        if chat_topic:
+            chat_topic_repository.update_chat_topic(chat_topic)
+        else:
+            chat_topic_repository.store_chat_topic(
+                ChatTopicIn(userId='user', title='prompt', entryId=f'topic-{turn}')
+            )
+        for chat_in in chat_ins(turn):
+            chat_repository.store_chat(chat_in)
+        latencies.append((time.perf_counter() - start) * 1000)
+    report('separate writes', latencies)
+
+    # After: upsert the topic and save both messages in one transaction
+    latencies = []
+    for turn in range(TURN_COUNT):
+        start = time.perf_counter()
+        chat_repository.store_chat_turn(
+            ChatTopicIn(userId='user', title='prompt', entryId=f'topic-{turn}'),
+            [chat_repository.build_chat(chat_in) for chat_in in chat_ins(turn)],
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+    report('one transaction', latencies)
+
+    server.shutdown()
+    actions = [next(iter(transact_item)) for transact_item in transactions[0]]
+    print(f'Each transaction holds {len(actions)} actions: {", ".join(actions)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault('ENTITIES_TABLE', 'benchmark-entity-table')
+os.environ.setdefault('REGION', 'ap-southeast-1')
+os.environ.setdefault('BEDROCK_AWS_REGION', 'us-east-1')
+
+from rag_api.constants.chat_constants import ChatConstants  # noqa: E402
+from shared_modules.utils.flush_policy import (  # noqa: E402
+    AdaptiveFlushPolicy,
+    CountFlushPolicy,
+    FlushPolicy,
+)
+
+# The flush threshold used before the adaptive policy
+LEGACY_DELTAS_PER_CHUNK = 10
+RECORD_PROMPT = 'Give me an overview of the startup ecosystem in Davao City and who to talk to.'
+
+
+def synthesize_recording(seed: int, delta_count: int, mean_gap_ms: float, pause_rate: float):
+    """Build a recording shaped like a Bedrock stream: short deltas, bursts and pauses.
+
+    :return list: [offset_ms, text] pairs
+    """
+    rng = random.Random(seed)
+    offset_ms = 0.0
+    recording = []
+    for index in range(delta_count):
+        if rng.random() < 0.3:
+            gap_ms = 0.0
+        elif rng.random() < pause_rate:
+            gap_ms = rng.uniform(400, 900)
+        else:
+            gap_ms = rng.expovariate(1 / mean_gap_ms)
+        offset_ms += gap_ms
+        recording.append([offset_ms, ' ' + 'x' * rng.randint(1, 10)])
+    return recording
+
+
+def record(path: str):
+    """Record the delta timings of a real Bedrock stream to a JSON file."""
+    from rag_api.usecases.llm_usecase import LLMUsecase
+
+    usecase = LLMUsecase()
+    start = time.monotonic()
+    recording = [
+        [(time.monotonic() - start) * 1000, text] for text in usecase.invoke_llm(RECORD_PROMPT)
+    ]
+    with open(path, 'w') as recording_file:
+        json.dump(recording, recording_file)
+    print(f'Recorded {len(recording)} deltas to {path}')
+
+
+def replay(recording: list, flush_policy: FlushPolicy) -> dict:
+    """Replay a recording through a flush policy, assuming flushes are published instantly.
+
+    :return dict: Mutation count, peak mutations per second and delta latency percentiles
+    """
+    pending_offsets = []
+    latencies_ms = []
+    flush_offsets = []
+
+    def flush(offset_ms: float):
+        latencies_ms.extend(offset_ms - pending_offset for pending_offset in pending_offsets)
+        pending_offsets.clear()
+        flush_offsets.append(offset_ms)
+        flush_policy.record_flush(offset_ms / 1000)
+
+    for offset_ms, text in recording:
+        pending_offsets.append(offset_ms)
+        if flush_policy.add(text, offset_ms / 1000):
+            flush(offset_ms)
+
+    # The remaining text is sent when the stream ends
+    if pending_offsets:
+        flush(recording[-1][0])
+
+    peak_per_second = max(
+        sum(1 for other in flush_offsets if offset <= other < offset + 1000)
+        for offset in flush_offsets
+    )
+    latencies_ms.sort()
+    return {
+        'mutations': len(flush_offsets),
+        'peak_per_second': peak_per_second,
+        'p50_ms': statistics.median(latencies_ms),
+        'p95_ms': latencies_ms[int(len(latencies_ms) * 0.95) - 1],
+        'max_ms': latencies_ms[-1],
+    }
+
+
+def main():
+    if sys.argv[1:2] == ['--record']:
+        record(sys.argv[2])
+        return
+
+    recordings = {
+        'fast stream': synthesize_recording(1, 600, mean_gap_ms=6, pause_rate=0.0),
+        'steady stream': synthesize_recording(2, 400, mean_gap_ms=25, pause_rate=0.01),
+        'slow stream': synthesize_recording(3, 150, mean_gap_ms=120, pause_rate=0.05),
+    }
+    for path in sys.argv[1:]:
+        with open(path) as recording_file:
+            recordings[os.path.basename(path)] = json.load(recording_file)
+
+    policies = {
+        f'every {LEGACY_DELTAS_PER_CHUNK} deltas': lambda: CountFlushPolicy(
+            LEGACY_DELTAS_PER_CHUNK
+        ),
+        'adaptive': lambda: AdaptiveFlushPolicy(
+            max_latency_seconds=ChatConstants.CHUNK_FLUSH_MAX_LATENCY_SECONDS,
+            min_bytes=ChatConstants.CHUNK_FLUSH_MIN_BYTES,
+            max_flushes_per_second=ChatConstants.CHUNK_FLUSH_MAX_PER_SECOND,
+        ),
+    }
+
+    for name, recording in recordings.items():
+        duration_s = recording[-1][0] / 1000
+        print(f'{name}: {len(recording)} deltas over {duration_s:.1f} s')
+        for policy_name, create_policy in policies.items():
+            result = replay(recording, create_policy())
+            print(
+                f'  {policy_name:<16} mutations {result["mutations"]:4}   '
+                f'peak {result["peak_per_second"]:3}/s   '
+                f'latency p50 {result["p50_ms"]:6.0f} ms   p95 {result["p95_ms"]:6.0f} ms   '
+                f'max {result["max_ms"]:6.0f} ms'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+import json
+import os
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'benchmark')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'benchmark')
+os.environ.setdefault('REGION', 'ap-southeast-1')
+os.environ.setdefault('ENTITIES_TABLE', 'benchmark-entity-table')
+
+from pynamodb.connection import Connection  # noqa: E402
+from shared_modules.models.dynamodb.entity import Entity  # noqa: E402
+from shared_modules.utils.client_registry import ClientRegistry  # noqa: E402
+
+CALL_COUNT = 200
+TABLE_NAME = 'benchmark-entity-table'
+GET_ITEM_REQUEST = {
+    'TableName': TABLE_NAME,
+    'Key': {'hashKey': {'S': 'STARTUP#benchmark'}, 'rangeKey': {'S': 'STARTUP#METADATA'}},
+}
+ITEM = {
+    'Item': {
+        'hashKey': {'S': 'STARTUP#benchmark'},
+        'rangeKey': {'S': 'STARTUP#METADATA'},
+        'startUpName': {'S': 'Benchmark Startup'},
+    }
+}
+
+
+class DynamoDBStandInHandler(BaseHTTPRequestHandler):
+    """Answers GetItem over HTTP/1.1 keep-alive, like the DynamoDB endpoint."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        body = json.dumps(ITEM).encode()
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-amz-json-1.0')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def measure(get_item) -> list:
+    latencies = []
+    for _ in range(CALL_COUNT):
+        start = time.perf_counter()
+        get_item()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name: str, latencies: list) -> None:
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f'{name:<38} p50 {p50:7.2f} ms   p99 {p99:7.2f} ms')
+
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), DynamoDBStandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host = f'http://127.0.0.1:{server.server_address[1]}'
+
+    # Before: every repository built its own Connection and with it a new client and pool
+    cold = measure(
+        lambda: Connection(region=os.getenv('REGION'), host=host).dispatch(
+            'GetItem', GET_ITEM_REQUEST
+        )
+    )
+
+    # Model reads and writes go through the connection pynamodb keeps on the model class
+    registry = ClientRegistry()
+    Entity.Meta.host = host
+    registry.bind_model(Entity)
+    Entity.get('STARTUP#benchmark', 'STARTUP#METADATA')
+    model = measure(lambda: Entity.get('STARTUP#benchmark', 'STARTUP#METADATA'))
+
+    # Transactions go through the registry Connection shared by every repository
+    registry.get_connection(host=host).dispatch('GetItem', GET_ITEM_REQUEST)
+    shared = measure(
+        lambda: registry.get_connection(host=host).dispatch('GetItem', GET_ITEM_REQUEST)
+    )
+
+    server.shutdown()
+    print(f'{CALL_COUNT} GetItem calls against a local stand-in at {host}')
+    report('new Connection per repository', cold)
+    report('bound model, class connection', model)
+    report('shared registry Connection', shared)
+
+
+if __name__ == '__main__':
+    main()
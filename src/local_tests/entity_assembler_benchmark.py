@@ -0,0 +1,109 @@
+import os
+import time
+
+os.environ.setdefault('ENTITIES_TABLE', 'benchmark-entity-table')
+
+from local_tests.entity_catalog_memory_benchmark import SyntheticTableConnection  # noqa: E402
+from shared_modules.models.dynamodb.entity import Entity  # noqa: E402
+from shared_modules.models.schema.entity import EntitySchema  # noqa: E402
+from shared_modules.utils.entity_assembler import EntityAssembler  # noqa: E402
+
+TOTAL_ITEMS = 10_000
+
+METADATA_FIELDS = {
+    'STARTUP#METADATA': (
+        'startUpName',
+        'email',
+        'logoObjectKey',
+        'dateFounded',
+        'startupStage',
+        'description',
+        'revenueModel',
+        'createdAt',
+        'industries',
+        'forSuggestionGeneration',
+    ),
+    'ENABLER#METADATA': (
+        'enablerName',
+        'email',
+        'logoObjectKey',
+        'dateFounded',
+        'organizationType',
+        'description',
+        'industryFocus',
+        'supportType',
+        'fundingStageFocus',
+        'investmentAmount',
+        'startupStagePreference',
+        'preferredBusinessModels',
+        'forSuggestionGeneration',
+    ),
+}
+SUB_ITEM_FIELDS = {
+    'STARTUP#CONTACTS': 'contacts',
+    'STARTUP#MILESTONES': 'milestones',
+    'STARTUP#FOUNDERS': 'founders',
+    'ENABLER#CONTACTS': 'contacts',
+    'ENABLER#INVESTMENT_CRITERIA': 'investmentCriteria',
+    'ENABLER#PORTFOLIO': 'portfolio',
+}
+
+
+def legacy_assemble(entity_map: dict, raw_item: dict) -> None:
+    """Previous read path: build the pynamodb model, convert it with to_simple_dict and
+    copy the attributes through the rangeKey if/elif chain."""
+    entity = Entity.from_raw_data(raw_item)
+    range_key = entity.rangeKey
+    if range_key not in METADATA_FIELDS and range_key not in SUB_ITEM_FIELDS:
+        return
+
+    if entity.hashKey not in entity_map:
+        entity_type, entity_id = entity.hashKey.split('#')[:2]
+        entity_map[entity.hashKey] = {
+            'startupId' if entity_type == 'STARTUP' else 'enablerId': entity_id,
+            '__typename': 'Startup' if entity_type == 'STARTUP' else 'Enabler',
+            'hashKey': entity.hashKey,
+            'rangeKey': range_key,
+        }
+
+    current_entity = entity_map[entity.hashKey]
+    entity_dict = entity.to_simple_dict()
+    if range_key in METADATA_FIELDS:
+        current_entity.update(
+            {field: getattr(entity, field) for field in METADATA_FIELDS[range_key]}
+        )
+        current_entity['location'] = entity_dict.get('location')
+    else:
+        field = SUB_ITEM_FIELDS[range_key]
+        current_entity[field] = entity_dict[field]
+
+
+def run(name: str, assemble, raw_items: list) -> list:
+    entity_map = {}
+    start = time.perf_counter()
+    for raw_item in raw_items:
+        assemble(entity_map, raw_item)
+    entities = [EntitySchema(**entity_data) for entity_data in entity_map.values()]
+    elapsed = time.perf_counter() - start
+
+    per_item_us = elapsed / len(raw_items) * 1_000_000
+    print(f'{name:>10}: {elapsed * 1000:8.1f} ms total, {per_item_us:6.1f} us/item')
+    return entities
+
+
+def main():
+    connection = SyntheticTableConnection(TOTAL_ITEMS)
+    raw_items = [connection.build_item(index) for index in range(TOTAL_ITEMS)]
+    assembler = EntityAssembler()
+
+    legacy_entities = run('legacy', legacy_assemble, raw_items)
+    assembled_entities = run('assembler', assembler.assemble, raw_items)
+
+    assert [entity.model_dump() for entity in legacy_entities] == [
+        entity.model_dump() for entity in assembled_entities
+    ], 'assembler output differs from the legacy read path'
+    print(f'{len(assembled_entities)} entities assembled identically from {TOTAL_ITEMS} items')
+
+
+if __name__ == '__main__':
+    main()
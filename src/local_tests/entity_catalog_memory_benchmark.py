@@ -0,0 +1,146 @@
+import multiprocessing
+import os
+import resource
+import time
+
+os.environ.setdefault('ENTITIES_TABLE', 'benchmark-entity-table')
+
+from shared_modules.models.dynamodb.entity import Entity  # noqa: E402
+from shared_modules.repositories.entity_repository import EntityRepository  # noqa: E402
+
+TOTAL_ITEMS = 50_000
+PAGE_SIZE = 500
+
+
+class SyntheticTableConnection:
+    """Stand-in for the pynamodb table connection that builds scan pages on demand."""
+
+    def __init__(self, total_items: int):
+        self.total_items = total_items
+
+    def build_item(self, index: int) -> dict:
+        entity_index, item_index = divmod(index, 4)
+        ksuid = f'ksuid{entity_index:08d}'
+
+        if entity_index % 2 == 0:
+            hash_key = f'STARTUP#startup-{entity_index}'
+            range_keys = ['CONTACTS', 'FOUNDERS', 'METADATA', 'MILESTONES']
+            entity_type = 'STARTUP'
+        else:
+            hash_key = f'ENABLER#enabler-{entity_index}'
+            range_keys = ['CONTACTS', 'INVESTMENT_CRITERIA', 'METADATA', 'PORTFOLIO']
+            entity_type = 'ENABLER'
+
+        range_key = f'{entity_type}#{range_keys[item_index]}'
+        item = {
+            'hashKey': {'S': hash_key},
+            'rangeKey': {'S': range_key},
+            'GSI1PK': {'S': ksuid},
+            'email': {'S': f'entity-{entity_index}@example.com'},
+            'createdAt': {'S': '2025-01-01T00:00:00+08:00'},
+        }
+        contact = {'M': {'platform': {'S': 'website'}, 'value': {'S': 'https://example.com'}}}
+
+        if range_key == 'STARTUP#METADATA':
+            item.update(
+                {
+                    'startUpName': {'S': f'Startup {entity_index}'},
+                    'startupStage': {'S': 'SEED'},
+                    'description': {'S': 'A Davao City startup building software. ' * 10},
+                    'industries': {'L': [{'S': 'FINTECH'}, {'S': 'AGRITECH'}]},
+                    'revenueModel': {'L': [{'S': 'SUBSCRIPTION'}]},
+                    'forSuggestionGeneration': {'BOOL': True},
+                }
+            )
+        elif range_key == 'ENABLER#METADATA':
+            item.update(
+                {
+                    'enablerName': {'S': f'Enabler {entity_index}'},
+                    'description': {'S': 'A Davao City enabler supporting startups. ' * 10},
+                    'industryFocus': {'L': [{'S': 'FINTECH'}]},
+                    'supportType': {'L': [{'S': 'FUNDING'}, {'S': 'MENTORSHIP'}]},
+                    'investmentAmount': {'N': '1000000'},
+                    'forSuggestionGeneration': {'BOOL': False},
+                }
+            )
+        elif range_key.endswith('#CONTACTS'):
+            item['contacts'] = {'L': [contact, contact]}
+        elif range_key == 'STARTUP#FOUNDERS':
+            founder = {
+                'M': {
+                    'founderId': {'S': f'founder-{entity_index}'},
+                    'name': {'S': 'Juan Dela Cruz'},
+                    'overview': {'S': 'Serial founder from Davao City. ' * 5},
+                    'contacts': {'L': [contact]},
+                }
+            }
+            item['founders'] = {'L': [founder, founder]}
+        elif range_key == 'STARTUP#MILESTONES':
+            milestone = {'M': {'title': {'S': 'Launch'}, 'dateAchieved': {'S': '2024-01-01'}}}
+            item['milestones'] = {'L': [milestone] * 3}
+        elif range_key == 'ENABLER#INVESTMENT_CRITERIA':
+            criteria = {'M': {'criteriaName': {'S': 'Traction'}, 'details': {'S': 'Revenue'}}}
+            item['investmentCriteria'] = {'L': [criteria] * 3}
+        elif range_key == 'ENABLER#PORTFOLIO':
+            portfolio = {'M': {'supportedStartupProject': {'S': 'AgriNova'}}}
+            item['portfolio'] = {'L': [portfolio] * 3}
+
+        return item
+
+    def scan(self, exclusive_start_key=None, limit=None, segment=None, total_segments=None, **_):
+        start = int(exclusive_start_key['index']['N']) if exclusive_start_key else 0
+        end = min(start + (limit or PAGE_SIZE), self.total_items)
+        items = [
+            self.build_item(index)
+            for index in range(start, end)
+            if segment is None or (index // 4) % total_segments == segment
+        ]
+        page = {'Items': items, 'Count': len(items), 'ScannedCount': end - start}
+        if end < self.total_items:
+            page['LastEvaluatedKey'] = {'index': {'N': str(end)}}
+        return page
+
+
+def run_baseline():
+    return 0
+
+
+def run_materialized():
+    """Hold every raw item, every simple dict and every entity at once (previous behaviour)."""
+    entity_list = list(Entity.gsi1_index.scan(page_size=PAGE_SIZE))
+    entity_dicts = [entity.to_simple_dict() for entity in entity_list]
+    _, entities, _ = EntityRepository(scan_segments=1).get_entity_list()
+    return len(entity_list) + len(entity_dicts) + len(entities)
+
+
+def run_streaming():
+    """Consume the catalog one entity at a time."""
+    entity_repository = EntityRepository(scan_segments=1)
+    return sum(1 for _ in entity_repository.iter_entities(page_size=PAGE_SIZE))
+
+
+def measure(mode: str, queue: multiprocessing.Queue):
+    connection = SyntheticTableConnection(TOTAL_ITEMS)
+    Entity._get_connection = classmethod(lambda cls: connection)
+
+    start = time.perf_counter()
+    count = globals()[f'run_{mode}']()
+    elapsed = time.perf_counter() - start
+
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    queue.put((mode, count, elapsed, peak_rss_mb))
+
+
+def main():
+    print(f'Synthetic table: {TOTAL_ITEMS} items, {PAGE_SIZE} items per scan page')
+    queue = multiprocessing.Queue()
+    for mode in ('baseline', 'materialized', 'streaming'):
+        process = multiprocessing.Process(target=measure, args=(mode, queue))
+        process.start()
+        process.join()
+        mode, count, elapsed, peak_rss_mb = queue.get()
+        print(f'{mode:>13}: peak RSS {peak_rss_mb:8.1f} MB | {elapsed:6.2f}s | {count} objects')
+
+
+if __name__ == '__main__':
+    main()
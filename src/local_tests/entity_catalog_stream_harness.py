@@ -0,0 +1,231 @@
+import os
+import random
+import time
+from http import HTTPStatus
+
+os.environ.setdefault('ENTITIES_TABLE', 'harness-entity-table')
+
+from aws_lambda_powertools.utilities.data_classes.dynamo_db_stream_event import (  # noqa: E402
+    DynamoDBRecord,
+)
+from entity_catalog_stream.usecases.catalog_usecase import EntityCatalogUsecase  # noqa: E402
+from local_tests.entity_catalog_memory_benchmark import SyntheticTableConnection  # noqa: E402
+from shared_modules.models.dynamodb.entity import Entity  # noqa: E402
+from shared_modules.repositories.entity_catalog_repository import (  # noqa: E402
+    EntityCatalogRepository,
+)
+from shared_modules.utils.entity_assembler import EntityAssembler  # noqa: E402
+
+INITIAL_ITEMS = 4_000
+BATCH_COUNT = 50
+BATCH_SIZE = 100
+
+
+class InMemoryCatalogRepository(EntityCatalogRepository):
+    """Stand-in for the catalog items that keeps the compressed chunks in memory."""
+
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+        self.revision = None
+
+    def get_catalog(self):
+        if self.revision is None:
+            return HTTPStatus.NOT_FOUND, None, 'Catalog not found'
+
+        catalog = self.decode_catalog(self.chunks)
+        catalog['catalogRevision'] = self.revision
+        catalog['chunkSet'] = f'R{self.revision:08d}'
+        catalog['chunkCount'] = len(self.chunks)
+        return HTTPStatus.OK, catalog, 'Success'
+
+    def get_catalog_header(self):
+        return None
+
+    def save_catalog(
+        self, document, previous_revision=None, previous_chunk_set=None, previous_chunk_count=0
+    ):
+        assert previous_revision == self.revision, 'catalog revision conflict'
+        self.chunks = self.encode_catalog(document)
+        self.revision = (previous_revision or 0) + 1
+        return HTTPStatus.OK, 'Success'
+
+
+def stream_record(event_name: str, item: dict) -> DynamoDBRecord:
+    keys = {'hashKey': item['hashKey'], 'rangeKey': item['rangeKey']}
+    stream = {'Keys': keys}
+    if event_name != 'REMOVE':
+        stream['NewImage'] = item
+    return DynamoDBRecord({'eventName': event_name, 'dynamodb': stream})
+
+
+def build_batch(
+    table: dict, connection: SyntheticTableConnection, next_index: list, held_records: list
+) -> list:
+    """Change the synthetic table and return the matching stream records.
+
+    Profile updates stamp their catalog version on the METADATA item and the catalog version
+    item like the resolvers do. The two records are on different shards, so the METADATA
+    record is sometimes held back to a later batch than its version record.
+    """
+    records = held_records[:]
+    held_records.clear()
+    while len(records) < BATCH_SIZE:
+        action = random.random()
+        # Records of one item stay in order, so an item with a held back record is not changed
+        held_keys = {record.dynamodb.raw_event['Keys']['hashKey']['S'] for record in held_records}
+        profile_keys = [
+            key for key in table if key[1].endswith('#METADATA') and key[0] not in held_keys
+        ]
+
+        if action < 0.5 and profile_keys:
+            hash_key, range_key = random.choice(profile_keys)
+            catalog_version = f'version-{random.random()}'
+            item = dict(table[(hash_key, range_key)])
+            name_field = 'startUpName' if range_key.startswith('STARTUP') else 'enablerName'
+            item[name_field] = {'S': f'Renamed {random.randint(0, 1_000_000)}'}
+            item['description'] = {'S': f'Updated description {random.random()}'}
+            item['catalogVersion'] = {'S': catalog_version}
+            table[(hash_key, range_key)] = item
+            version_item = {
+                'hashKey': {'S': 'CATALOG'},
+                'rangeKey': {'S': 'CATALOG#VERSION'},
+                'catalogVersion': {'S': catalog_version},
+            }
+            table[('CATALOG', 'CATALOG#VERSION')] = version_item
+
+            version_record = stream_record('MODIFY', version_item)
+            metadata_record = stream_record('MODIFY', item)
+            if random.random() < 0.1:
+                records.append(version_record)
+                held_records.append(metadata_record)
+            else:
+                records.extend(random.sample([version_record, metadata_record], 2))
+
+        elif action < 0.7:
+            for _ in range(4):
+                item = connection.build_item(next_index[0])
+                next_index[0] += 1
+                table[(item['hashKey']['S'], item['rangeKey']['S'])] = item
+                records.append(stream_record('INSERT', item))
+
+        elif action < 0.8 and profile_keys:
+            hash_key, _ = random.choice(profile_keys)
+            for key in [key for key in table if key[0] == hash_key]:
+                records.append(stream_record('REMOVE', table.pop(key)))
+
+        else:
+            hash_key, _ = random.choice(profile_keys)
+            saved_profile = {
+                'hashKey': {'S': hash_key},
+                'rangeKey': {'S': f'{hash_key}#SAVED_PROFILE#{random.random()}'},
+                'GSI1PK': {'S': 'saved-profile'},
+            }
+            records.append(stream_record('INSERT', saved_profile))
+
+    return records
+
+
+def table_entities(table: dict) -> dict:
+    assembler = EntityAssembler()
+    entity_map = {}
+    for item in sorted(table.values(), key=lambda item: item['rangeKey']['S']):
+        assembler.assemble(entity_map, item)
+    return {
+        hash_key: assembler.to_schema(entity_data) for hash_key, entity_data in entity_map.items()
+    }
+
+
+def expected_entities(table: dict) -> dict:
+    return {hash_key: entity.model_dump() for hash_key, entity in table_entities(table).items()}
+
+
+def table_version(table: dict):
+    return table.get(('CATALOG', 'CATALOG#VERSION'), {}).get('catalogVersion', {}).get('S')
+
+
+def main():
+    random.seed(7)
+    connection = SyntheticTableConnection(INITIAL_ITEMS)
+    Entity._get_connection = classmethod(lambda cls: connection)
+
+    table = {}
+    for index in range(INITIAL_ITEMS):
+        item = connection.build_item(index)
+        table[(item['hashKey']['S'], item['rangeKey']['S'])] = item
+    next_index = [INITIAL_ITEMS]
+
+    usecase = EntityCatalogUsecase()
+    usecase.entity_catalog_repository = InMemoryCatalogRepository()
+    usecase.entity_repository.get_catalog_version = lambda: None
+    # The synthetic scan has no index lag to wait for
+    usecase.rebuild_settle_seconds = 0
+
+    # The first batch finds no catalog and rebuilds it from the synthetic table scan
+    start = time.perf_counter()
+    usecase.process_records([])
+    print(f'rebuild: {(time.perf_counter() - start) * 1000:.1f} ms')
+
+    batch_times = []
+    held_records = []
+    behind_count = 0
+    for batch_index in range(BATCH_COUNT):
+        records = build_batch(table, connection, next_index, held_records)
+        # The last batch delivers every held back METADATA record
+        if batch_index == BATCH_COUNT - 1:
+            records.extend(held_records)
+        start = time.perf_counter()
+        usecase.process_records(records)
+        batch_times.append(time.perf_counter() - start)
+
+        _, catalog, _ = usecase.entity_catalog_repository.get_catalog()
+        if held_records and batch_index < BATCH_COUNT - 1:
+            assert catalog['catalogVersion'] is None, 'catalog stamped current with a write held'
+            behind_count += 1
+
+    repository = usecase.entity_catalog_repository
+
+    # A suggestion flag update repeats the completed version left on its METADATA item
+    key, item = next((key, item) for key, item in table.items() if 'catalogVersion' in item)
+    table[key] = {**item, 'forSuggestionGeneration': {'BOOL': False}}
+    usecase.process_records([stream_record('MODIFY', table[key])])
+    _, catalog, _ = repository.get_catalog()
+    assert item['catalogVersion']['S'] not in catalog['appliedCatalogVersions']
+    assert catalog['catalogVersion'] == table_version(table)
+
+    # A write whose METADATA record is lost expires and the catalog is rebuilt from a scan
+    key = next(key for key in table if key[1].endswith('#METADATA'))
+    table[key] = {
+        **table[key],
+        'description': {'S': 'Lost update'},
+        'catalogVersion': {'S': 'lost'},
+    }
+    version_item = {**table[('CATALOG', 'CATALOG#VERSION')], 'catalogVersion': {'S': 'lost'}}
+    table[('CATALOG', 'CATALOG#VERSION')] = version_item
+    usecase.entity_repository.iter_entities = lambda: iter(table_entities(table).values())
+    usecase.entity_repository.get_catalog_version = lambda: table_version(table)
+    usecase.pending_version_ttl_seconds = 0
+    usecase.process_records([stream_record('MODIFY', version_item)])
+
+    _, catalog, _ = repository.get_catalog()
+    assembler = EntityAssembler()
+    replayed = {
+        hash_key: assembler.to_schema(entity_data).model_dump()
+        for hash_key, entity_data in catalog['entities'].items()
+    }
+
+    assert replayed == expected_entities(table), 'replayed catalog differs from the table'
+    assert catalog['catalogVersion'] == table_version(table) == 'lost'
+
+    compressed_bytes = sum(len(chunk) for chunk in repository.chunks)
+    print(f'replayed {BATCH_COUNT} batches of {BATCH_SIZE} records')
+    print(f'batches left behind by a held back METADATA record: {behind_count}')
+    print(f'average batch: {sum(batch_times) / len(batch_times) * 1000:.1f} ms')
+    print(
+        f'catalog: {len(replayed)} entities, {compressed_bytes / 1024:.1f} KiB compressed '
+        f'in {len(repository.chunks)} chunk(s), revision {repository.revision}'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+import random
+import time
+
+from shared_modules.models.schema.entity import EntitySchema
+from shared_modules.utils.entity_ranker import EntityRanker
+from shared_modules.utils.token_estimator import estimate_tokens
+
+CATALOG_SIZES = (100, 1_000, 10_000)
+TOP_K = 20
+TOKEN_BUDGET = 6000
+QUERY = 'Which enablers offer seed funding or mentorship for agritech startups?'
+HISTORY = ['We are building a farm-to-market platform for Davao cacao farmers']
+
+INDUSTRIES = [
+    'Agritech',
+    'Fintech',
+    'Healthtech',
+    'Edtech',
+    'E-commerce',
+    'Logistics',
+    'Tourism',
+    'Renewable Energy',
+    'Aquaculture',
+    'Creative Industries',
+]
+SUPPORT_TYPES = ['Funding', 'Mentorship', 'Incubation', 'Acceleration', 'Co-working', 'Legal']
+STAGES = ['Ideation', 'Validation', 'Pre-seed', 'Seed', 'Series A', 'Growth']
+WORDS = (
+    'platform local market community farmers students payments clinics data mobile supply '
+    'chain island coastal urban rural cooperative marketplace service analytics'
+).split()
+
+
+def build_synthetic_entities(count: int, seed: int = 7) -> list:
+    """Build a synthetic catalog of startups and enablers with the chat fields populated."""
+    rng = random.Random(seed)
+    entities = []
+    for index in range(count):
+        description = ' '.join(rng.choices(WORDS, k=40))
+        if index % 3:
+            entities.append(
+                EntitySchema(
+                    hashKey=f'STARTUP#{index}',
+                    startupId=str(index),
+                    startUpName=f'Startup {index} {rng.choice(WORDS).title()}',
+                    email=f'startup{index}@example.com',
+                    description=description,
+                    industries=rng.sample(INDUSTRIES, 2),
+                    startupStage=rng.choice(STAGES),
+                    revenueModel=['Subscription'],
+                    location={'address': 'Davao City'},
+                )
+            )
+        else:
+            entities.append(
+                EntitySchema(
+                    hashKey=f'ENABLER#{index}',
+                    enablerId=str(index),
+                    enablerName=f'Enabler {index} {rng.choice(WORDS).title()}',
+                    email=f'enabler{index}@example.com',
+                    description=description,
+                    organizationType=['Incubator'],
+                    industryFocus=rng.sample(INDUSTRIES, 3),
+                    supportType=rng.sample(SUPPORT_TYPES, 2),
+                    fundingStageFocus=rng.sample(STAGES, 2),
+                    investmentAmount=float(rng.randint(1, 50) * 100_000),
+                    location={'address': 'Davao City'},
+                )
+            )
+    return entities
+
+
+def main():
+    print(f'query: {QUERY}')
+    for count in CATALOG_SIZES:
+        entities = build_synthetic_entities(count)
+        all_tokens = sum(estimate_tokens(entity.model_dump_json()) for entity in entities)
+
+        ranker = EntityRanker()
+        start = time.perf_counter()
+        selected = ranker.select(QUERY, entities, TOP_K, TOKEN_BUDGET, history=HISTORY)
+        cold_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        ranker.select(QUERY, entities, TOP_K, TOKEN_BUDGET, history=HISTORY)
+        warm_ms = (time.perf_counter() - start) * 1000
+
+        selected_tokens = sum(
+            estimate_tokens(entity.model_dump_json(exclude_none=True)) for entity in selected
+        )
+        print(
+            f'{count:>6} entities: all {all_tokens:>9,} tokens -> {len(selected)} selected '
+            f'{selected_tokens:>5,} tokens | cold {cold_ms:7.1f} ms, warm {warm_ms:6.1f} ms'
+        )
+
+    top = selected[0]
+    print(f'top match: {top.enablerName or top.startUpName} {top.industryFocus or top.industries}')
+
+
+if __name__ == '__main__':
+    main()
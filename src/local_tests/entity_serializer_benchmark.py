@@ -0,0 +1,103 @@
+import random
+import time
+
+from generate_suggestions.utils.entity_serializer import CompactEntitySerializer
+from local_tests.compatibility_scorer_benchmark import build_matching_entities
+from shared_modules.models.schema.entity import EntitySchema
+from shared_modules.utils.token_estimator import estimate_tokens
+
+CATALOG_SIZE = 1_000
+TEXT_MAX_TOKENS = (40, 80, 160)
+LONG_WORDS = (
+    'we help smallholder farmers and coastal cooperatives reach buyers in Davao City and '
+    'Mindanao through a mobile marketplace with payments logistics and market data'
+).split()
+
+
+def build_profile_entities(count: int, seed: int = 13) -> list:
+    """Build a synthetic catalog of full profiles, with the fields matching does not use."""
+    rng = random.Random(seed)
+    entities = []
+    for index, entity in enumerate(build_matching_entities(count, seed)):
+        update = {
+            'rangeKey': f'{entity.hashKey.split("#")[0]}#METADATA',
+            'description': ' '.join(rng.choices(LONG_WORDS, k=rng.randint(60, 200))),
+            'dateFounded': f'20{rng.randint(10, 24)}-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}',
+            'logoObjectKey': f'logos/{index}/{rng.getrandbits(64):016x}.png',
+            'contacts': [
+                {'platform': 'Facebook', 'value': f'https://facebook.com/entity{index}'},
+                {'platform': 'Phone', 'value': f'+63 9{rng.randint(10**8, 10**9 - 1)}'},
+            ],
+            'forSuggestionGeneration': True,
+        }
+        if entity.startupId:
+            update['milestones'] = [
+                {
+                    'title': f'Milestone {number}',
+                    'dateAchieved': '2024-01-01',
+                    'description': ' '.join(rng.choices(LONG_WORDS, k=30)),
+                }
+                for number in range(rng.randint(0, 4))
+            ]
+            update['founders'] = [
+                {
+                    'founderId': str(rng.getrandbits(32)),
+                    'name': f'Founder {number}',
+                    'role': 'CEO',
+                    'overview': ' '.join(rng.choices(LONG_WORDS, k=40)),
+                    'contacts': [{'platform': 'Email', 'value': f'founder{number}@example.com'}],
+                }
+                for number in range(rng.randint(1, 3))
+            ]
+        else:
+            update['investmentCriteria'] = [
+                {'criteriaName': 'Local team', 'details': ' '.join(rng.choices(LONG_WORDS, k=25))}
+            ]
+            update['portfolio'] = [
+                {'supportedStartupProject': f'Startup {rng.randint(0, count)}', 'roleAndImpact': ''}
+                for _ in range(rng.randint(0, 3))
+            ]
+        entities.append(EntitySchema(**{**entity.model_dump(exclude_none=True), **update}))
+    return entities
+
+
+def measure(name: str, serialize, entities: list, baseline_tokens: int = 0) -> int:
+    start = time.perf_counter()
+    text = serialize(entities)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    tokens = estimate_tokens(text)
+    reduction = f'{1 - tokens / baseline_tokens:6.1%}' if baseline_tokens else f'{"-":>6}'
+    print(
+        f'  {name:<30} {tokens:>9,} tokens  {tokens / len(entities):6.0f} per entity  '
+        f'{reduction} fewer  {elapsed_ms:6.1f} ms'
+    )
+    return tokens
+
+
+def main():
+    entities = build_profile_entities(CATALOG_SIZE)
+    print(f'{CATALOG_SIZE:,} synthetic profiles')
+
+    # The f-string interpolation of the entity list that build_prompt used originally
+    repr_tokens = measure('repr', str, entities)
+    measure(
+        'model_dump_json(exclude_none)',
+        lambda items: '\n'.join(entity.model_dump_json(exclude_none=True) for entity in items),
+        entities,
+        repr_tokens,
+    )
+    for text_max_tokens in TEXT_MAX_TOKENS:
+        serializer = CompactEntitySerializer(text_max_tokens=text_max_tokens)
+        measure(
+            f'compact, text <= {text_max_tokens} tokens',
+            lambda items: '\n'.join(serializer.serialize(entity) for entity in items),
+            entities,
+            repr_tokens,
+        )
+
+    print(f'legend: {CompactEntitySerializer().legend}')
+    print(f'sample: {CompactEntitySerializer().serialize(entities[1])}')
+
+
+if __name__ == '__main__':
+    main()
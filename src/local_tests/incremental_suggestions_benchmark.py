@@ -0,0 +1,171 @@
+import json
+import os
+import random
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'benchmark')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'benchmark')
+os.environ.setdefault('REGION', 'ap-southeast-1')
+os.environ.setdefault('ENTITIES_TABLE', 'benchmark-entity-table')
+os.environ.setdefault('BEDROCK_AWS_REGION', 'us-east-1')
+os.environ.setdefault('SUGGESTION_INCREMENTAL_ENABLED', 'true')
+os.environ.setdefault('SUGGESTION_SHARDING_ENABLED', 'true')
+
+CATALOG_SIZE = 1_000
+# Every profile form save flags its entity, but only this share edits a matching field
+CHANGED_SHARE = 0.05
+MATCHES_PER_ENTITY = 5
+# Share of regenerated pairs that the LLM scores differently from the stored suggestion
+RESCORED_SHARE = 0.3
+
+items = {}
+operations = Counter()
+written_items = Counter()
+
+
+class DynamoDBStandInHandler(BaseHTTPRequestHandler):
+    """Keeps items in memory and answers the batch reads and writes of suggestion generation."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)))
+        operation = self.headers['X-Amz-Target'].split('.')[-1]
+        operations[operation] += 1
+
+        response = {}
+        if operation == 'BatchWriteItem':
+            for table_name, requests in request['RequestItems'].items():
+                for write_request in requests:
+                    item = write_request['PutRequest']['Item']
+                    items[(item['hashKey']['S'], item['rangeKey']['S'])] = item
+                    written_items[item['rangeKey']['S'].split('#')[1]] += 1
+        elif operation == 'BatchGetItem':
+            response = {'Responses': {}, 'UnprocessedKeys': {}}
+            for table_name, keys_and_attributes in request['RequestItems'].items():
+                response['Responses'][table_name] = [
+                    items[(key['hashKey']['S'], key['rangeKey']['S'])]
+                    for key in keys_and_attributes['Keys']
+                    if (key['hashKey']['S'], key['rangeKey']['S']) in items
+                ]
+
+        body = json.dumps(response).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-amz-json-1.0')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def build_matches(
+    entities: list, catalog: list, rng: random.Random, partners: dict, certainties: dict
+) -> list:
+    """Build the matches the LLM would return, keeping the known partners and most scores."""
+    from shared_modules.models.schema.suggestions import MatchedEntity, SuggestionMatch
+
+    def matched(entity):
+        entity_type = 'STARTUP' if entity.startupId else 'ENABLER'
+        return MatchedEntity(
+            entityId=entity.startupId or entity.enablerId,
+            entityType=entity_type,
+            name=entity.startUpName or entity.enablerName,
+        )
+
+    matches = []
+    for entity in entities:
+        for other in partners.setdefault(entity.hashKey, rng.sample(catalog, MATCHES_PER_ENTITY)):
+            pair = frozenset((entity.hashKey, other.hashKey))
+            if pair not in certainties or rng.random() < RESCORED_SHARE:
+                certainties[pair] = round(rng.uniform(0.5, 0.95), 2)
+            matches.append(
+                SuggestionMatch(
+                    matchPair=[matched(entity), matched(other)],
+                    certainty=certainties[pair],
+                    rationale='Shared industry and stage fit',
+                )
+            )
+    return matches
+
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), DynamoDBStandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host = f'http://127.0.0.1:{server.server_address[1]}'
+
+    from generate_suggestions.usecases.suggestion_usecase import SuggestionUsecase
+    from local_tests.entity_serializer_benchmark import build_profile_entities
+    from shared_modules.models.dynamodb.entity import Entity
+    from shared_modules.models.dynamodb.suggestions import Suggestions
+    from shared_modules.models.schema.entity import EntitySchema
+    from shared_modules.models.schema.suggestions import SuggestionMatchList
+    from shared_modules.utils.client_registry import client_registry
+
+    for model in (Entity, Suggestions):
+        model.Meta.host = host
+    client_registry.get_connection(host=host)
+    usecase = SuggestionUsecase()
+    for component in (usecase, usecase.llm_usecase, usecase.suggestion_repository):
+        component.logger.setLevel('WARNING')
+    serializer = usecase.llm_usecase.entity_serializer
+
+    rng = random.Random(5)
+    catalog = build_profile_entities(CATALOG_SIZE)
+    partners = {}
+    certainties = {}
+
+    # Last night every entity got suggestions and its fingerprint was stored
+    usecase.suggestion_repository.save_suggestions(
+        SuggestionMatchList(matches=build_matches(catalog, catalog, rng, partners, certainties))
+    )
+    for entity in catalog:
+        hash_key = entity.hashKey
+        items[(hash_key, f'{hash_key.split("#")[0]}#METADATA')] = {
+            'hashKey': {'S': hash_key},
+            'suggestionFingerprint': {'S': serializer.fingerprint(entity)},
+        }
+
+    # Tonight every entity is pending, but only some edited a matching field
+    changed_keys = {
+        entity.hashKey for entity in rng.sample(catalog, int(CATALOG_SIZE * CHANGED_SHARE))
+    }
+    entities_selected = [
+        EntitySchema(**{**entity.model_dump(), 'startupStage': 'Growth'})
+        if entity.hashKey in changed_keys and entity.startupId
+        else EntitySchema(**{**entity.model_dump(), 'supportType': ['Funding', 'Grants']})
+        if entity.hashKey in changed_keys
+        else entity
+        for entity in catalog
+    ]
+    fingerprints = {entity.hashKey: serializer.fingerprint(entity) for entity in entities_selected}
+    entities_changed = usecase.get_changed_entities(entities_selected, fingerprints)
+
+    stored_items = dict(items)
+    for name, entities in (('full', entities_selected), ('incremental', entities_changed)):
+        items.clear()
+        items.update(stored_items)
+        written_items.clear()
+        regenerated = build_matches(
+            entities, catalog, random.Random(9), partners, dict(certainties)
+        )
+        usecase.suggestion_repository.save_suggestions(SuggestionMatchList(matches=regenerated))
+        shard_count = len(usecase.llm_usecase.shard_entities(entities))
+        print(
+            f'{name:<12} entities to LLM {len(entities):5,}   shards {shard_count:4}   '
+            f'items rewritten before {len(regenerated) * 2:6,}   written now '
+            f'{written_items["SUGGESTION"]:6,}'
+        )
+
+    print(
+        f'{len(changed_keys)} of {CATALOG_SIZE:,} pending entities changed a matching field, '
+        f'{RESCORED_SHARE:.0%} of their regenerated pairs were rescored'
+    )
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from rag_api.models.chat import Chat  # noqa: E402
+from rag_api.repositories.chat_repository import ChatRepository  # noqa: E402
+
+
+def main():
+    """Move chat messages stored as MESSAGE#<uuid4> to time-ordered MSG#<ULID> keys.
+
+    Topics are also migrated when their recent messages are first read, this migrates the rest.
+    Each message is copied and its legacy item deleted in one transaction, so the migration can
+    be stopped and re-run at any point.
+    """
+    chat_repository = ChatRepository()
+    legacy_prefix = f'{chat_repository.legacy_message_key}#'
+
+    migrated_count = 0
+    failed_count = 0
+    for chat in Chat.scan(filter_condition=Chat.rangeKey.startswith(legacy_prefix)):
+        if chat_repository.migrate_legacy_chat(chat):
+            migrated_count += 1
+        else:
+            print(f'Failed to migrate {chat.hashKey} {chat.rangeKey}')
+            failed_count += 1
+
+    print(f'Migrated {migrated_count} chat messages, {failed_count} failed or skipped')
+
+
+if __name__ == '__main__':
+    main()
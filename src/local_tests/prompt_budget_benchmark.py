@@ -0,0 +1,82 @@
+import os
+import time
+
+os.environ.setdefault('ENTITIES_TABLE', 'benchmark-entity-table')
+os.environ.setdefault('REGION', 'ap-southeast-1')
+os.environ.setdefault('BEDROCK_AWS_REGION', 'us-east-1')
+os.environ.setdefault('GRAPHQL_URL', 'http://localhost/graphql')
+
+from generate_suggestions.usecases.llm_usecase import (  # noqa: E402
+    LLMUsecase as SuggestionLLMUsecase,
+)
+from local_tests.entity_ranker_benchmark import build_synthetic_entities  # noqa: E402
+from rag_api.usecases.llm_usecase import LLMUsecase as ChatLLMUsecase  # noqa: E402
+from shared_modules.utils.token_estimator import estimate_tokens  # noqa: E402
+
+CATALOG_SIZES = (100, 1_000, 10_000)
+QUERY = 'Which enablers offer seed funding or mentorship for agritech startups?'
+# A long topic, newest message first like ChatUsecase builds it
+CHAT_HISTORY = '\n'.join(
+    f'Message {index}: we discussed cacao supply chains, cooperatives and seed funding options'
+    for index in range(400)
+)
+KNOWLEDGE_BASE_CHUNKS = '\n'.join(
+    f'Chunk {index}: Davao City startup programs, incubators and grant calls for agritech.' * 8
+    for index in range(5)
+)
+SELECTED_COUNT = 10
+
+
+def chat_prompt_tokens(usecase: ChatLLMUsecase, entities: list) -> tuple:
+    user_entity, other_entities = entities[0], entities[1:]
+    unbounded_prompt = usecase.assemble_prompt(
+        QUERY,
+        CHAT_HISTORY,
+        KNOWLEDGE_BASE_CHUNKS,
+        user_entity.model_dump_json(),
+        '\n'.join(entity.model_dump_json() for entity in other_entities),
+    )
+
+    start = time.perf_counter()
+    selected_entities = usecase.select_relevant_entities(QUERY, CHAT_HISTORY, other_entities)
+    prompt = usecase.build_prompt(
+        QUERY, CHAT_HISTORY, KNOWLEDGE_BASE_CHUNKS, user_entity, selected_entities
+    )
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    return estimate_tokens(unbounded_prompt), estimate_tokens(prompt), elapsed_ms
+
+
+def suggestion_prompt_tokens(usecase: SuggestionLLMUsecase, entities: list) -> tuple:
+    entities_selected = entities[:SELECTED_COUNT]
+    unbounded_prompt = usecase.assemble_prompt(str(entities), str(entities_selected))
+
+    start = time.perf_counter()
+    prompt = usecase.build_prompt(entities, entities_selected)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    return estimate_tokens(unbounded_prompt), estimate_tokens(prompt), elapsed_ms
+
+
+def main():
+    chat_usecase = ChatLLMUsecase()
+    suggestion_usecase = SuggestionLLMUsecase()
+    chat_usecase.logger.setLevel('WARNING')
+    suggestion_usecase.logger.setLevel('WARNING')
+
+    print(
+        f'{"entities":>8} | {"chat before":>12} {"chat after":>10} {"ms":>6} | '
+        f'{"suggest before":>14} {"suggest after":>13} {"ms":>6}'
+    )
+    for count in CATALOG_SIZES:
+        entities = build_synthetic_entities(count)
+        chat_before, chat_after, chat_ms = chat_prompt_tokens(chat_usecase, entities)
+        suggest_before, suggest_after, suggest_ms = suggestion_prompt_tokens(
+            suggestion_usecase, entities
+        )
+        print(
+            f'{count:>8,} | {chat_before:>12,} {chat_after:>10,} {chat_ms:>6.1f} | '
+            f'{suggest_before:>14,} {suggest_after:>13,} {suggest_ms:>6.1f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
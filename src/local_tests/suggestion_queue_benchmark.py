@@ -0,0 +1,104 @@
+import heapq
+import json
+import os
+import random
+import statistics
+from typing import List, Tuple
+
+os.environ.setdefault('ENTITIES_TABLE', 'benchmark-entity-table')
+os.environ.setdefault('REGION', 'ap-southeast-1')
+os.environ.setdefault('BEDROCK_AWS_REGION', 'us-east-1')
+
+from aws_lambda_powertools.utilities.data_classes.sqs_event import SQSRecord  # noqa: E402
+from generate_suggestions.controllers.suggestions_controller import (  # noqa: E402
+    SuggestionsController,
+)
+
+# Delivery delay and batching window pairs to compare, the first and the batch size match the
+# suggestion queue and its event source in infra/functions/suggestions_cron.py
+QUEUE_SETTINGS = ((120, 120), (60, 60), (300, 300))
+BATCH_SIZE = 10
+
+SESSION_COUNT = 300
+WORKDAY_SECONDS = 8 * 3600
+
+
+class LocalSuggestionQueue:
+    """
+    Stand-in for the suggestion queue and its Lambda event source
+
+    A message becomes visible DELIVERY_DELAY_SECONDS after it is sent. The first visible message
+    opens a batch that collects visible messages until the batching window closes or the batch
+    is full, and each batch is one invocation.
+    """
+
+    def __init__(self, delivery_delay: float, batching_window: float, batch_size: int):
+        self.delivery_delay = delivery_delay
+        self.batching_window = batching_window
+        self.batch_size = batch_size
+        self.messages: List[Tuple[float, float, str]] = []
+
+    def send(self, sent_at: float, entity_id: str):
+        heapq.heappush(
+            self.messages,
+            (sent_at + self.delivery_delay, sent_at, json.dumps({'entity_id': entity_id})),
+        )
+
+    def receive_batches(self):
+        """Yield the invocation time and the SQS records of every batch, in order."""
+        while self.messages:
+            closes_at = self.messages[0][0] + self.batching_window
+            batch = []
+            while (
+                self.messages and self.messages[0][0] <= closes_at and len(batch) < self.batch_size
+            ):
+                batch.append(heapq.heappop(self.messages))
+            invoked_at = closes_at if len(batch) < self.batch_size else batch[-1][0]
+            records = [
+                SQSRecord({'messageId': str(index), 'body': body, 'attributes': {}})
+                for index, (_, _, body) in enumerate(batch)
+            ]
+            yield invoked_at, [sent_at for _, sent_at, _ in batch], records
+
+
+def build_edit_trace(seed: int = 3) -> List[Tuple[float, str]]:
+    """Build a workday of profile editing sessions, each saving the same profile a few times."""
+    rng = random.Random(seed)
+    edits = []
+    for session in range(SESSION_COUNT):
+        edited_at = rng.uniform(0, WORKDAY_SECONDS)
+        entity_id = str(rng.randint(0, 1_000))
+        for _ in range(rng.choice((1, 1, 2, 3, 5, 6))):
+            edits.append((edited_at, entity_id))
+            edited_at += rng.uniform(5, 90)
+    return sorted(edits)
+
+
+def main():
+    edits = build_edit_trace()
+    print(f'{len(edits)} profile saves in {SESSION_COUNT} editing sessions over 8 hours')
+    print(f'  direct invoke     invocations {len(edits):5}   entity runs {len(edits):5}')
+
+    for delivery_delay, batching_window in QUEUE_SETTINGS:
+        queue = LocalSuggestionQueue(delivery_delay, batching_window, BATCH_SIZE)
+        for edited_at, entity_id in edits:
+            queue.send(edited_at, entity_id)
+
+        invocation_count = 0
+        entity_run_count = 0
+        waits = []
+        for invoked_at, sent_times, records in queue.receive_batches():
+            invocation_count += 1
+            entity_run_count += len(SuggestionsController.get_queued_entity_ids(records))
+            waits.extend(invoked_at - sent_at for sent_at in sent_times)
+
+        waits.sort()
+        print(
+            f'  queue {delivery_delay:3}s+{batching_window:3}s invocations {invocation_count:5}   '
+            f'entity runs {entity_run_count:5}   '
+            f'wait p50 {statistics.median(waits):4.0f} s   max {waits[-1]:4.0f} s'
+        )
+
+
+if __name__ == '__main__':
+    main()
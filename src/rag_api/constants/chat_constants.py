@@ -6,6 +6,38 @@ class ChatType(str, Enum):
     LLM_RESPONSE = 'LLM_RESPONSE'
 
 
+class ChatStreamMode(str, Enum):
+    # Each chunk carries the whole response so far
+    CUMULATIVE = 'CUMULATIVE'
+    # Each chunk carries only the new text and a sequence number
+    DELTA = 'DELTA'
+
+
 class ChatConstants:
-    CHUNK_BUFFER_LIMIT = 10
+    # Chat chunks are flushed once this many bytes are buffered or the oldest buffered text has
+    # waited this long, but never more often than CHUNK_FLUSH_MAX_PER_SECOND
+    CHUNK_FLUSH_MIN_BYTES = 160
+    CHUNK_FLUSH_MAX_LATENCY_SECONDS = 0.15
+    CHUNK_FLUSH_MAX_PER_SECOND = 6
     END_OF_MESSAGE = 'END_OF_MESSAGE'
+    # Chunks waiting to be published that cannot be coalesced before the stream blocks
+    CHUNK_QUEUE_LIMIT = 32
+    CHUNK_FLUSH_TIMEOUT = 10
+    PROMPT_TOKEN_BUDGET = 16_000
+    USER_ENTITY_TOKEN_BUDGET = 1_500
+    KNOWLEDGE_BASE_TOKEN_BUDGET = 4_000
+    CHAT_HISTORY_TOKEN_BUDGET = 3_000
+    CHAT_HISTORY_LIMIT = 20
+    # Share of a query's terms that must already be in the topic query to reuse its retrieval
+    KB_TOPIC_REUSE_MIN_OVERLAP = 0.6
+    ENTITY_CONTEXT_TOP_K = 20
+    ENTITY_CONTEXT_TOKEN_BUDGET = 6_000
+    ENTITY_CONTEXT_HISTORY_MESSAGES = 4
+    # Entities put in the prompt when none matches the query or the recent chat history
+    ENTITY_CONTEXT_FALLBACK_K = 6
+    BEDROCK_CONNECT_TIMEOUT = 5
+    # Streamed responses can pause between chunks, so the read timeout is longer
+    BEDROCK_READ_TIMEOUT = 60
+    BEDROCK_MAX_ATTEMPTS = 3
+    # Threads for the reads and writes of a chat turn that run concurrently
+    CONTEXT_WORKERS = 8
@@ -0,0 +1,204 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from aws_lambda_powertools import Logger
+from rag_api.constants.chat_constants import ChatConstants, ChatStreamMode
+from rag_api.external.graphql_gateway import (
+    SEND_CHAT_CHUNK_MUTATION,
+    GraphQLGateway,
+    get_chat_chunk_variables,
+)
+from rag_api.models.chat import SendChatChunkIn
+
+
+class ChatChunkPublisher:
+    """
+    Publishes chat chunks to the GraphQL gateway from a background thread
+
+    The Bedrock stream loop only enqueues chunks, so token consumption never waits on an
+    AppSync round-trip. Chunks are sent in order over one GraphQL session that stays open
+    across warm invocations. While a mutation is in flight, newer chunks of the same message
+    are coalesced into the pending one: a cumulative chunk replaces it, a delta chunk is appended
+    to it. Delta chunks are numbered as they are sent, so coalescing leaves no sequence gaps. The
+    end of message chunk is a barrier: it is never coalesced and is only sent after every chunk
+    before it.
+    """
+
+    def __init__(self, max_pending: int = ChatConstants.CHUNK_QUEUE_LIMIT):
+        self.max_pending = max_pending
+        self.pending: Deque[SendChatChunkIn] = deque()
+        self.unfinished_count = 0
+        self.condition = threading.Condition()
+        self.worker: Optional[threading.Thread] = None
+        self.gateway: Optional[GraphQLGateway] = None
+        self.next_sequences: Dict[Tuple[str, str], int] = {}
+        self.logger = Logger()
+
+    def start(self):
+        """Start the publisher thread if it is not running yet."""
+        if self.worker and self.worker.is_alive():
+            return
+
+        self.gateway = self.gateway or GraphQLGateway()
+        self.worker = threading.Thread(target=self.run, name='chat-chunk-publisher', daemon=True)
+        self.worker.start()
+
+    def publish(self, send_chat_chunk_in: SendChatChunkIn):
+        """
+        Queue a chat chunk to be sent, coalescing it with the pending chunk of the same message.
+
+        Only blocks when the queue is full of chunks that cannot be coalesced.
+
+        :param SendChatChunkIn send_chat_chunk_in: The chat chunk to send
+        """
+        with self.condition:
+            self.start()
+            if self.pending and self.can_coalesce(self.pending[-1], send_chat_chunk_in):
+                self.pending[-1] = self.coalesce(self.pending[-1], send_chat_chunk_in)
+                return
+
+            while len(self.pending) >= self.max_pending:
+                self.condition.wait()
+
+            self.pending.append(send_chat_chunk_in)
+            self.unfinished_count += 1
+            self.condition.notify_all()
+
+    @staticmethod
+    def can_coalesce(pending_chunk: SendChatChunkIn, send_chat_chunk_in: SendChatChunkIn) -> bool:
+        """
+        Check if a chunk can replace the pending chunk, i.e. both are partial responses of the
+        same message.
+
+        :param SendChatChunkIn pending_chunk: The last chunk waiting to be sent
+        :param SendChatChunkIn send_chat_chunk_in: The new chunk
+        :return bool: True if the new chunk can replace the pending chunk
+        """
+        is_end_of_message = ChatConstants.END_OF_MESSAGE in (
+            pending_chunk.response,
+            send_chat_chunk_in.response,
+        )
+        return (
+            not is_end_of_message
+            and pending_chunk.entryId == send_chat_chunk_in.entryId
+            and pending_chunk.chatTopicId == send_chat_chunk_in.chatTopicId
+            and pending_chunk.streamMode == send_chat_chunk_in.streamMode
+        )
+
+    @staticmethod
+    def coalesce(
+        pending_chunk: SendChatChunkIn, send_chat_chunk_in: SendChatChunkIn
+    ) -> SendChatChunkIn:
+        """
+        Merge a chunk into the pending chunk of the same message.
+
+        :param SendChatChunkIn pending_chunk: The last chunk waiting to be sent
+        :param SendChatChunkIn send_chat_chunk_in: The new chunk
+        :return SendChatChunkIn: The chunk to send in place of both
+        """
+        if send_chat_chunk_in.streamMode == ChatStreamMode.DELTA:
+            return pending_chunk.model_copy(
+                update={'response': pending_chunk.response + send_chat_chunk_in.response}
+            )
+        return send_chat_chunk_in
+
+    def number_chunk(self, send_chat_chunk_in: SendChatChunkIn) -> SendChatChunkIn:
+        """
+        Give a delta chunk the next sequence number of its message.
+
+        :param SendChatChunkIn send_chat_chunk_in: The chunk about to be sent
+        :return SendChatChunkIn: The chunk with its sequence number, unchanged if not a delta
+        """
+        if send_chat_chunk_in.streamMode != ChatStreamMode.DELTA:
+            return send_chat_chunk_in
+
+        message_key = (send_chat_chunk_in.chatTopicId, send_chat_chunk_in.entryId)
+        sequence = self.next_sequences.pop(message_key, 0)
+        if send_chat_chunk_in.response != ChatConstants.END_OF_MESSAGE:
+            self.next_sequences[message_key] = sequence + 1
+        return send_chat_chunk_in.model_copy(update={'sequence': sequence})
+
+    def flush(self, timeout: float = ChatConstants.CHUNK_FLUSH_TIMEOUT) -> bool:
+        """
+        Wait until every queued chunk has been sent.
+
+        Called before the invocation returns, since Lambda freezes the publisher thread after.
+
+        :param float timeout: The maximum seconds to wait
+        :return bool: True if every chunk was sent in time
+        """
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while self.unfinished_count:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.logger.warning(
+                        {
+                            'message': 'Timed out flushing chat chunks',
+                            'unfinished_count': self.unfinished_count,
+                        }
+                    )
+                    return False
+                self.condition.wait(remaining)
+        return True
+
+    def run(self):
+        """Send queued chunks in order over a persistent GraphQL session."""
+        loop = asyncio.new_event_loop()
+        session = None
+        while True:
+            with self.condition:
+                while not self.pending:
+                    self.condition.wait()
+                send_chat_chunk_in = self.number_chunk(self.pending.popleft())
+                self.condition.notify_all()
+
+            try:
+                for attempt in range(2):
+                    try:
+                        session = session or loop.run_until_complete(
+                            self.gateway.client.connect_async()
+                        )
+                        loop.run_until_complete(
+                            session.execute(
+                                SEND_CHAT_CHUNK_MUTATION,
+                                variable_values=get_chat_chunk_variables(send_chat_chunk_in),
+                            )
+                        )
+                        break
+
+                    except Exception as e:
+                        # The connection may have gone stale while the Lambda was frozen,
+                        # so reconnect and retry once
+                        session = self.close_session(loop, session)
+                        if attempt:
+                            self.logger.exception(f'Error publishing chat chunk: {e}')
+
+            finally:
+                with self.condition:
+                    self.unfinished_count -= 1
+                    self.condition.notify_all()
+
+    def close_session(self, loop: asyncio.AbstractEventLoop, session) -> None:
+        """
+        Close the GraphQL session, ignoring errors from an already broken connection.
+
+        :param asyncio.AbstractEventLoop loop: The event loop of the publisher thread
+        :param session: The GraphQL session to close
+        :return None: The session is no longer usable
+        """
+        if session is None:
+            return None
+
+        try:
+            loop.run_until_complete(self.gateway.client.close_async())
+        except Exception as e:
+            self.logger.warning(f'Error closing GraphQL session: {e}')
+        return None
+
+
+# Kept at module scope so the thread and its session are reused across warm invocations
+chat_chunk_publisher = ChatChunkPublisher()
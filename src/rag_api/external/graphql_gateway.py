@@ -1,11 +1,39 @@
 import os
-from typing import Optional
+from typing import Optional, Union
 
 from aws_lambda_powertools import Logger
 from gql import Client, gql
 from gql.transport.aiohttp import AIOHTTPTransport
+from graphql import DocumentNode
 from rag_api.models.chat import SendChatChunkIn
 
+# Parsed once at import instead of on every chunk. Subscribers only receive the selected fields.
+SEND_CHAT_CHUNK_MUTATION = gql(
+    """
+    mutation SendChatChunk($input: ChatChunkInput!) {
+        sendChatChunk(input: $input) {
+            entryId
+            userId
+            chatTopicId
+            response
+            streamMode
+            sequence
+            totalLength
+            checksum
+        }
+    }
+    """
+)
+
+
+def get_chat_chunk_variables(send_chat_chunk_in: SendChatChunkIn) -> dict:
+    """Get the sendChatChunk variables, leaving out unset fields.
+
+    :param SendChatChunkIn send_chat_chunk_in: The chat chunk to send.
+    :return dict: The mutation variables.
+    """
+    return {'input': send_chat_chunk_in.model_dump(mode='json', exclude_none=True)}
+
 
 class GraphQLGateway:
     def __init__(self):
@@ -20,15 +48,17 @@ class GraphQLGateway:
         self.client = Client(transport=self.transport, fetch_schema_from_transport=False)
         self.logger = Logger()
 
-    def mutation(self, query: str, input_params: Optional[dict] = None):
+    def mutation(self, query: Union[str, DocumentNode], input_params: Optional[dict] = None):
         """Send a mutation to the GraphQL gateway.
 
-        :param str query: The GraphQL mutation query.
+        :param Union[str, DocumentNode] query: The GraphQL mutation query, or its parsed document.
         :param dict input_params: The input parameters for the mutation.
         :return dict: The response from the GraphQL gateway.
         """
         try:
-            response = self.client.execute(gql(query), variable_values=input_params)
+            response = self.client.execute(
+                gql(query) if isinstance(query, str) else query, variable_values=input_params
+            )
             return response
 
         except Exception as e:
@@ -42,24 +72,7 @@ class GraphQLGateway:
         :param SendChatChunkIn send_chat_chunk_in: The chat chunk to send.
         :return dict: The response from the GraphQL gateway.
         """
-        query = """
-            mutation SendChatChunk($chatTopicId: String!, $userId: String!, $entryId: String!, $response: String!) {
-                sendChatChunk(
-                    input: {
-                        chatTopicId: $chatTopicId
-                        userId: $userId
-                        entryId: $entryId
-                        response: $response
-                    }
-                ) {
-                    entryId
-                    userId
-                    chatTopicId
-                    response
-                }
-            }
-        """
         return self.mutation(
-            query=query,
-            input_params=send_chat_chunk_in.model_dump(),
+            query=SEND_CHAT_CHUNK_MUTATION,
+            input_params=get_chat_chunk_variables(send_chat_chunk_in),
         )
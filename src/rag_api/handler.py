@@ -1,4 +1,4 @@
-from aws_lambda_powertools import Logger
+from aws_lambda_powertools import Logger, Metrics
 from aws_lambda_powertools.utilities.data_classes import (
     AppSyncResolverEvent,
     event_source,
@@ -8,9 +8,11 @@ from rag_api.controllers.chat_controller import ChatController
 from rag_api.models.chat import ChatPromptIn
 
 logger = Logger()
+metrics = Metrics()
 
 
 @logger.inject_lambda_context
+@metrics.log_metrics
 @event_source(data_class=AppSyncResolverEvent)
 def handler(event: AppSyncResolverEvent, context: LambdaContext) -> dict:
     _ = context
@@ -2,12 +2,13 @@ from typing import Optional
 
 from pydantic import BaseModel, Field
 from pynamodb.attributes import UnicodeAttribute
+from rag_api.constants.chat_constants import ChatStreamMode
 from rag_api.models.entity import Entities
 
 
 class Chat(Entities, discriminator='Chat'):
     # hk: CHAT#<userId>TOPIC#<chatTopicId>
-    # rk: MESSAGE#<entryId>
+    # rk: MSG#<ULID>, MESSAGE#<entryId> for messages stored before time-ordered keys
 
     message = UnicodeAttribute(null=False)
     type = UnicodeAttribute(null=False)
@@ -28,6 +29,9 @@ class ChatPromptIn(BaseModel):
     userId: str = Field(..., description='The user ID')
     chatTopicId: Optional[str] = Field(None, description='The chat topic ID')
     entryId: Optional[str] = Field(None, description='The chat ID')
+    streamMode: Optional[ChatStreamMode] = Field(
+        None, description='How the response is streamed, CUMULATIVE by default'
+    )
 
 
 class ChatOut(BaseModel):
@@ -42,3 +46,11 @@ class SendChatChunkIn(BaseModel):
     userId: str = Field(..., description='The user ID')
     entryId: str = Field(..., description='The chat ID')
     response: str = Field(..., description='The response to send')
+    streamMode: Optional[ChatStreamMode] = Field(None, description='How the response is streamed')
+    sequence: Optional[int] = Field(None, description='The position of a delta chunk, from 0')
+    totalLength: Optional[int] = Field(
+        None, description='The UTF-8 byte length of the whole response, on the last delta chunk'
+    )
+    checksum: Optional[str] = Field(
+        None, description='The SHA-256 hex digest of the whole response, on the last delta chunk'
+    )
@@ -0,0 +1,12 @@
+from pynamodb.attributes import NumberAttribute, UnicodeAttribute
+from rag_api.models.entity import Entities
+
+
+class KnowledgeBaseCache(Entities, discriminator='KNOWLEDGE_BASE_CACHE'):
+    # hk: KB_CACHE#<knowledgeBaseId>#<queryHash>
+    # rk: RETRIEVAL#<numberOfResults>
+
+    queryText = UnicodeAttribute(null=False)
+    retrievalText = UnicodeAttribute(null=False)
+    # Epoch seconds, the table TTL attribute
+    expiresAt = NumberAttribute(null=False)
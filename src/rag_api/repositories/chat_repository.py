@@ -1,60 +1,85 @@
-import os
 import uuid
 from datetime import datetime
 from http import HTTPStatus
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 import pytz
 from aws_lambda_powertools import Logger
-from pynamodb.connection import Connection
 from pynamodb.exceptions import (
     PutError,
     PynamoDBConnectionError,
     QueryError,
     TableDoesNotExist,
+    TransactWriteError,
 )
+from pynamodb.transactions import TransactWrite
 from rag_api.models.chat import Chat, ChatIn
+from rag_api.models.chat_topic import ChatTopicIn
+from rag_api.repositories.chat_topic_repository import ChatTopicRepository
 from shared_modules.constants.common_constants import EntryStatus
+from shared_modules.utils.client_registry import client_registry
+from shared_modules.utils.sortable_id import ulid_generator
 
 
 class ChatRepository:
     def __init__(self) -> None:
         self.core_obj_key = 'CHAT'
         self.topic_key = 'TOPIC'
-        self.message_key = 'MESSAGE'
-        self.conn = Connection(region=os.getenv('REGION'))
+        # Messages are keyed MSG#<ULID> so they sort by creation time, topics created before that
+        # hold MESSAGE#<uuid4> keys until they are migrated
+        self.message_key = 'MSG'
+        self.legacy_message_key = 'MESSAGE'
+        self.conn = client_registry.get_connection()
+        client_registry.bind_model(Chat)
+        self.chat_topic_repository = ChatTopicRepository()
         self.logger = Logger()
 
-    def store_chat(self, chat_in: ChatIn) -> Tuple[HTTPStatus, Chat, str]:
-        """Store a new Chat entry.
+    def build_chat(self, chat_in: ChatIn, message_id: Optional[str] = None) -> Chat:
+        """Build a new Chat entry without saving it.
 
         :param chat_in: ChatIn object containing the new Chat data.
+        :param message_id: Optional ULID of the message, generated now by default. Generate it
+            when the message is created so it sorts before later messages saved with it.
         :type chat_in: ChatIn
+        :type message_id: Optional[str]
 
-        :return: Tuple containing the HTTP status, the Chat object, and a message.
-        :rtype: Tuple[HTTPStatus, Chat, str]
-
+        :return: The Chat entry
+        :rtype: Chat
         """
         if not chat_in.entryId:
             chat_in.entryId = str(uuid.uuid4())
 
-        entry_id = chat_in.entryId
-
         hash_key = f'{self.core_obj_key}#{chat_in.userId}#{self.topic_key}#{chat_in.chatTopicId}'
-        range_key = f'{self.message_key}#{entry_id}'
+        range_key = f'{self.message_key}#{message_id or ulid_generator.generate()}'
         current_date = datetime.now(tz=pytz.timezone('Asia/Manila')).isoformat()
 
-        data = chat_in.model_dump()
+        return Chat(
+            hashKey=hash_key,
+            rangeKey=range_key,
+            createdAt=current_date,
+            updateDate=current_date,
+            entryStatus=EntryStatus.ACTIVE.value,
+            **chat_in.model_dump(),
+        )
+
+    def store_chat(
+        self, chat_in: ChatIn, message_id: Optional[str] = None
+    ) -> Tuple[HTTPStatus, Chat, str]:
+        """Store a new Chat entry.
+
+        :param chat_in: ChatIn object containing the new Chat data.
+        :param message_id: Optional ULID of the message, generated now by default.
+        :type chat_in: ChatIn
+        :type message_id: Optional[str]
+
+        :return: Tuple containing the HTTP status, the Chat object, and a message.
+        :rtype: Tuple[HTTPStatus, Chat, str]
+
+        """
+        chat_entry = self.build_chat(chat_in, message_id)
+        entry_id = chat_entry.entryId
 
         try:
-            chat_entry = Chat(
-                hashKey=hash_key,
-                rangeKey=range_key,
-                createdAt=current_date,
-                updateDate=current_date,
-                entryStatus=EntryStatus.ACTIVE.value,
-                **data,
-            )
             chat_entry.save()
 
         except PutError as e:
@@ -76,6 +101,53 @@ class ChatRepository:
             self.logger.info(f'[{self.core_obj_key} = {entry_id}]: Save Chat Entry Successful')
             return HTTPStatus.OK, chat_entry, None
 
+    def store_chat_turn(
+        self, chat_topic_in: ChatTopicIn, chat_entries: List[Chat]
+    ) -> Tuple[HTTPStatus, List[Chat], str]:
+        """Store the messages of a chat turn and upsert its chat topic in one transaction.
+
+        The topic is created or has its update date refreshed without reading it first, so the
+        whole turn costs a single TransactWriteItems round-trip.
+
+        :param chat_topic_in: ChatTopicIn object with the chat topic ID set.
+        :param chat_entries: The Chat entries of the turn, built with build_chat.
+        :type chat_topic_in: ChatTopicIn
+        :type chat_entries: List[Chat]
+
+        :return: Tuple containing the HTTP status, the stored Chat entries, and a message.
+        :rtype: Tuple[HTTPStatus, List[Chat], str]
+        """
+        chat_topic_id = chat_topic_in.entryId
+        chat_topic, topic_actions = self.chat_topic_repository.get_upsert_actions(chat_topic_in)
+
+        try:
+            with TransactWrite(connection=self.conn) as transaction:
+                transaction.update(chat_topic, actions=topic_actions)
+                for chat_entry in chat_entries:
+                    transaction.save(chat_entry)
+
+        except TransactWriteError as e:
+            message = f'Failed to save chat turn: {str(e)}'
+            self.logger.exception(f'[{self.core_obj_key}={chat_topic_id}] {message}')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
+
+        except TableDoesNotExist as db_error:
+            message = f'Error on Table, Please check config to make sure table is created: {str(db_error)}'
+            self.logger.exception(f'[{self.core_obj_key}={chat_topic_id}] {message}')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
+
+        except PynamoDBConnectionError as db_error:
+            message = f'Connection error occurred, Please check config(region, table name, etc): {str(db_error)}'
+            self.logger.exception(f'[{self.core_obj_key}={chat_topic_id}] {message}')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
+
+        else:
+            self.logger.info(
+                f'[{self.core_obj_key}={chat_topic_id}]: Save Chat Turn of '
+                f'{len(chat_entries)} Entries Successful'
+            )
+            return HTTPStatus.OK, chat_entries, None
+
     def get_chats_in_topic(
         self, chat_topic_id: str, user_id: str
     ) -> Tuple[HTTPStatus, List[Chat], str]:
@@ -102,3 +174,103 @@ class ChatRepository:
             message = f'Connection error occurred, Please check config(region, table name, etc): {str(db_error)}'
             self.logger.exception(f'[{self.core_obj_key}={chat_topic_id}] {message}')
             return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
+
+    def migrate_legacy_chat(self, chat: Chat) -> Optional[Chat]:
+        """Move a chat message stored as MESSAGE#<uuid4> to a time-ordered MSG#<ULID> key.
+
+        The ULID is generated from the message createdAt, so the migrated message sorts in the
+        order it was sent. The message is copied and its legacy item deleted in one transaction,
+        so a failed or concurrent migration leaves the message under exactly one key.
+
+        :param chat: The Chat entry with a legacy key
+        :type chat: Chat
+
+        :return: The migrated Chat entry, or None if the message could not be migrated
+        :rtype: Optional[Chat]
+        """
+        created_at = chat.createdAt or chat.updateDate
+        if not created_at:
+            self.logger.warning(f'[{chat.hashKey} {chat.rangeKey}]: No createdAt, not migrated')
+            return None
+
+        attributes = {
+            name: value
+            for name, value in chat.attribute_values.items()
+            if name not in ('cls', 'rangeKey')
+        }
+        ulid = ulid_generator.generate(datetime.fromisoformat(created_at))
+        migrated_chat = Chat(rangeKey=f'{self.message_key}#{ulid}', **attributes)
+
+        try:
+            with TransactWrite(connection=self.conn) as transaction:
+                transaction.save(migrated_chat, condition=Chat.rangeKey.does_not_exist())
+                transaction.delete(chat, condition=Chat.rangeKey.exists())
+
+        except TransactWriteError as e:
+            self.logger.warning(f'[{chat.hashKey} {chat.rangeKey}]: Failed to migrate: {e}')
+            return None
+
+        return migrated_chat
+
+    def get_recent_chats(
+        self, chat_topic_id: str, user_id: str, limit: int
+    ) -> Tuple[HTTPStatus, List[Chat], str]:
+        """Get the latest messages of a chat topic, newest first.
+
+        Messages are read with a reverse Query bounded by the limit, so the read cost does not
+        grow with the topic. Legacy MESSAGE#<uuid4> keys do not sort by time, so they cannot be
+        read the same way. When the topic has fewer than limit migrated messages, its legacy
+        messages are read once and migrated to MSG#<ULID> keys, and later reads find none.
+
+        :param chat_topic_id: The chat topic ID
+        :param user_id: The user ID
+        :param limit: The maximum number of messages to return
+        :type chat_topic_id: str
+        :type user_id: str
+        :type limit: int
+
+        :return: Tuple containing the HTTP status, the messages newest first, and a message.
+        :rtype: Tuple[HTTPStatus, List[Chat], str]
+        """
+        try:
+            hash_key = f'{self.core_obj_key}#{user_id}#{self.topic_key}#{chat_topic_id}'
+            chat_list = list(
+                Chat.query(
+                    hash_key,
+                    Chat.rangeKey.startswith(f'{self.message_key}#'),
+                    scan_index_forward=False,
+                    limit=limit,
+                )
+            )
+
+            if len(chat_list) < limit:
+                legacy_chats = Chat.query(
+                    hash_key, Chat.rangeKey.startswith(f'{self.legacy_message_key}#')
+                )
+                # A message that fails to migrate is still returned and retried on the next read
+                chat_list.extend(
+                    self.migrate_legacy_chat(legacy_chat) or legacy_chat
+                    for legacy_chat in legacy_chats
+                )
+                chat_list.sort(key=lambda chat: chat.createdAt or '', reverse=True)
+                chat_list = chat_list[:limit]
+
+            if chat_list:
+                return HTTPStatus.OK, chat_list, None
+
+            return HTTPStatus.NOT_FOUND, None, 'Chats not found'
+
+        except QueryError as e:
+            message = f'Failed to query chat: {str(e)}'
+            self.logger.exception(f'[{self.core_obj_key}={chat_topic_id}] {message}')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
+
+        except TableDoesNotExist as db_error:
+            message = f'Error on Table, Please check config to make sure table is created: {str(db_error)}'
+            self.logger.exception(f'[{self.core_obj_key}={chat_topic_id}] {message}')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
+
+        except PynamoDBConnectionError as db_error:
+            message = f'Connection error occurred, Please check config(region, table name, etc): {str(db_error)}'
+            self.logger.exception(f'[{self.core_obj_key}={chat_topic_id}] {message}')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
@@ -1,27 +1,28 @@
-import os
 import uuid
 from datetime import datetime
 from http import HTTPStatus
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 import pytz
 from aws_lambda_powertools import Logger
-from pynamodb.connection import Connection
 from pynamodb.exceptions import (
     PutError,
     PynamoDBConnectionError,
     QueryError,
     TableDoesNotExist,
 )
+from pynamodb.expressions.update import Action
 from rag_api.models.chat_topic import ChatTopic, ChatTopicIn
 from shared_modules.constants.common_constants import EntryStatus
+from shared_modules.utils.client_registry import client_registry
 
 
 class ChatTopicRepository:
     def __init__(self) -> None:
         self.core_obj_key = 'CHAT_TOPIC'
         self.topic_key = 'TOPIC'
-        self.conn = Connection(region=os.getenv('REGION'))
+        self.conn = client_registry.get_connection()
+        client_registry.bind_model(ChatTopic)
         self.logger = Logger()
 
     def store_chat_topic(self, chat_topic_in: ChatTopicIn) -> Tuple[HTTPStatus, ChatTopic, str]:
@@ -62,6 +63,33 @@ class ChatTopicRepository:
             self.logger.info(f'[{self.core_obj_key} = {entry_id}]: Save ChatTopic Entry Successful')
             return HTTPStatus.OK, chat_topic_entry, None
 
+    def get_upsert_actions(self, chat_topic_in: ChatTopicIn) -> Tuple[ChatTopic, List[Action]]:
+        """Get the update that creates a ChatTopic entry or refreshes its update date.
+
+        The update needs no prior read: attributes other than updateDate are only set if the
+        entry does not exist yet, so it can be sent on its own or as part of a transaction.
+
+        :param chat_topic_in: ChatTopicIn object with the chat topic ID set.
+        :type chat_topic_in: ChatTopicIn
+
+        :return: Tuple containing the keyed ChatTopic to update and the update actions.
+        :rtype: Tuple[ChatTopic, List[Action]]
+        """
+        chat_topic = ChatTopic(
+            hashKey=f'{self.core_obj_key}#{chat_topic_in.userId}',
+            rangeKey=f'{self.topic_key}#{chat_topic_in.entryId}',
+        )
+        current_date = datetime.now(tz=pytz.timezone('Asia/Manila')).isoformat()
+        actions = [
+            ChatTopic.updateDate.set(current_date),
+            ChatTopic.cls.set(ChatTopic.cls | ChatTopic),
+            ChatTopic.createdAt.set(ChatTopic.createdAt | current_date),
+            ChatTopic.entryStatus.set(ChatTopic.entryStatus | EntryStatus.ACTIVE.value),
+            ChatTopic.entryId.set(ChatTopic.entryId | chat_topic_in.entryId),
+            ChatTopic.title.set(ChatTopic.title | chat_topic_in.title),
+        ]
+        return chat_topic, actions
+
     def query_chat_topic(
         self, user_id: str, chat_topic_id: str
     ) -> Tuple[HTTPStatus, ChatTopic, str]:
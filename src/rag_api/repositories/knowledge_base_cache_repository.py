@@ -0,0 +1,149 @@
+import time
+from datetime import datetime
+from http import HTTPStatus
+from typing import Optional, Tuple
+
+import pytz
+from aws_lambda_powertools import Logger
+from pynamodb.exceptions import (
+    DoesNotExist,
+    GetError,
+    PutError,
+    PynamoDBConnectionError,
+    TableDoesNotExist,
+)
+from rag_api.models.knowledge_base_cache import KnowledgeBaseCache
+from shared_modules.constants.common_constants import EntryStatus
+from shared_modules.utils.client_registry import client_registry
+
+
+class KnowledgeBaseCacheRepository:
+    def __init__(self) -> None:
+        self.core_obj_key = 'KB_CACHE'
+        self.retrieval_key = 'RETRIEVAL'
+        self.conn = client_registry.get_connection()
+        client_registry.bind_model(KnowledgeBaseCache)
+        self.logger = Logger()
+
+    def get_keys(
+        self, knowledge_base_id: str, query_hash: str, number_of_results: int
+    ) -> Tuple[str, str]:
+        """Get the keys of a cached retrieval. Each query gets its own partition.
+
+        :param knowledge_base_id: The knowledge base ID
+        :param query_hash: The hash of the normalized query text
+        :param number_of_results: The number of results retrieved
+        :type knowledge_base_id: str
+        :type query_hash: str
+        :type number_of_results: int
+
+        :return: The hashKey and rangeKey
+        :rtype: Tuple[str, str]
+        """
+        return (
+            f'{self.core_obj_key}#{knowledge_base_id}#{query_hash}',
+            f'{self.retrieval_key}#{number_of_results}',
+        )
+
+    def get_retrieval(
+        self, knowledge_base_id: str, query_hash: str, number_of_results: int
+    ) -> Tuple[HTTPStatus, Optional[str], str]:
+        """Get a cached retrieval if it has not expired.
+
+        :param knowledge_base_id: The knowledge base ID
+        :param query_hash: The hash of the normalized query text
+        :param number_of_results: The number of results retrieved
+        :type knowledge_base_id: str
+        :type query_hash: str
+        :type number_of_results: int
+
+        :return: Tuple containing the HTTP status, the retrieval text, and a message.
+        :rtype: Tuple[HTTPStatus, Optional[str], str]
+        """
+        hash_key, range_key = self.get_keys(knowledge_base_id, query_hash, number_of_results)
+        try:
+            cache_entry = KnowledgeBaseCache.get(
+                hash_key, range_key, attributes_to_get=['retrievalText', 'expiresAt']
+            )
+
+            # TTL deletion runs in the background, so expired items can still be read
+            if cache_entry.expiresAt <= time.time():
+                return HTTPStatus.NOT_FOUND, None, 'Cached retrieval expired'
+
+            return HTTPStatus.OK, cache_entry.retrievalText, None
+
+        except DoesNotExist:
+            return HTTPStatus.NOT_FOUND, None, 'Cached retrieval not found'
+
+        except GetError as e:
+            message = f'Failed to get cached retrieval: {str(e)}'
+            self.logger.exception(f'[{self.core_obj_key}={query_hash}] {message}')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
+
+        except TableDoesNotExist as db_error:
+            message = f'Error on Table, Please check config to make sure table is created: {str(db_error)}'
+            self.logger.exception(f'[{self.core_obj_key}={query_hash}] {message}')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
+
+        except PynamoDBConnectionError as db_error:
+            message = f'Connection error occurred, Please check config(region, table name, etc): {str(db_error)}'
+            self.logger.exception(f'[{self.core_obj_key}={query_hash}] {message}')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, None, message
+
+    def save_retrieval(
+        self,
+        knowledge_base_id: str,
+        query_hash: str,
+        number_of_results: int,
+        query_text: str,
+        retrieval_text: str,
+        ttl_seconds: int,
+    ) -> Tuple[HTTPStatus, str]:
+        """Cache a retrieval, expiring it through the table TTL.
+
+        :param knowledge_base_id: The knowledge base ID
+        :param query_hash: The hash of the normalized query text
+        :param number_of_results: The number of results retrieved
+        :param query_text: The normalized query text
+        :param retrieval_text: The retrieved knowledge base text
+        :param ttl_seconds: Seconds until the cached retrieval expires
+        :type knowledge_base_id: str
+        :type query_hash: str
+        :type number_of_results: int
+        :type query_text: str
+        :type retrieval_text: str
+        :type ttl_seconds: int
+
+        :return: Tuple containing the HTTP status and a message.
+        :rtype: Tuple[HTTPStatus, str]
+        """
+        hash_key, range_key = self.get_keys(knowledge_base_id, query_hash, number_of_results)
+        current_date = datetime.now(tz=pytz.timezone('Asia/Manila')).isoformat()
+        try:
+            KnowledgeBaseCache(
+                hashKey=hash_key,
+                rangeKey=range_key,
+                createdAt=current_date,
+                updateDate=current_date,
+                entryStatus=EntryStatus.ACTIVE.value,
+                entryId=query_hash,
+                queryText=query_text,
+                retrievalText=retrieval_text,
+                expiresAt=int(time.time()) + ttl_seconds,
+            ).save()
+            return HTTPStatus.OK, None
+
+        except PutError as e:
+            message = f'Failed to save cached retrieval: {str(e)}'
+            self.logger.exception(f'[{self.core_obj_key}={query_hash}] {message}')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, message
+
+        except TableDoesNotExist as db_error:
+            message = f'Error on Table, Please check config to make sure table is created: {str(db_error)}'
+            self.logger.exception(f'[{self.core_obj_key}={query_hash}] {message}')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, message
+
+        except PynamoDBConnectionError as db_error:
+            message = f'Connection error occurred, Please check config(region, table name, etc): {str(db_error)}'
+            self.logger.exception(f'[{self.core_obj_key}={query_hash}] {message}')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, message
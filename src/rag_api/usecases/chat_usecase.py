@@ -1,75 +1,66 @@
+import os
+import uuid
+from concurrent.futures import Future
 from http import HTTPStatus
-from typing import Union
+from typing import Optional, Union
 
 from aws_lambda_powertools import Logger
-from rag_api.constants.chat_constants import ChatType
+from rag_api.constants.chat_constants import ChatConstants, ChatType
 from rag_api.models.chat import ChatIn, ChatOut, ChatPromptIn
 from rag_api.models.chat_topic import ChatTopicIn
 from rag_api.repositories.chat_repository import ChatRepository
-from rag_api.repositories.chat_topic_repository import ChatTopicRepository
-from rag_api.usecases.llm_usecase import LLMUsecase
+from rag_api.usecases.llm_usecase import LLMUsecase, context_executor
 from shared_modules.models.schema.message import ErrorResponse
+from shared_modules.utils.sortable_id import ulid_generator
 
 
 class ChatUsecase:
     def __init__(self):
         self.chat_repository = ChatRepository()
-        self.chat_topic_repository = ChatTopicRepository()
         self.llm_usecase = LLMUsecase()
+        self.prompt_write_ahead = os.getenv('CHAT_PROMPT_WRITE_AHEAD') == 'true'
         self.logger = Logger()
 
+    def get_chat_history(self, chat_prompt_in: ChatPromptIn) -> str:
+        """
+        Get the recent chat history of the topic for the prompt, newest message first.
+
+        The user prompt may be written concurrently, so it is left out of its own history.
+
+        :param ChatPromptIn chat_prompt_in: The user prompt
+        :return str: The chat history context
+        """
+        _, chats, _ = self.chat_repository.get_recent_chats(
+            chat_prompt_in.chatTopicId,
+            chat_prompt_in.userId,
+            limit=ChatConstants.CHAT_HISTORY_LIMIT + 1,
+        )
+        chat_history = [
+            chat.message for chat in chats or [] if chat.entryId != chat_prompt_in.entryId
+        ][: ChatConstants.CHAT_HISTORY_LIMIT]
+        return '\n'.join(chat_history) if chat_history else 'No Chat History'
+
     def process_chat(self, chat_prompt_in: ChatPromptIn) -> Union[ChatOut, ErrorResponse]:
         """
         Process a user prompt and generate a response using a language model.
 
+        The chat topic, the user prompt and the response are saved in one transaction after the
+        response is streamed, so only the history read and the context the prompt needs are on
+        the path to the first token. With CHAT_PROMPT_WRITE_AHEAD the prompt is also saved in the
+        background while streaming, so it is kept even if the response fails.
+
         :param ChatPromptIn chat_prompt_in: The user prompt to generate a response for.
         :return dict: A dictionary containing the response and the status code.
         """
-        status = HTTPStatus.OK
-        chat_history = []
-
+        is_new_topic = not chat_prompt_in.chatTopicId
+        if is_new_topic:
+            chat_prompt_in.chatTopicId = str(uuid.uuid4())
+        if not chat_prompt_in.entryId:
+            chat_prompt_in.entryId = str(uuid.uuid4())
         chat_topic_id = chat_prompt_in.chatTopicId
-        chat_topic_entry = None
-
-        if chat_topic_id:
-            _, chat_topic_entry, _ = self.chat_topic_repository.query_chat_topic(
-                user_id=chat_prompt_in.userId, chat_topic_id=chat_topic_id
-            )
-
-        if not chat_topic_id or not chat_topic_entry:
-            status, chat_topic, message = self.chat_topic_repository.store_chat_topic(
-                chat_topic_in=ChatTopicIn(
-                    userId=chat_prompt_in.userId,
-                    title=chat_prompt_in.query,
-                    entryId=chat_topic_id,
-                )
-            )
-            if status != HTTPStatus.OK:
-                return ErrorResponse(
-                    response=message,
-                    status=status,
-                )
 
-            chat_topic_id = chat_topic.entryId
-            chat_prompt_in.chatTopicId = chat_topic_id
-
-        else:
-            _, chats, _ = self.chat_repository.get_chats_in_topic(
-                chat_topic_id, chat_prompt_in.userId
-            )
-            chats_sorted = sorted(chats, key=lambda x: x.createdAt, reverse=True)
-            chat_history = [chat.message for chat in chats_sorted]
-
-            status, chat_topic_entry, message = self.chat_topic_repository.update_chat_topic(
-                chat_topic=chat_topic_entry,
-            )
-            if status != HTTPStatus.OK:
-                return ErrorResponse(
-                    response=message,
-                    status=status,
-                )
-
-        # Store the prompt chat
+        # Generated now so the prompt sorts before the response it is saved with
+        prompt_message_id = ulid_generator.generate()
         user_prompt_chat_in = ChatIn(
             userId=chat_prompt_in.userId,
             chatTopicId=chat_topic_id,
@@ -77,27 +68,51 @@ class ChatUsecase:
             type=ChatType.USER_PROMPT.value,
             entryId=chat_prompt_in.entryId,
         )
-        status, user_prompt_chat, message = self.chat_repository.store_chat(
-            chat_in=user_prompt_chat_in,
-        )
-        if status != HTTPStatus.OK:
-            return ErrorResponse(
-                response=message,
-                status=status,
+
+        prompt_future: Optional[Future] = None
+        if self.prompt_write_ahead:
+            prompt_future = context_executor.submit(
+                self.chat_repository.store_chat,
+                chat_in=user_prompt_chat_in,
+                message_id=prompt_message_id,
             )
+        # A new topic has no history yet
+        chat_history_future: Optional[Future] = (
+            None if is_new_topic else context_executor.submit(self.get_chat_history, chat_prompt_in)
+        )
 
-        chat_history_for_prompt = '\n'.join(chat_history) if chat_history else 'No Chat History'
-        llm_response = self.llm_usecase.generate_response(chat_prompt_in, chat_history_for_prompt)
+        llm_response = self.llm_usecase.generate_response(
+            chat_prompt_in, chat_history_future or 'No Chat History'
+        )
 
-        # Store the response chat
         llm_response_chat_in = ChatIn(
             userId=chat_prompt_in.userId,
             chatTopicId=chat_topic_id,
             message=llm_response,
             type=ChatType.LLM_RESPONSE.value,
         )
-        status, _, message = self.chat_repository.store_chat(
-            chat_in=llm_response_chat_in,
+        chat_entries = [self.chat_repository.build_chat(llm_response_chat_in)]
+
+        if prompt_future:
+            status, _, message = prompt_future.result()
+            if status != HTTPStatus.OK:
+                return ErrorResponse(
+                    response=message,
+                    status=status,
+                )
+        else:
+            chat_entries.insert(
+                0, self.chat_repository.build_chat(user_prompt_chat_in, prompt_message_id)
+            )
+
+        # Store the chat topic and the messages of the turn
+        status, _, message = self.chat_repository.store_chat_turn(
+            chat_topic_in=ChatTopicIn(
+                userId=chat_prompt_in.userId,
+                title=chat_prompt_in.query,
+                entryId=chat_topic_id,
+            ),
+            chat_entries=chat_entries,
         )
         if status != HTTPStatus.OK:
             return ErrorResponse(
@@ -109,5 +124,5 @@ class ChatUsecase:
             response=llm_response,
             chatTopicId=chat_topic_id,
             userId=chat_prompt_in.userId,
-            entryId=user_prompt_chat.entryId,
+            entryId=chat_prompt_in.entryId,
         )
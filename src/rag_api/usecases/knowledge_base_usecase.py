@@ -1,26 +1,108 @@
+import hashlib
 import os
+import re
+from http import HTTPStatus
+from typing import Optional
 
-import boto3
-from aws_lambda_powertools import Logger
+from aws_lambda_powertools import Logger, Metrics
+from aws_lambda_powertools.metrics import MetricUnit
 from mypy_boto3_bedrock_agent_runtime.client import AgentsforBedrockRuntimeClient
 from mypy_boto3_bedrock_agent_runtime.type_defs import RetrieveRequestTypeDef
+from rag_api.constants.chat_constants import ChatConstants
+from rag_api.repositories.knowledge_base_cache_repository import KnowledgeBaseCacheRepository
+from shared_modules.utils.client_registry import client_registry
+from shared_modules.utils.entity_ranker import tokenize
+from shared_modules.utils.ttl_lru_cache import TTLLRUCache
+
+QUERY_PATTERN = re.compile(r'[a-z0-9]+')
+
+# Conversational words that do not change what a follow-up question is about
+FOLLOW_UP_TERMS = frozenset(
+    'tell more explain elaborate else also again please thank thanks ok okay sure detail'.split()
+)
+
+# Kept at module scope so retrievals are reused across warm invocations
+retrieval_cache = TTLLRUCache(
+    max_entries=int(os.getenv('KB_CACHE_MAX_ENTRIES') or 256),
+    ttl_seconds=float(os.getenv('KB_CACHE_TTL_SECONDS') or 900),
+)
+topic_retrieval_cache = TTLLRUCache(
+    max_entries=int(os.getenv('KB_CACHE_MAX_ENTRIES') or 256),
+    ttl_seconds=float(os.getenv('KB_TOPIC_CACHE_TTL_SECONDS') or 600),
+)
 
 
 class KnowledgeBaseUsecase:
     def __init__(self):
         self.logger = Logger()
+        self.metrics = Metrics()
         self.region_name = os.getenv('BEDROCK_AWS_REGION')
-        self.bedrock_agent_runtime_client: AgentsforBedrockRuntimeClient = boto3.client(
-            'bedrock-agent-runtime', region_name=self.region_name
+        # Shared across warm invocations, so a turn skips client creation and the TLS handshake
+        self.bedrock_agent_runtime_client: AgentsforBedrockRuntimeClient = (
+            client_registry.get_client('bedrock-agent-runtime', region_name=self.region_name)
         )
+        self.retrieval_cache = retrieval_cache
+        self.topic_retrieval_cache = topic_retrieval_cache
+        self.use_shared_cache = os.getenv('KB_CACHE_SHARED_ENABLED') == 'true'
+        self.shared_cache_ttl_seconds = int(os.getenv('KB_CACHE_SHARED_TTL_SECONDS') or 86400)
+        self.knowledge_base_cache_repository = KnowledgeBaseCacheRepository()
 
-    def get_knowledge_base_data(self, prompt: str, number_of_results=5):
-        """Get the knowledge base data from the Bedrock Agent Runtime."""
+    @staticmethod
+    def normalize_query(prompt: str) -> str:
+        """Normalize a query so that case, punctuation and spacing variants share a cache entry.
 
-        self.logger.info(f'Getting knowledge base data for prompt: {prompt}')
+        :param str prompt: The user prompt
+        :return str: The normalized query text
+        """
+        return ' '.join(QUERY_PATTERN.findall(prompt.lower()))
 
-        knowledge_base_id = os.getenv('KNOWLEDGE_BASE_ID') or 'ORGCXIYNDH'
+    def record_cache_result(self, tier: Optional[str]):
+        """
+        Record a knowledge base cache hit on the given tier, or a miss.
+
+        :param Optional[str] tier: The tier that served the retrieval, None on a miss
+        """
+        if tier:
+            self.metrics.add_metric(name='KnowledgeBaseCacheHit', unit=MetricUnit.Count, value=1)
+            self.metrics.add_metric(
+                name=f'KnowledgeBase{tier.title()}CacheHit', unit=MetricUnit.Count, value=1
+            )
+        else:
+            self.metrics.add_metric(name='KnowledgeBaseCacheMiss', unit=MetricUnit.Count, value=1)
+
+        self.logger.info({'message': 'Knowledge base cache lookup', 'cache_tier': tier or 'miss'})
+
+    def get_topic_retrieval(
+        self, knowledge_base_id: str, chat_topic_id: str, query_terms: set
+    ) -> Optional[str]:
+        """
+        Get the last retrieval of a chat topic if the query is a follow-up to it.
+
+        A query is a follow-up when enough of its terms, ignoring conversational words, were
+        already in the query the topic retrieval was made for. A query with no terms of its own,
+        e.g. "tell me more", always reuses the topic retrieval.
+
+        :param str knowledge_base_id: The knowledge base ID
+        :param str chat_topic_id: The chat topic ID
+        :param set query_terms: The search terms of the query
+        :return Optional[str]: The topic retrieval text, None if the query is not a follow-up
+        """
+        topic_retrieval = self.topic_retrieval_cache.get((knowledge_base_id, chat_topic_id))
+        if not topic_retrieval:
+            return None
+
+        topic_terms, retrieval_text = topic_retrieval
+        new_terms = query_terms - FOLLOW_UP_TERMS
+        if not new_terms:
+            return retrieval_text
+
+        overlap = len(new_terms & topic_terms) / len(new_terms)
+        if overlap >= ChatConstants.KB_TOPIC_REUSE_MIN_OVERLAP:
+            return retrieval_text
+        return None
 
+    def retrieve(self, knowledge_base_id: str, prompt: str, number_of_results: int) -> str:
+        """Retrieve the knowledge base chunks for a prompt from the Bedrock Agent Runtime."""
         response: RetrieveRequestTypeDef = self.bedrock_agent_runtime_client.retrieve(
             knowledgeBaseId=knowledge_base_id,
             retrievalQuery={'text': prompt},
@@ -35,7 +117,71 @@ class KnowledgeBaseUsecase:
             text = content.get('text')
             text_results.append(text)
 
-        search_with_text = '\n'.join(text_results)
+        return '\n'.join(text_results)
+
+    def get_knowledge_base_data(
+        self, prompt: str, number_of_results=5, chat_topic_id: Optional[str] = None
+    ):
+        """
+        Get the knowledge base data for a prompt, reusing cached retrievals.
+
+        Retrievals are looked up in the in-process cache, then reused from the chat topic for
+        follow-up questions, then read from the shared DynamoDB cache when it is enabled, and
+        only retrieved from Bedrock when all of them miss.
+
+        :param str prompt: The user prompt
+        :param int number_of_results: The number of chunks to retrieve
+        :param Optional[str] chat_topic_id: The chat topic of the prompt, enables follow-up reuse
+        :return str: The retrieved knowledge base text
+        """
+        self.logger.info(f'Getting knowledge base data for prompt: {prompt}')
+
+        knowledge_base_id = os.getenv('KNOWLEDGE_BASE_ID') or 'ORGCXIYNDH'
+        query_text = self.normalize_query(prompt)
+        query_hash = hashlib.sha256(query_text.encode('utf-8')).hexdigest()
+        cache_key = (knowledge_base_id, query_hash, number_of_results)
+        query_terms = set(tokenize(query_text))
+
+        cache_tier = None
+        search_with_text = self.retrieval_cache.get(cache_key)
+        if search_with_text is not None:
+            cache_tier = 'memory'
+
+        if search_with_text is None and chat_topic_id:
+            search_with_text = self.get_topic_retrieval(
+                knowledge_base_id, chat_topic_id, query_terms
+            )
+            if search_with_text is not None:
+                # Keep the terms of the query the topic retrieval was made for
+                self.record_cache_result('topic')
+                return search_with_text
+
+        if search_with_text is None and self.use_shared_cache:
+            status, search_with_text, _ = self.knowledge_base_cache_repository.get_retrieval(
+                knowledge_base_id, query_hash, number_of_results
+            )
+            if status == HTTPStatus.OK:
+                cache_tier = 'shared'
+                self.retrieval_cache.put(cache_key, search_with_text)
+
+        if search_with_text is None:
+            search_with_text = self.retrieve(knowledge_base_id, prompt, number_of_results)
+            self.retrieval_cache.put(cache_key, search_with_text)
+            if self.use_shared_cache:
+                self.knowledge_base_cache_repository.save_retrieval(
+                    knowledge_base_id,
+                    query_hash,
+                    number_of_results,
+                    query_text,
+                    search_with_text,
+                    self.shared_cache_ttl_seconds,
+                )
+
+        if chat_topic_id:
+            self.topic_retrieval_cache.put(
+                (knowledge_base_id, chat_topic_id), (query_terms, search_with_text)
+            )
 
+        self.record_cache_result(cache_tier)
         self.logger.info(f'Knowledge base data: {search_with_text}')
         return search_with_text
@@ -1,42 +1,76 @@
+import hashlib
 import json
 import os
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from http import HTTPStatus
-from typing import List, Optional
+from typing import List, Optional, Union
 
-import boto3
-from aws_lambda_powertools import Logger
+from aws_lambda_powertools import Logger, Metrics
+from aws_lambda_powertools.metrics import MetricUnit
+from botocore.config import Config
 from botocore.exceptions import ClientError
-from rag_api.constants.chat_constants import ChatConstants
-from rag_api.external.graphql_gateway import GraphQLGateway
+from rag_api.constants.chat_constants import ChatConstants, ChatStreamMode
+from rag_api.external.chat_chunk_publisher import chat_chunk_publisher
 from rag_api.models.chat import ChatPromptIn, SendChatChunkIn
 from rag_api.usecases.knowledge_base_usecase import KnowledgeBaseUsecase
+from shared_modules.constants.entity_constants import EntityConstants
 from shared_modules.models.schema.entity import EntitySchema
+from shared_modules.models.schema.prompt import PromptSection
 from shared_modules.repositories.entity_repository import EntityRepository
+from shared_modules.utils.client_registry import client_registry
+from shared_modules.utils.entity_ranker import entity_ranker
+from shared_modules.utils.flush_policy import AdaptiveFlushPolicy, FlushPolicy
+from shared_modules.utils.prompt_budgeter import PromptBudgeter
+from shared_modules.utils.token_estimator import estimate_tokens
+
+BEDROCK_CLIENT_CONFIG = Config(
+    connect_timeout=ChatConstants.BEDROCK_CONNECT_TIMEOUT,
+    read_timeout=ChatConstants.BEDROCK_READ_TIMEOUT,
+    retries={'mode': 'adaptive', 'total_max_attempts': ChatConstants.BEDROCK_MAX_ATTEMPTS},
+)
+
+# Shared by every chat in the process for the independent reads and writes of a turn
+context_executor = ThreadPoolExecutor(
+    max_workers=ChatConstants.CONTEXT_WORKERS, thread_name_prefix='chat-context'
+)
+
+
+def get_bedrock_client():
+    """
+    Get the Bedrock runtime client shared across warm invocations.
+
+    The client is created on first use, so later messages skip client construction, endpoint
+    resolution and the TLS handshake.
+
+    :return: The bedrock-runtime client
+    """
+    return client_registry.get_client(
+        'bedrock-runtime',
+        region_name=os.getenv('BEDROCK_AWS_REGION'),
+        config=BEDROCK_CLIENT_CONFIG,
+    )
 
 
 class LLMUsecase:
     def __init__(self):
         self.logger = Logger()
-        self.graphql_gateway = GraphQLGateway()
+        self.metrics = Metrics()
+        self.chat_chunk_publisher = chat_chunk_publisher
         self.knowledge_base_usecase = KnowledgeBaseUsecase()
         self.entity_repository = EntityRepository()
+        self.entity_ranker = entity_ranker
+        self.prompt_budgeter = PromptBudgeter(ChatConstants.PROMPT_TOKEN_BUDGET)
 
-    def build_prompt(
+    def assemble_prompt(
         self,
         prompt: str,
         chat_history_context: str,
         vector_retrieval_chunks: str,
-        user_entity: Optional[EntitySchema] = None,
-        other_entities: Optional[List[EntitySchema]] = None,
-    ):
-        """Build the prompt for the LLM."""
-        entity_data = (
-            '\n'.join([entity.model_dump_json() for entity in other_entities])
-            if other_entities
-            else None
-        )
-
+        user_entity_data: str,
+        entity_data: str,
+    ) -> str:
+        """Assemble the prompt for the LLM from the already fitted section texts."""
         base_prompt = (
             'You are a context-aware startup ecosystem assistant for Davao City. Your goal is to help startups, '
             'investors, and ecosystem enablers by providing relevant, timely, and personalized support based on '
@@ -50,9 +84,7 @@ class LLMUsecase:
         )
 
         current_entity_section = (
-            ('## Current User Data:\n' f'{user_entity.model_dump_json()}\n\n')
-            if user_entity
-            else ''
+            ('## Current User Data:\n' f'{user_entity_data}\n\n') if user_entity_data else ''
         )
 
         other_entities_section = (
@@ -80,14 +112,79 @@ class LLMUsecase:
 
         return base_prompt + current_entity_section + other_entities_section + instructions
 
+    def build_prompt(
+        self,
+        prompt: str,
+        chat_history_context: str,
+        vector_retrieval_chunks: str,
+        user_entity: Optional[EntitySchema] = None,
+        other_entities: Optional[List[EntitySchema]] = None,
+    ):
+        """
+        Build the prompt for the LLM within ChatConstants.PROMPT_TOKEN_BUDGET.
+
+        Each section is fitted to its own token allowance. When the prompt is still over budget,
+        the other entities are trimmed first, then the chat history, the knowledge base data and
+        the user data. The chat history is newest first, so its oldest messages are cut first.
+        """
+        sections = self.prompt_budgeter.fit(
+            [
+                PromptSection(name='prompt', items=[prompt]),
+                PromptSection(
+                    name='user_entity',
+                    items=[user_entity.model_dump_json(exclude_none=True)] if user_entity else [],
+                    max_tokens=ChatConstants.USER_ENTITY_TOKEN_BUDGET,
+                    priority=4,
+                ),
+                PromptSection(
+                    name='knowledge_base',
+                    items=[vector_retrieval_chunks],
+                    max_tokens=ChatConstants.KNOWLEDGE_BASE_TOKEN_BUDGET,
+                    priority=3,
+                ),
+                PromptSection(
+                    name='chat_history',
+                    items=[chat_history_context],
+                    max_tokens=ChatConstants.CHAT_HISTORY_TOKEN_BUDGET,
+                    priority=2,
+                ),
+                PromptSection(
+                    name='other_entities',
+                    items=[
+                        entity.model_dump_json(exclude_none=True) for entity in other_entities or []
+                    ],
+                    max_tokens=ChatConstants.ENTITY_CONTEXT_TOKEN_BUDGET,
+                    priority=1,
+                    omission_note='({count} more matching entities omitted)',
+                ),
+            ],
+            reserved_tokens=estimate_tokens(self.assemble_prompt('', '', '', '', '')),
+        )
+
+        llm_prompt = self.assemble_prompt(
+            sections['prompt'],
+            sections['chat_history'],
+            sections['knowledge_base'],
+            sections['user_entity'],
+            sections['other_entities'],
+        )
+        self.logger.info(
+            {
+                'message': 'Built chat prompt',
+                'prompt_tokens': estimate_tokens(llm_prompt),
+                'section_tokens': {name: estimate_tokens(text) for name, text in sections.items()},
+            }
+        )
+        return llm_prompt
+
     def invoke_llm(self, prompt: str):
         """Invoke the LLM with the given prompt."""
-        region_name = os.getenv('BEDROCK_AWS_REGION')
         model_id = 'us.anthropic.claude-3-5-haiku-20241022-v1:0'
+        start_time = time.perf_counter()
+        is_first_token = True
 
         try:
-            client = boto3.client('bedrock-runtime', region_name=region_name)
-            model_id = 'us.anthropic.claude-3-5-haiku-20241022-v1:0'
+            client = get_bedrock_client()
             response = client.invoke_model_with_response_stream(
                 modelId=model_id,
                 body=json.dumps(
@@ -106,6 +203,10 @@ class LLMUsecase:
                 if chunk:
                     message = json.loads(chunk.get('bytes').decode())
                     if message['type'] == 'content_block_delta':
+                        if is_first_token:
+                            is_first_token = False
+                            self._record_time_to_first_token(start_time)
+
                         response_chunk = message['delta']['text'] or ''
                         self.logger.debug(f'Bedrock response Chunk: {response_chunk}')
                         yield response_chunk
@@ -120,35 +221,153 @@ class LLMUsecase:
                 'status': HTTPStatus.INTERNAL_SERVER_ERROR,
             }
 
-    def _send_chat_chunk(self, chat_in: ChatPromptIn, response_text: str):
-        """Helper function to send chat chunks to the GraphQL gateway.
+    def _record_time_to_first_token(self, start_time: float):
+        """
+        Record the time from invoking the model to its first streamed token.
+
+        :param float start_time: The perf_counter value taken before the model was invoked
+        """
+        time_to_first_token_ms = (time.perf_counter() - start_time) * 1000
+        self.metrics.add_metric(
+            name='TimeToFirstToken', unit=MetricUnit.Milliseconds, value=time_to_first_token_ms
+        )
+        self.logger.info(
+            {
+                'message': 'Received first token from Bedrock',
+                'time_to_first_token_ms': round(time_to_first_token_ms, 1),
+            }
+        )
+
+    def create_flush_policy(self) -> FlushPolicy:
+        """
+        Create the policy deciding when buffered response text is sent as a chat chunk.
+
+        :return FlushPolicy: A new policy for one response stream
+        """
+        return AdaptiveFlushPolicy(
+            max_latency_seconds=ChatConstants.CHUNK_FLUSH_MAX_LATENCY_SECONDS,
+            min_bytes=ChatConstants.CHUNK_FLUSH_MIN_BYTES,
+            max_flushes_per_second=ChatConstants.CHUNK_FLUSH_MAX_PER_SECOND,
+        )
+
+    def _send_chat_chunk(self, chat_in: ChatPromptIn, response_text: str, **chunk_fields):
+        """Helper function to queue chat chunks for the GraphQL gateway without blocking.
 
         Args:
             chat_in (ChatPromptIn): The input chat prompt containing metadata
             response_text (str): The response text to send
+            chunk_fields: Additional SendChatChunkIn fields
         """
         send_chat_chunk_in = SendChatChunkIn(
             chatTopicId=chat_in.chatTopicId,
             userId=chat_in.userId,
             entryId=chat_in.entryId,
             response=response_text,
+            streamMode=chat_in.streamMode,
+            **chunk_fields,
+        )
+        self.chat_chunk_publisher.publish(send_chat_chunk_in)
+
+    def _send_end_of_message(self, chat_in: ChatPromptIn, response_text: str):
+        """Helper function to queue the end of message chunk.
+
+        In delta mode it carries the length and checksum of the whole response, so clients can
+        check that no delta was lost.
+
+        Args:
+            chat_in (ChatPromptIn): The input chat prompt containing metadata
+            response_text (str): The whole response text
+        """
+        if chat_in.streamMode != ChatStreamMode.DELTA:
+            self._send_chat_chunk(chat_in, ChatConstants.END_OF_MESSAGE)
+            return
+
+        response_bytes = response_text.encode('utf-8')
+        self._send_chat_chunk(
+            chat_in,
+            ChatConstants.END_OF_MESSAGE,
+            totalLength=len(response_bytes),
+            checksum=hashlib.sha256(response_bytes).hexdigest(),
         )
-        self.graphql_gateway.send_chat_chunk(send_chat_chunk_in)
 
-    def generate_response(self, chat_in: ChatPromptIn, chat_history_context: str):
+    def select_relevant_entities(
+        self, query: str, chat_history_context: str, entities: List[EntitySchema]
+    ) -> List[EntitySchema]:
+        """
+        Select the entities most relevant to the query and recent chat history.
+
+        Entities are ranked in-process with BM25 and capped by
+        ChatConstants.ENTITY_CONTEXT_TOP_K and ChatConstants.ENTITY_CONTEXT_TOKEN_BUDGET, so the
+        prompt no longer grows with the size of the ecosystem. When nothing matches, a few
+        startups and enablers are selected instead of none.
+
+        :param str query: The user query
+        :param str chat_history_context: The chat history, newest message first
+        :param List[EntitySchema] entities: The candidate entities
+        :return List[EntitySchema]: The selected entities, most relevant first
+        """
+        start_time = time.perf_counter()
+        history = chat_history_context.split('\n')[: ChatConstants.ENTITY_CONTEXT_HISTORY_MESSAGES]
+        selected_entities = self.entity_ranker.select(
+            query,
+            entities,
+            top_k=ChatConstants.ENTITY_CONTEXT_TOP_K,
+            token_budget=ChatConstants.ENTITY_CONTEXT_TOKEN_BUDGET,
+            history=history,
+            fallback_k=ChatConstants.ENTITY_CONTEXT_FALLBACK_K,
+        )
+        self.logger.info(
+            {
+                'message': 'Selected entity context',
+                'candidate_count': len(entities),
+                'selected_count': len(selected_entities),
+                'ranking_ms': round((time.perf_counter() - start_time) * 1000, 1),
+            }
+        )
+        return selected_entities
+
+    def generate_response(self, chat_in: ChatPromptIn, chat_history_context: Union[str, Future]):
         """
         Generate a response to a user prompt using a vector store index and a language model.
 
+        The knowledge base retrieval, the entity snapshot and the Bedrock client are fetched
+        concurrently with each other and with a pending chat history read, so the time before
+        the model is invoked is bounded by the slowest of them.
+
         :param ChatPromptIn chat_in: The user prompt to generate a response for.
-        :param str chat_history_context: The chat history context to use for the response.
+        :param Union[str, Future] chat_history_context: The chat history context to use for the
+            response, or a future resolving to it.
         :return dict: A dictionary containing the response and the status code.
         """
         # Configuration
         prompt = chat_in.query
         user_id = chat_in.userId
-        vector_retrieval_chunks = self.knowledge_base_usecase.get_knowledge_base_data(prompt)
 
-        _, entities, _, _ = self.entity_repository.get_entity_list()
+        start_time = time.perf_counter()
+        knowledge_base_future = context_executor.submit(
+            self.knowledge_base_usecase.get_knowledge_base_data,
+            prompt,
+            chat_topic_id=chat_in.chatTopicId,
+        )
+        # The ranker scores the query against the whole catalog, so the cached snapshot list is
+        # read instead of streaming iter_entities on every turn
+        entities_future = context_executor.submit(
+            self.entity_repository.get_entity_snapshot, fields=EntityConstants.CHAT_FIELDS
+        )
+        bedrock_client_future = context_executor.submit(get_bedrock_client)
+
+        if isinstance(chat_history_context, Future):
+            chat_history_context = chat_history_context.result()
+        vector_retrieval_chunks = knowledge_base_future.result()
+        entities = entities_future.result()
+        bedrock_client_future.result()
+        self.logger.info(
+            {
+                'message': 'Gathered chat context',
+                'context_ms': round((time.perf_counter() - start_time) * 1000, 1),
+            }
+        )
+
         user_entity = None
         other_entities = []
         for entity in entities:
@@ -157,32 +376,39 @@ class LLMUsecase:
             else:
                 other_entities.append(entity)
 
+        other_entities = self.select_relevant_entities(
+            chat_in.query, chat_history_context, other_entities
+        )
         prompt = self.build_prompt(
             prompt, chat_history_context, vector_retrieval_chunks, user_entity, other_entities
         )
 
         response_text = ''
         chunk_buffer_list = []
+        # Delta chunks carry only the new text instead of the whole response so far
+        is_delta = chat_in.streamMode == ChatStreamMode.DELTA
+        flush_policy = self.create_flush_policy()
 
         for response_chunk in self.invoke_llm(prompt):
             chunk_buffer_list.append(response_chunk)
 
-            if len(chunk_buffer_list) < ChatConstants.CHUNK_BUFFER_LIMIT:
+            if not flush_policy.add(response_chunk, time.monotonic()):
                 continue
 
-            response_text += ''.join(chunk_buffer_list)
+            chunk_text = ''.join(chunk_buffer_list)
+            response_text += chunk_text
             chunk_buffer_list = []
 
-            self._send_chat_chunk(chat_in, response_text)
-
-        time.sleep(1)
+            self._send_chat_chunk(chat_in, chunk_text if is_delta else response_text)
+            flush_policy.record_flush(time.monotonic())
 
         if chunk_buffer_list:
-            response_text += ''.join(chunk_buffer_list)
-            self._send_chat_chunk(chat_in, response_text)
-
-        time.sleep(1)
+            chunk_text = ''.join(chunk_buffer_list)
+            response_text += chunk_text
+            self._send_chat_chunk(chat_in, chunk_text if is_delta else response_text)
 
-        self._send_chat_chunk(chat_in, ChatConstants.END_OF_MESSAGE)
+        # The publisher sends chunks in order, so the end of message always arrives last
+        self._send_end_of_message(chat_in, response_text)
+        self.chat_chunk_publisher.flush()
 
         return response_text
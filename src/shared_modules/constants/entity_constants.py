@@ -1,6 +1,172 @@
+import re
 from enum import StrEnum
 
+# Inline fragment openers, field names and braces of a GraphQL selection set
+SELECTION_SET_TOKEN_PATTERN = re.compile(r'\.\.\.\s*on\s+\w+\s*\{|[_A-Za-z]\w*|[{}]')
+
 
 class EntityType(StrEnum):
     ENABLER = 'ENABLER'
     STARTUP = 'STARTUP'
+
+
+class EntityConstants:
+    # Item bumped by every profile mutation, used to validate cached entity snapshots
+    CATALOG_VERSION_HASH_KEY = 'CATALOG'
+    CATALOG_VERSION_RANGE_KEY = 'CATALOG#VERSION'
+
+    # Item written by the entity migrations once every profile item carries its GSI3PK
+    MIGRATION_HASH_KEY = 'MIGRATION'
+    GSI3PK_BACKFILL_RANGE_KEY = 'MIGRATION#GSI3PK_BACKFILL'
+
+    # GSI4PK of METADATA items flagged for suggestion generation
+    PENDING_SUGGESTION_GSI4PK = 'SUGGESTION#PENDING'
+
+    # Header item of the stream-maintained catalog document, its chunks use the same prefix
+    CATALOG_DOCUMENT_RANGE_KEY = 'CATALOG#DOCUMENT'
+    CATALOG_CHUNK_SIZE = 350_000
+
+    # Attributes stored on each profile item, keyed by the item rangeKey
+    PROFILE_ITEM_FIELDS = {
+        'STARTUP#METADATA': (
+            'startUpName',
+            'email',
+            'logoObjectKey',
+            'dateFounded',
+            'startupStage',
+            'description',
+            'location',
+            'revenueModel',
+            'createdAt',
+            'industries',
+            'forSuggestionGeneration',
+        ),
+        'STARTUP#CONTACTS': ('contacts',),
+        'STARTUP#MILESTONES': ('milestones',),
+        'STARTUP#FOUNDERS': ('founders',),
+        'ENABLER#METADATA': (
+            'enablerName',
+            'email',
+            'logoObjectKey',
+            'dateFounded',
+            'organizationType',
+            'description',
+            'location',
+            'industryFocus',
+            'supportType',
+            'fundingStageFocus',
+            'investmentAmount',
+            'startupStagePreference',
+            'preferredBusinessModels',
+            'forSuggestionGeneration',
+        ),
+        'ENABLER#CONTACTS': ('contacts',),
+        'ENABLER#INVESTMENT_CRITERIA': ('investmentCriteria',),
+        'ENABLER#PORTFOLIO': ('portfolio',),
+    }
+
+    # Sub-item fields that can be requested on top of the METADATA item
+    ENTITY_FIELD_MAP = {
+        EntityType.STARTUP: {
+            'contacts': 'STARTUP#CONTACTS',
+            'milestones': 'STARTUP#MILESTONES',
+            'founders': 'STARTUP#FOUNDERS',
+        },
+        EntityType.ENABLER: {
+            'contacts': 'ENABLER#CONTACTS',
+            'investmentCriteria': 'ENABLER#INVESTMENT_CRITERIA',
+            'portfolio': 'ENABLER#PORTFOLIO',
+        },
+    }
+
+    # Fields used by the suggestion matching prompt
+    MATCHING_FIELDS = (
+        'startUpName',
+        'enablerName',
+        'dateFounded',
+        'description',
+        'location',
+        'startupStage',
+        'revenueModel',
+        'industries',
+        'organizationType',
+        'industryFocus',
+        'supportType',
+        'fundingStageFocus',
+        'investmentAmount',
+        'startupStagePreference',
+        'preferredBusinessModels',
+        'forSuggestionGeneration',
+        'milestones',
+        'investmentCriteria',
+        'portfolio',
+    )
+
+    # Fields used by the chat assistant prompt
+    CHAT_FIELDS = (
+        'startUpName',
+        'enablerName',
+        'email',
+        'dateFounded',
+        'description',
+        'location',
+        'startupStage',
+        'revenueModel',
+        'industries',
+        'organizationType',
+        'industryFocus',
+        'supportType',
+        'fundingStageFocus',
+        'investmentAmount',
+        'startupStagePreference',
+        'preferredBusinessModels',
+        'contacts',
+        'milestones',
+        'founders',
+        'investmentCriteria',
+        'portfolio',
+    )
+
+    @staticmethod
+    def parse_selection_set(query_selection_set: str) -> set:
+        """Get the names of the top-level fields of a GraphQL selection set.
+
+        Fields selected through inline fragments (... on Startup { ... }) count as top-level,
+        fields nested in an object field (location { address }) do not.
+
+        :param str query_selection_set: The GraphQL selection set of the query
+        :return set: The top-level field names
+        """
+        field_names = set()
+        # One entry per open brace, True if it belongs to an object field rather than a fragment
+        open_braces = []
+        previous_token = None
+        for token in SELECTION_SET_TOKEN_PATTERN.findall(query_selection_set or ''):
+            if token == '{':
+                open_braces.append(previous_token is not None)
+                previous_token = None
+            elif token == '}':
+                if open_braces:
+                    open_braces.pop()
+                previous_token = None
+            elif token.startswith('...'):
+                open_braces.append(False)
+                previous_token = None
+            else:
+                if sum(open_braces) == 0:
+                    field_names.add(token)
+                previous_token = token
+        return field_names
+
+    @classmethod
+    def get_selected_fields(cls, query_selection_set: str) -> list:
+        """Get the profile fields present in a GraphQL selection set.
+
+        :param str query_selection_set: The GraphQL selection set of the query
+        :return list: The profile fields requested by the query
+        """
+        selected_fields = cls.parse_selection_set(query_selection_set)
+        profile_fields = {
+            field for item_fields in cls.PROFILE_ITEM_FIELDS.values() for field in item_fields
+        }
+        return sorted(profile_fields & selected_fields)
@@ -1,6 +1,7 @@
 import os
 
 from pynamodb.attributes import (
+    BinaryAttribute,
     BooleanAttribute,
     ListAttribute,
     MapAttribute,
@@ -8,7 +9,7 @@ from pynamodb.attributes import (
     UnicodeAttribute,
 )
 from pynamodb.models import Model
-from shared_modules.models.dynamodb.gsi import GSI1PKIndex
+from shared_modules.models.dynamodb.gsi import GSI1PKIndex, GSI3PKIndex, GSI4PKIndex
 
 
 class LatLng(MapAttribute):
@@ -73,6 +74,10 @@ class Entity(Model):
     # GSI
     GSI1PK = UnicodeAttribute(null=True)
     gsi1_index = GSI1PKIndex()
+    GSI3PK = UnicodeAttribute(null=True)  # Entity type, only set on profile items
+    gsi3_index = GSI3PKIndex()
+    GSI4PK = UnicodeAttribute(null=True)  # Only set while flagged for suggestion generation
+    gsi4_index = GSI4PKIndex()
 
     # Common attributes
     email = UnicodeAttribute()
@@ -124,3 +129,12 @@ class Entity(Model):
     matchPairName = UnicodeAttribute(null=True)
 
     forSuggestionGeneration = BooleanAttribute(null=True)
+    # Hash of the matching fields the last generated suggestions were based on
+    suggestionFingerprint = UnicodeAttribute(null=True)
+
+    # Catalog attributes
+    catalogVersion = UnicodeAttribute(null=True)
+    catalogRevision = NumberAttribute(null=True)
+    chunkCount = NumberAttribute(null=True)
+    chunkSet = UnicodeAttribute(null=True)  # Key prefix of the chunks the header points to
+    catalogChunk = BinaryAttribute(legacy_encoding=False, null=True)
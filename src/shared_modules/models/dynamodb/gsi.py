@@ -1,5 +1,5 @@
 from pynamodb.attributes import UnicodeAttribute
-from pynamodb.indexes import AllProjection, GlobalSecondaryIndex
+from pynamodb.indexes import AllProjection, GlobalSecondaryIndex, IncludeProjection
 
 
 class GSI1PKIndex(GlobalSecondaryIndex):
@@ -15,3 +15,33 @@ class GSI1PKIndex(GlobalSecondaryIndex):
 
     GSI1PK = UnicodeAttribute(hash_key=True)
     rangeKey = UnicodeAttribute(range_key=True)
+
+
+class GSI3PKIndex(GlobalSecondaryIndex):
+    """
+    Sparse Global Secondary Index of profile items partitioned by entity type
+    """
+
+    class Meta:
+        index_name = 'GSI3PK'
+        projection = AllProjection()
+        read_capacity_units = 1
+        write_capacity_units = 1
+
+    GSI3PK = UnicodeAttribute(hash_key=True)  # Format: "STARTUP" or "ENABLER"
+    rangeKey = UnicodeAttribute(range_key=True)
+
+
+class GSI4PKIndex(GlobalSecondaryIndex):
+    """
+    Sparse Global Secondary Index of METADATA items flagged for suggestion generation
+    """
+
+    class Meta:
+        index_name = 'GSI4PK'
+        projection = IncludeProjection(['updatedAt'])
+        read_capacity_units = 1
+        write_capacity_units = 1
+
+    GSI4PK = UnicodeAttribute(hash_key=True)  # Format: "SUGGESTION#PENDING"
+    rangeKey = UnicodeAttribute(range_key=True)
@@ -0,0 +1,22 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class PromptSection(BaseModel):
+    name: str = Field(..., description='Section name, used to look up the fitted text')
+    items: List[str] = Field(
+        default_factory=list,
+        description='Section entries in order of importance, later entries are dropped first',
+    )
+    max_tokens: Optional[int] = Field(
+        None, description='Token allowance of the section, None if it must never be trimmed'
+    )
+    priority: int = Field(
+        0, description='Sections with a lower priority are trimmed first when over budget'
+    )
+    separator: str = Field('\n', description='Separator placed between the section entries')
+    omission_note: Optional[str] = Field(
+        None,
+        description='Note appended when entries are dropped, formatted with the dropped count',
+    )
@@ -0,0 +1,306 @@
+import gzip
+import json
+from datetime import datetime
+from http import HTTPStatus
+from typing import List, Optional, Tuple
+from uuid import uuid4
+
+import pytz
+from aws_lambda_powertools import Logger
+from pynamodb.exceptions import (
+    GetError,
+    PutError,
+    PynamoDBConnectionError,
+    QueryError,
+    TableDoesNotExist,
+    TransactWriteError,
+    UpdateError,
+)
+from pynamodb.transactions import TransactWrite
+from shared_modules.constants.entity_constants import EntityConstants
+from shared_modules.models.dynamodb.entity import Entity
+from shared_modules.utils.client_registry import client_registry
+from shared_modules.utils.entity_assembler import encode_json_value
+
+
+class EntityCatalogRepository:
+    """
+    Repository of the materialized entity catalog document
+
+    The catalog holds the entity data of every startup and enabler keyed by hashKey. It is
+    stored gzip compressed and split across chunk items in the CATALOG partition, so the whole
+    ecosystem is read with a GetItem of the header and a single Query of its chunks.
+
+    Every save writes its chunks under a new chunk set and then points the header at it, so
+    the document is never limited by the size of a transaction and readers never see the
+    chunks of a save that did not complete.
+    """
+
+    def __init__(self) -> None:
+        self.conn = client_registry.get_connection()
+        client_registry.bind_model(Entity)
+        self.logger = Logger()
+        self.chunk_size = EntityConstants.CATALOG_CHUNK_SIZE
+        # Chunks written per transaction, kept under the 4 MB TransactWriteItems limit
+        self.chunks_per_transaction = 10
+
+    def new_chunk_set(self, revision: int) -> str:
+        """Get a chunk set name unique to one save, so concurrent saves never share chunks.
+
+        :param revision: The catalog revision the save writes
+        :type revision: int
+
+        :return: The chunk set name
+        :rtype: str
+        """
+        return f'R{revision:08d}-{uuid4().hex[:12]}'
+
+    def get_chunk_prefix(self, chunk_set: str) -> str:
+        """Get the rangeKey prefix of the chunk items of a chunk set.
+
+        :param chunk_set: The chunk set name
+        :type chunk_set: str
+
+        :return: The chunk rangeKey prefix
+        :rtype: str
+        """
+        return f'{EntityConstants.CATALOG_DOCUMENT_RANGE_KEY}#{chunk_set}#CHUNK#'
+
+    def get_chunk_range_key(self, chunk_set: str, chunk_index: int) -> str:
+        """Get the rangeKey of a catalog chunk item.
+
+        :param chunk_set: The chunk set the chunk belongs to
+        :param chunk_index: The index of the chunk
+        :type chunk_set: str
+        :type chunk_index: int
+
+        :return: The chunk rangeKey
+        :rtype: str
+        """
+        return f'{self.get_chunk_prefix(chunk_set)}{chunk_index:04d}'
+
+    def encode_catalog(self, document: dict) -> List[bytes]:
+        """Compress the catalog document and split it into chunks that fit in an item.
+
+        :param document: The catalog document with the catalogVersion and entities keys
+        :type document: dict
+
+        :return: The compressed document chunks
+        :rtype: List[bytes]
+        """
+        payload = gzip.compress(
+            json.dumps(document, separators=(',', ':'), default=encode_json_value).encode('utf-8')
+        )
+        return [
+            payload[chunk_start : chunk_start + self.chunk_size]
+            for chunk_start in range(0, len(payload), self.chunk_size)
+        ]
+
+    def decode_catalog(self, chunks: List[bytes]) -> dict:
+        """Rebuild the catalog document from its compressed chunks.
+
+        :param chunks: The compressed document chunks, in order
+        :type chunks: List[bytes]
+
+        :return: The catalog document with the catalogVersion and entities keys
+        :rtype: dict
+        """
+        return json.loads(gzip.decompress(b''.join(chunks)).decode('utf-8'))
+
+    def get_catalog_header(self) -> Optional[Entity]:
+        """Get the catalog header item with a strongly consistent read.
+
+        :return: The header item, None if no catalog has been saved
+        :rtype: Optional[Entity]
+        """
+        try:
+            return Entity.get(
+                EntityConstants.CATALOG_VERSION_HASH_KEY,
+                EntityConstants.CATALOG_DOCUMENT_RANGE_KEY,
+                consistent_read=True,
+            )
+
+        except Entity.DoesNotExist:
+            return None
+
+    def get_catalog(self) -> Tuple[HTTPStatus, Optional[dict], str]:
+        """Get the catalog document from its header and the chunk set the header points to.
+
+        :return: Tuple containing HTTP status, the catalog document and a message. The document
+            holds the catalogVersion, entities, catalogRevision, chunkSet and chunkCount keys.
+        :rtype: Tuple[HTTPStatus, Optional[dict], str]
+        """
+        try:
+            header = self.get_catalog_header()
+            if not header:
+                return HTTPStatus.NOT_FOUND, None, 'Catalog not found'
+
+            # Headers saved before chunk sets have none, the caller rebuilds the catalog
+            if not header.chunkSet:
+                return HTTPStatus.NOT_FOUND, None, 'Catalog chunk set not found'
+
+            chunk_count = int(header.chunkCount)
+            chunks = {
+                item.rangeKey: item.catalogChunk
+                for item in Entity.query(
+                    EntityConstants.CATALOG_VERSION_HASH_KEY,
+                    Entity.rangeKey.startswith(self.get_chunk_prefix(header.chunkSet)),
+                    consistent_read=True,
+                )
+            }
+
+            chunk_range_keys = [
+                self.get_chunk_range_key(header.chunkSet, index) for index in range(chunk_count)
+            ]
+            if any(range_key not in chunks for range_key in chunk_range_keys):
+                return HTTPStatus.NOT_FOUND, None, 'Catalog chunks not found'
+
+            catalog = self.decode_catalog([chunks[range_key] for range_key in chunk_range_keys])
+            catalog['catalogRevision'] = int(header.catalogRevision)
+            catalog['chunkSet'] = header.chunkSet
+            catalog['chunkCount'] = chunk_count
+            return HTTPStatus.OK, catalog, 'Success'
+
+        except GetError as e:
+            self.logger.error(f'Error getting catalog header: {e}')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, None, str(e)
+
+        except QueryError as e:
+            self.logger.error(f'Error querying catalog: {e}')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, None, str(e)
+
+        except PynamoDBConnectionError as e:
+            self.logger.error(f'Error connecting to DynamoDB: {e}')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, None, str(e)
+
+        except TableDoesNotExist as e:
+            self.logger.error(f'Table does not exist: {e}')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, None, str(e)
+
+    def delete_chunks(self, chunk_set: str, chunk_count: int) -> None:
+        """Delete the chunk items of a chunk set.
+
+        :param chunk_set: The chunk set name
+        :param chunk_count: The number of chunks in the set
+        :type chunk_set: str
+        :type chunk_count: int
+        """
+        with Entity.batch_write() as batch:
+            for chunk_index in range(chunk_count):
+                batch.delete(
+                    Entity(
+                        hashKey=EntityConstants.CATALOG_VERSION_HASH_KEY,
+                        rangeKey=self.get_chunk_range_key(chunk_set, chunk_index),
+                    )
+                )
+
+    def save_catalog(
+        self,
+        document: dict,
+        previous_revision: Optional[int] = None,
+        previous_chunk_set: Optional[str] = None,
+        previous_chunk_count: int = 0,
+    ) -> Tuple[HTTPStatus, str]:
+        """Save the catalog document as a new revision.
+
+        The chunks are written to a new chunk set first, then the header is pointed at it with
+        a single conditional update. The header is only updated if it is still at the previous
+        revision, so concurrent writers cannot overwrite each other. The previous chunk set is
+        deleted once the header has moved, and the new one if the header could not move.
+
+        :param document: The catalog document with the catalogVersion and entities keys, None as
+            the catalogVersion while the entities are not current at any version
+        :param previous_revision: The revision of the catalog read, None if there was none
+        :param previous_chunk_set: The chunk set of the catalog read, None if there was none
+        :param previous_chunk_count: The number of chunks of the catalog read
+        :type document: dict
+        :type previous_revision: Optional[int]
+        :type previous_chunk_set: Optional[str]
+        :type previous_chunk_count: int
+
+        :return: Tuple containing HTTP status and a message
+        :rtype: Tuple[HTTPStatus, str]
+        """
+        catalog_version = document['catalogVersion']
+        chunks = self.encode_catalog(document)
+        hash_key = EntityConstants.CATALOG_VERSION_HASH_KEY
+        revision = (previous_revision or 0) + 1
+        chunk_set = self.new_chunk_set(revision)
+        updated_at = datetime.now(tz=pytz.timezone('Asia/Manila')).isoformat()
+
+        if previous_revision is None:
+            revision_condition = Entity.catalogRevision.does_not_exist()
+        else:
+            revision_condition = Entity.catalogRevision == previous_revision
+
+        try:
+            for group_start in range(0, len(chunks), self.chunks_per_transaction):
+                with TransactWrite(connection=self.conn) as transaction:
+                    for chunk_index in range(
+                        group_start, min(group_start + self.chunks_per_transaction, len(chunks))
+                    ):
+                        transaction.update(
+                            Entity(
+                                hashKey=hash_key,
+                                rangeKey=self.get_chunk_range_key(chunk_set, chunk_index),
+                            ),
+                            actions=[Entity.catalogChunk.set(chunks[chunk_index])],
+                        )
+
+        except TransactWriteError as e:
+            self.logger.error(f'Error writing catalog chunks: {e}')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, str(e)
+
+        except PynamoDBConnectionError as e:
+            self.logger.error(f'Error connecting to DynamoDB: {e}')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, str(e)
+
+        except TableDoesNotExist as e:
+            self.logger.error(f'Table does not exist: {e}')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, str(e)
+
+        try:
+            Entity(hashKey=hash_key, rangeKey=EntityConstants.CATALOG_DOCUMENT_RANGE_KEY).update(
+                actions=[
+                    Entity.catalogVersion.set(catalog_version)
+                    if catalog_version
+                    else Entity.catalogVersion.remove(),
+                    Entity.catalogRevision.set(revision),
+                    Entity.chunkSet.set(chunk_set),
+                    Entity.chunkCount.set(len(chunks)),
+                    Entity.updatedAt.set(updated_at),
+                ],
+                condition=revision_condition,
+            )
+
+        except UpdateError as e:
+            self.logger.error(f'Error moving catalog header to revision {revision}: {e}')
+            try:
+                self.delete_chunks(chunk_set, len(chunks))
+
+            except (PutError, PynamoDBConnectionError) as delete_error:
+                self.logger.warning(f'Error deleting catalog chunk set {chunk_set}: {delete_error}')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, str(e)
+
+        except PynamoDBConnectionError as e:
+            self.logger.error(f'Error connecting to DynamoDB: {e}')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, str(e)
+
+        if previous_chunk_set:
+            try:
+                self.delete_chunks(previous_chunk_set, previous_chunk_count)
+
+            except (PutError, PynamoDBConnectionError) as e:
+                self.logger.warning(f'Error deleting catalog chunk set {previous_chunk_set}: {e}')
+
+        self.logger.info(
+            {
+                'message': 'Saved entity catalog',
+                'entity_count': len(document['entities']),
+                'revision': revision,
+                'chunk_set': chunk_set,
+                'chunk_count': len(chunks),
+                'compressed_bytes': sum(len(chunk) for chunk in chunks),
+            }
+        )
+        return HTTPStatus.OK, 'Success'
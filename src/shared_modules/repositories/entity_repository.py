@@ -1,226 +1,696 @@
 import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 from http import HTTPStatus
-from typing import List, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
+import pytz
 from aws_lambda_powertools import Logger
-from pynamodb.connection import Connection
 from pynamodb.exceptions import (
     GetError,
-    PutError,
     PynamoDBConnectionError,
+    QueryError,
     ScanError,
     TableDoesNotExist,
+    UpdateError,
 )
+from pynamodb.pagination import ResultIterator
+from shared_modules.constants.entity_constants import EntityConstants
 from shared_modules.models.dynamodb.entity import Entity
 from shared_modules.models.schema.entity import EntitySchema
+from shared_modules.repositories.entity_catalog_repository import EntityCatalogRepository
+from shared_modules.utils.entity_assembler import EntityAssembler
+from shared_modules.utils.entity_snapshot_cache import EntitySnapshotCache, entity_snapshot_cache
+from shared_modules.utils.client_registry import client_registry
 
 
 class EntityRepository:
-    def __init__(self) -> None:
-        self.conn = Connection(region=os.getenv('REGION'))
+    # Set once the GSI3PK backfill is seen complete, kept across warm invocations
+    type_index_ready = False
+
+    def __init__(
+        self,
+        scan_segments: Optional[int] = None,
+        snapshot_cache: Optional[EntitySnapshotCache] = None,
+    ) -> None:
+        self.conn = client_registry.get_connection()
+        client_registry.bind_model(Entity)
         self.logger = Logger()
+        self.entity_assembler = EntityAssembler()
+        self.snapshot_cache = snapshot_cache or entity_snapshot_cache
 
-    def get_entity_list(
-        self, entity_type: str = None
-    ) -> Tuple[HTTPStatus, List[EntitySchema], List[Entity], str]:
-        """Get a list of all entities (Entity and/or enablers) using GSI1PK index.
+        # Read snapshots from the stream-maintained catalog document instead of scanning
+        self.use_entity_catalog = os.getenv('ENTITY_CATALOG_ENABLED') == 'true'
+        self.entity_catalog_repository = EntityCatalogRepository()
+        self.batch_get_page_limit = 100
+
+        # Concurrency and UnprocessedKeys retry settings of batch_get_entities
+        self.batch_get_workers = int(os.getenv('ENTITY_BATCH_GET_WORKERS') or 8)
+        self.batch_get_max_retries = 8
+        self.batch_get_base_delay = 0.05
+        self.batch_get_max_delay = 2.0
+
+        # Number of parallel Segment/TotalSegments workers used when scanning the GSI1PK index
+        self.scan_segments = scan_segments or int(os.getenv('ENTITY_SCAN_SEGMENTS') or 1)
+        self.profile_range_keys = set(EntityConstants.PROFILE_ITEM_FIELDS)
+
+    def _get_projection(
+        self, fields: Optional[Iterable[str]] = None
+    ) -> Tuple[Set[str], Optional[List[str]]]:
+        """Get the profile items and attributes to read for the requested fields.
+
+        The METADATA items are always read. Sub-items (CONTACTS, FOUNDERS, etc.) are only read
+        when one of their fields is requested.
+
+        :param fields: Optional list of the entity fields to read, all fields when not provided
+        :type fields: Iterable[str]
+
+        :return: Tuple containing the range keys of the items to read and the attributes to get
+        :rtype: Tuple[Set[str], Optional[List[str]]]
+        """
+        if fields is None:
+            return self.profile_range_keys, None
+
+        requested_fields = set(fields)
+        range_keys = set()
+        attributes_to_get = {'hashKey', 'rangeKey'}
+        for range_key, item_fields in EntityConstants.PROFILE_ITEM_FIELDS.items():
+            item_requested_fields = requested_fields.intersection(item_fields)
+            if item_requested_fields or range_key.endswith('#METADATA'):
+                range_keys.add(range_key)
+                attributes_to_get.update(item_requested_fields)
+
+        return range_keys, sorted(attributes_to_get)
+
+    def _scan_items(
+        self,
+        fields: Optional[Iterable[str]] = None,
+        segment: Optional[int] = None,
+        total_segments: Optional[int] = None,
+        page_size: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Lazily scan the GSI1PK index, reading only the items and attributes needed
+        for the requested fields.
+
+        Items are returned as raw DynamoDB items so they are only deserialized once,
+        by the entity assembler.
+
+        :param fields: Optional list of the entity fields to read, all fields when not provided
+        :param segment: Optional segment to scan
+        :param total_segments: Optional total number of segments the scan is split into
+        :param page_size: Optional number of items to read per scan page
+        :type fields: Iterable[str]
+        :type segment: int
+        :type total_segments: int
+        :type page_size: int
+
+        :return: Iterator of the raw entity items
+        :rtype: Iterator[Dict[str, Any]]
+        """
+        range_keys, attributes_to_get = self._get_projection(fields)
+        filter_condition = (
+            Entity.rangeKey.is_in(*range_keys) if range_keys != self.profile_range_keys else None
+        )
+        return ResultIterator(
+            Entity._get_connection().scan,
+            (),
+            {
+                'filter_condition': filter_condition,
+                'exclusive_start_key': None,
+                'segment': segment,
+                'limit': page_size,
+                'total_segments': total_segments,
+                'index_name': Entity.gsi1_index.Meta.index_name,
+                'attributes_to_get': attributes_to_get,
+            },
+        )
+
+    def _scan_segment(
+        self,
+        segment: int,
+        total_segments: int,
+        page_size: Optional[int] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Dict[str, dict]:
+        """Scan a single segment of the GSI1PK index and merge its profile items by hashKey.
+
+        :param segment: The segment to scan
+        :param total_segments: The total number of segments the scan is split into
+        :param page_size: Optional number of items to read per scan page
+        :param fields: Optional list of the entity fields to read, all fields when not provided
+        :type segment: int
+        :type total_segments: int
+        :type page_size: int
+        :type fields: Iterable[str]
+
+        :return: Map of hashKey to the partial entity data found in the segment
+        :rtype: Dict[str, dict]
+        """
+        entity_map = {}
+        for item in self._scan_items(fields, segment, total_segments, page_size):
+            self.entity_assembler.assemble(entity_map, item)
+
+        return entity_map
+
+    def _iter_parallel_entities(
+        self, page_size: Optional[int] = None, fields: Optional[Iterable[str]] = None
+    ) -> Iterator[EntitySchema]:
+        """Scan the GSI1PK index in parallel segments and yield the merged entities.
+
+        Items for the same hashKey can land in different segments, so an entity is only
+        complete once every segment is done. Segments hold partial entity data, not raw items.
+
+        :param page_size: Optional number of items to read per scan page
+        :param fields: Optional list of the entity fields to read, all fields when not provided
+        :type page_size: int
+        :type fields: Iterable[str]
+
+        :return: Iterator of entity profiles
+        :rtype: Iterator[EntitySchema]
+        """
+        with ThreadPoolExecutor(max_workers=self.scan_segments) as executor:
+            futures = [
+                executor.submit(self._scan_segment, segment, self.scan_segments, page_size, fields)
+                for segment in range(self.scan_segments)
+            ]
+            segment_results = [future.result() for future in futures]
+
+        entity_id_to_entity_map = self._merge_entity_maps(segment_results)
+        while entity_id_to_entity_map:
+            _, entity_data = entity_id_to_entity_map.popitem()
+            yield self.entity_assembler.to_schema(entity_data)
 
+    def _merge_entity_maps(self, entity_maps: List[Dict[str, dict]]) -> Dict[str, dict]:
+        """Merge maps of partial entity data read by separate workers.
+
+        :param entity_maps: Maps of hashKey to partial entity data
+        :type entity_maps: List[Dict[str, dict]]
+
+        :return: Map of hashKey to the merged entity data
+        :rtype: Dict[str, dict]
+        """
+        entity_id_to_entity_map = {}
+        for entity_map in entity_maps:
+            for hash_key, entity_data in entity_map.items():
+                if hash_key in entity_id_to_entity_map:
+                    entity_id_to_entity_map[hash_key] = {
+                        **entity_data,
+                        **entity_id_to_entity_map[hash_key],
+                    }
+                else:
+                    entity_id_to_entity_map[hash_key] = entity_data
+
+        return entity_id_to_entity_map
+
+    def _query_profile_items(
+        self,
+        entity_type: str,
+        range_key: str,
+        page_size: Optional[int] = None,
+        attributes_to_get: Optional[List[str]] = None,
+    ) -> Dict[str, dict]:
+        """Query a single profile item type of an entity type from the GSI3PK index.
+
+        :param entity_type: The entity type partition to query ('STARTUP' or 'ENABLER')
+        :param range_key: The profile item rangeKey to read, e.g. 'STARTUP#METADATA'
+        :param page_size: Optional number of items to read per query page
+        :param attributes_to_get: Optional list of the attributes to read
+        :type entity_type: str
+        :type range_key: str
+        :type page_size: int
+        :type attributes_to_get: List[str]
+
+        :return: Map of hashKey to the partial entity data read
+        :rtype: Dict[str, dict]
+        """
+        items = ResultIterator(
+            Entity._get_connection().query,
+            (entity_type,),
+            {
+                'range_key_condition': Entity.rangeKey == range_key,
+                'index_name': Entity.gsi3_index.Meta.index_name,
+                'exclusive_start_key': None,
+                'limit': page_size,
+                'attributes_to_get': attributes_to_get,
+            },
+        )
+
+        entity_map = {}
+        for item in items:
+            self.entity_assembler.assemble(entity_map, item)
+
+        return entity_map
+
+    def _iter_type_entities(
+        self,
+        entity_type: str,
+        page_size: Optional[int] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Iterator[EntitySchema]:
+        """Query the profile items of a single entity type and yield the merged entities.
+
+        The GSI3PK index only holds profile items, partitioned by entity type and sorted by
+        rangeKey. Each required profile item type is read with its own Query in parallel, so
+        the read cost scales with the number of profiles of the type, not the table size.
+
+        :param entity_type: The entity type to read ('STARTUP' or 'ENABLER')
+        :param page_size: Optional number of items to read per query page
+        :param fields: Optional list of the entity fields to read, all fields when not provided
+        :type entity_type: str
+        :type page_size: int
+        :type fields: Iterable[str]
+
+        :return: Iterator of entity profiles
+        :rtype: Iterator[EntitySchema]
+        """
+        range_keys, attributes_to_get = self._get_projection(fields)
+        type_range_keys = sorted(
+            range_key for range_key in range_keys if range_key.startswith(f'{entity_type}#')
+        )
+
+        with ThreadPoolExecutor(max_workers=len(type_range_keys)) as executor:
+            futures = [
+                executor.submit(
+                    self._query_profile_items,
+                    entity_type,
+                    range_key,
+                    page_size,
+                    attributes_to_get,
+                )
+                for range_key in type_range_keys
+            ]
+            item_type_results = [future.result() for future in futures]
+
+        entity_id_to_entity_map = self._merge_entity_maps(item_type_results)
+        while entity_id_to_entity_map:
+            _, entity_data = entity_id_to_entity_map.popitem()
+            yield self.entity_assembler.to_schema(entity_data)
+
+    def _iter_sequential_entities(
+        self, page_size: Optional[int] = None, fields: Optional[Iterable[str]] = None
+    ) -> Iterator[EntitySchema]:
+        """Scan the GSI1PK index page by page and yield each entity as soon as it is complete.
+
+        Profile items of an entity are written together with the same GSI1PK, so a sequential
+        scan returns them next to each other. An entity is complete once the scan moves on to
+        another hashKey.
+
+        :param page_size: Optional number of items to read per scan page
+        :param fields: Optional list of the entity fields to read, all fields when not provided
+        :type page_size: int
+        :type fields: Iterable[str]
+
+        :return: Iterator of entity profiles
+        :rtype: Iterator[EntitySchema]
+        """
+        entity_map = {}
+        current_entity = None
+
+        for item in self._scan_items(fields, page_size=page_size):
+            if not self.entity_assembler.is_profile_item(item):
+                continue
+
+            if current_entity and item['hashKey']['S'] != current_entity['hashKey']:
+                yield self.entity_assembler.to_schema(entity_map.pop(current_entity['hashKey']))
+
+            current_entity = self.entity_assembler.assemble(entity_map, item)
+
+        if current_entity:
+            yield self.entity_assembler.to_schema(current_entity)
+
+    def iter_entities(
+        self,
+        page_size: Optional[int] = None,
+        fields: Optional[Iterable[str]] = None,
+        entity_type: Optional[str] = None,
+    ) -> Iterator[EntitySchema]:
+        """Lazily yield all entities (startups and/or enablers) using the GSI1PK index.
+
+        Scan pages are pulled on demand, so a sequential scan holds at most one page and
+        one entity in memory. With more than one scan segment configured, the segments
+        are scanned in parallel and merged before the entities are yielded.
+
+        When fields are provided, sub-items without a requested field are skipped and only the
+        requested attributes are read from the remaining items.
+
+        When an entity type is provided, its profile items are queried from the GSI3PK index
+        instead of scanning the GSI1PK index. Until the GSI3PK backfill migration has completed,
+        the index misses older profiles, so the GSI1PK scan is filtered by type instead.
+
+        :param page_size: Optional number of items to read per scan page
+        :param fields: Optional list of the entity fields to read, all fields when not provided
         :param entity_type: Optional filter for entity type ('STARTUP' or 'ENABLER')
+        :type page_size: int
+        :type fields: Iterable[str]
         :type entity_type: str
 
-        :return: Tuple containing HTTP status, list of entity profiles, and a message
-        :rtype: Tuple[HTTPStatus, List[EntitySchema], str]
+        :return: Iterator of entity profiles
+        :rtype: Iterator[EntitySchema]
         """
         try:
-            entities = Entity.gsi1_index.scan()
-            entity_list = list(entities)
-            processed_entities = []
-            current_entity = None
-            current_entity_id = None
-
-            # Process items sequentially, assuming related items are adjacent
-            for entity in entity_list:
-                hash_key = entity.hashKey
-                entity_type = hash_key.split('#')[0]
-                entity_id = hash_key.split('#')[1]
-                range_key = entity.rangeKey
-                entity_dict = entity.to_simple_dict()
-
-                # If this is a new entity, create a new entity object
-                if entity_id != current_entity_id:
-                    if current_entity:
-                        entity_schema = EntitySchema(**current_entity)
-                        processed_entities.append(entity_schema)
-
-                    current_entity = {
-                        'startupId' if entity_type == 'STARTUP' else 'enablerId': entity_id,
-                        '__typename': 'Startup' if entity_type == 'STARTUP' else 'Enabler',
-                        'hashKey': hash_key,
-                        'rangeKey': range_key,
-                    }
-                    current_entity_id = entity_id
-
-                # Add item data based on rangeKey and entity type
-                if entity_type == 'STARTUP':
-                    if range_key == 'STARTUP#METADATA':
-                        current_entity.update(
-                            {
-                                'startUpName': entity.startUpName,
-                                'email': entity.email,
-                                'logoObjectKey': entity.logoObjectKey,
-                                'dateFounded': entity.dateFounded,
-                                'startupStage': entity.startupStage,
-                                'description': entity.description,
-                                'location': entity_dict.get('location'),
-                                'revenueModel': entity.revenueModel,
-                                'createdAt': entity.createdAt,
-                                'industries': entity.industries,
-                                'forSuggestionGeneration': entity.forSuggestionGeneration,
-                            }
-                        )
-                    elif range_key == 'STARTUP#CONTACTS':
-                        current_entity['contacts'] = entity_dict['contacts']
-
-                    elif range_key == 'STARTUP#MILESTONES':
-                        current_entity['milestones'] = entity_dict['milestones']
-
-                    elif range_key == 'STARTUP#FOUNDERS':
-                        current_entity['founders'] = entity_dict['founders']
-
-                elif entity_type == 'ENABLER':
-                    if range_key == 'ENABLER#METADATA':
-                        current_entity.update(
-                            {
-                                'enablerName': entity.enablerName,
-                                'email': entity.email,
-                                'logoObjectKey': entity.logoObjectKey,
-                                'dateFounded': entity.dateFounded,
-                                'organizationType': entity.organizationType,
-                                'description': entity.description,
-                                'location': entity_dict.get('location'),
-                                'industryFocus': entity.industryFocus,
-                                'supportType': entity.supportType,
-                                'fundingStageFocus': entity.fundingStageFocus,
-                                'investmentAmount': entity.investmentAmount,
-                                'startupStagePreference': entity.startupStagePreference,
-                                'preferredBusinessModels': entity.preferredBusinessModels,
-                                'forSuggestionGeneration': entity.forSuggestionGeneration,
-                            }
-                        )
-
-                    elif range_key == 'ENABLER#CONTACTS':
-                        current_entity['contacts'] = entity_dict['contacts']
-
-                    elif range_key == 'ENABLER#INVESTMENT_CRITERIA':
-                        current_entity['investmentCriteria'] = entity_dict['investmentCriteria']
-
-                    elif range_key == 'ENABLER#PORTFOLIO':
-                        current_entity['portfolio'] = entity_dict['portfolio']
-
-            if current_entity:
-                entity_schema = EntitySchema(**current_entity)
-                processed_entities.append(entity_schema)
-
-            return HTTPStatus.OK, processed_entities, entity_list, 'Success'
+            if entity_type and self.is_type_index_ready():
+                yield from self._iter_type_entities(entity_type, page_size, fields)
+                return
+
+            if self.scan_segments > 1:
+                entities = self._iter_parallel_entities(page_size, fields)
+            else:
+                entities = self._iter_sequential_entities(page_size, fields)
+            for entity in entities:
+                if not entity_type or entity.hashKey.startswith(f'{entity_type}#'):
+                    yield entity
 
         except ScanError as e:
             self.logger.error(f'Error scanning DynamoDB: {e}')
-            return HTTPStatus.INTERNAL_SERVER_ERROR, [], [], str(e)
+            raise e
+
+        except QueryError as e:
+            self.logger.error(f'Error querying DynamoDB: {e}')
+            raise e
 
         except PynamoDBConnectionError as e:
             self.logger.error(f'Error connecting to DynamoDB: {e}')
-            return HTTPStatus.INTERNAL_SERVER_ERROR, [], [], str(e)
+            raise e
 
         except TableDoesNotExist as e:
             self.logger.error(f'Table does not exist: {e}')
-            return HTTPStatus.INTERNAL_SERVER_ERROR, [], [], str(e)
+            raise e
+
+    def is_type_index_ready(self) -> bool:
+        """Check if the GSI3PK backfill migration has completed, so the index holds every profile.
+
+        :return: True if the GSI3PK index can be queried by entity type
+        :rtype: bool
+        """
+        if EntityRepository.type_index_ready:
+            return True
+
+        try:
+            Entity.get(
+                EntityConstants.MIGRATION_HASH_KEY,
+                EntityConstants.GSI3PK_BACKFILL_RANGE_KEY,
+                attributes_to_get=['hashKey'],
+            )
+
+        except Entity.DoesNotExist:
+            self.logger.info('GSI3PK backfill not complete, scanning the GSI1PK index')
+            return False
+
+        except (GetError, PynamoDBConnectionError) as e:
+            self.logger.warning(f'Error getting GSI3PK backfill marker, scanning instead: {e}')
+            return False
+
+        EntityRepository.type_index_ready = True
+        return True
+
+    def backfill_type_index(self) -> int:
+        """Set GSI3PK on the profile items written before it existed and mark the backfill
+        complete.
+
+        The scan is strongly consistent and profiles created since carry GSI3PK already, so once
+        the marker is written the GSI3PK index holds every profile. Items deleted during the
+        backfill are skipped rather than recreated.
+
+        :return: The number of profile items updated
+        :rtype: int
+        """
+        items = Entity.scan(
+            filter_condition=Entity.rangeKey.is_in(*self.profile_range_keys)
+            & Entity.GSI3PK.does_not_exist(),
+            attributes_to_get=['hashKey', 'rangeKey'],
+            consistent_read=True,
+        )
+
+        updated_count = 0
+        for item in items:
+            try:
+                item.update(
+                    actions=[Entity.GSI3PK.set(item.hashKey.split('#')[0])],
+                    condition=Entity.hashKey.exists() & Entity.GSI3PK.does_not_exist(),
+                )
+                updated_count += 1
+
+            except UpdateError as e:
+                if e.cause_response_code != 'ConditionalCheckFailedException':
+                    raise e
+
+        Entity(
+            hashKey=EntityConstants.MIGRATION_HASH_KEY,
+            rangeKey=EntityConstants.GSI3PK_BACKFILL_RANGE_KEY,
+        ).update(
+            actions=[
+                Entity.updatedAt.set(datetime.now(tz=pytz.timezone('Asia/Manila')).isoformat())
+            ]
+        )
+        EntityRepository.type_index_ready = True
+
+        self.logger.info({'message': 'Backfilled GSI3PK', 'updated_count': updated_count})
+        return updated_count
+
+    def get_entity_list(
+        self, entity_type: Optional[str] = None, fields: Optional[Iterable[str]] = None
+    ) -> Tuple[HTTPStatus, List[EntitySchema], str]:
+        """Get a list of all entities (Entity and/or enablers) using GSI1PK index, or the
+        entities of a single type using GSI3PK index.
+
+        :param entity_type: Optional filter for entity type ('STARTUP' or 'ENABLER')
+        :param fields: Optional list of the entity fields to read, all fields when not provided
+        :type entity_type: str
+        :type fields: Iterable[str]
+
+        :return: Tuple containing HTTP status, list of entity profiles, and a message
+        :rtype: Tuple[HTTPStatus, List[EntitySchema], str]
+        """
+        try:
+            entities = list(self.iter_entities(fields=fields, entity_type=entity_type))
+            return HTTPStatus.OK, entities, 'Success'
+
+        except (ScanError, QueryError, PynamoDBConnectionError, TableDoesNotExist) as e:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, [], str(e)
+
+    def get_catalog_version(self) -> Optional[str]:
+        """Get the current entity catalog version with a single strongly consistent read.
+
+        The version is changed by every startup and enabler mutation.
+
+        :return: The catalog version, None if it has not been written yet
+        :rtype: Optional[str]
+        """
+        try:
+            catalog = Entity.get(
+                EntityConstants.CATALOG_VERSION_HASH_KEY,
+                EntityConstants.CATALOG_VERSION_RANGE_KEY,
+                consistent_read=True,
+                attributes_to_get=['catalogVersion'],
+            )
+            return catalog.catalogVersion
+
+        except Entity.DoesNotExist:
+            return None
+
+    def _get_catalog_entities(self, catalog_version: Optional[str]) -> Optional[List[EntitySchema]]:
+        """Get all entities from the stream-maintained catalog document if it has caught up
+        with the given catalog version.
+
+        The stream processor only stamps the catalog with a version once it has applied the
+        METADATA record of every write up to that version, so a matching version means no
+        write is missing. The catalog holds every field, so it serves any field projection.
+
+        :param catalog_version: The current catalog version
+        :type catalog_version: Optional[str]
+
+        :return: List of entity profiles, None if the catalog is disabled, missing or behind
+        :rtype: Optional[List[EntitySchema]]
+        """
+        if not self.use_entity_catalog or catalog_version is None:
+            return None
+
+        status, catalog, _ = self.entity_catalog_repository.get_catalog()
+        if status != HTTPStatus.OK or catalog['catalogVersion'] != catalog_version:
+            self.logger.info({'message': 'Entity catalog unavailable or behind', 'status': status})
+            return None
+
+        return [
+            self.entity_assembler.to_schema(entity_data)
+            for entity_data in catalog['entities'].values()
+        ]
+
+    def get_entity_snapshot(self, fields: Optional[Iterable[str]] = None) -> List[EntitySchema]:
+        """Get all entities from the warm-container snapshot cache, scanning only when the
+        snapshot is missing, older than the TTL or read at an older catalog version.
+
+        On a miss, the stream-maintained catalog document is used when enabled and current,
+        otherwise the entities are scanned. The scan reads eventually consistent indexes, so
+        it can miss a write committed before the catalog version was read. A scanned snapshot
+        is therefore only cached if the catalog version did not move during the scan, and only
+        for the shorter scan TTL, which bounds how long a missed write can be served.
+
+        This is for callers that need every entity at once, like the chat ranker and the
+        suggestion prompts. The list is kept across warm invocations, so it is built once per
+        catalog version. Callers that handle one entity at a time, like the catalog rebuild,
+        should stream iter_entities instead.
+
+        :param fields: Optional list of the entity fields to read, all fields when not provided
+        :type fields: Iterable[str]
+
+        :return: List of entity profiles
+        :rtype: List[EntitySchema]
+        """
+        try:
+            catalog_version = self.get_catalog_version()
+
+        except (GetError, PynamoDBConnectionError, TableDoesNotExist) as e:
+            self.logger.warning(f'Error getting catalog version, skipping snapshot cache: {e}')
+            return list(self.iter_entities(fields=fields))
+
+        entities = self.snapshot_cache.get(catalog_version, fields)
+        if entities is not None:
+            self.logger.info({'message': 'Entity snapshot cache hit', 'count': len(entities)})
+            return entities
+
+        entities = self._get_catalog_entities(catalog_version)
+        if entities is not None:
+            self.snapshot_cache.put(catalog_version, entities, fields)
+            self.logger.info({'message': 'Entity snapshot cache miss', 'count': len(entities)})
+            return entities
+
+        entities = list(self.iter_entities(fields=fields))
+        try:
+            is_version_unchanged = self.get_catalog_version() == catalog_version
+
+        except (GetError, PynamoDBConnectionError, TableDoesNotExist) as e:
+            self.logger.warning(f'Error getting catalog version, skipping snapshot cache: {e}')
+            is_version_unchanged = False
+
+        if is_version_unchanged:
+            self.snapshot_cache.put(
+                catalog_version, entities, fields, ttl_seconds=self.snapshot_cache.scan_ttl_seconds
+            )
+        self.logger.info(
+            {
+                'message': 'Entity snapshot cache miss',
+                'count': len(entities),
+                'is_cached': is_version_unchanged,
+            }
+        )
+        return entities
+
+    def _batch_get_page(
+        self, keys_to_get: List[dict], attributes_to_get: Optional[List[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], List[dict]]:
+        """Read a single BatchGetItem page of at most 100 keys.
+
+        :param keys_to_get: The serialized keys of the items to read
+        :param attributes_to_get: Optional list of the attributes to read
+        :type keys_to_get: List[dict]
+        :type attributes_to_get: List[str]
+
+        :return: Tuple containing the raw items read and the unprocessed keys
+        :rtype: Tuple[List[Dict[str, Any]], List[dict]]
+        """
+        table_name = Entity.Meta.table_name
+        data = Entity._get_connection().batch_get_item(
+            keys_to_get, attributes_to_get=attributes_to_get
+        )
+        items = data.get('Responses', {}).get(table_name, [])
+        unprocessed_keys = data.get('UnprocessedKeys', {}).get(table_name, {}).get('Keys', [])
+        return items, unprocessed_keys
+
+    def _batch_get_chunk(
+        self, keys_to_get: List[dict], attributes_to_get: Optional[List[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Read a chunk of at most 100 keys, retrying UnprocessedKeys with full-jitter
+        exponential backoff.
+
+        :param keys_to_get: The serialized keys of the items to read
+        :param attributes_to_get: Optional list of the attributes to read
+        :type keys_to_get: List[dict]
+        :type attributes_to_get: List[str]
+
+        :return: Tuple containing the raw items read and the number of retries made
+        :rtype: Tuple[List[Dict[str, Any]], int]
+        """
+        items, unprocessed_keys = self._batch_get_page(keys_to_get, attributes_to_get)
+        retries = 0
+        while unprocessed_keys:
+            if retries >= self.batch_get_max_retries:
+                raise GetError(
+                    f'{len(unprocessed_keys)} keys still unprocessed after {retries} retries'
+                )
+
+            delay = min(self.batch_get_max_delay, self.batch_get_base_delay * 2**retries)
+            time.sleep(random.uniform(0, delay))
+            retries += 1
+
+            page_items, unprocessed_keys = self._batch_get_page(unprocessed_keys, attributes_to_get)
+            items.extend(page_items)
+
+        return items, retries
 
     def batch_get_entities(
-        self, item_keys: List[Tuple[str, str]]
+        self, item_keys: List[Tuple[str, str]], fields: Optional[Iterable[str]] = None
     ) -> Tuple[HTTPStatus, List[EntitySchema], str]:
         """Get a list of all entities (Entity and/or enablers)
 
+        Keys are split into 100-key BatchGetItem chunks that are fetched concurrently on a
+        bounded thread pool. When fields are provided, keys of sub-items without a requested
+        field are skipped and only the requested attributes are read from the remaining items.
+
         :param item_keys: List of Tuples of Hash Key and Range Key
+        :param fields: Optional list of the entity fields to read, all fields when not provided
         :type item_keys: List[Tuple[str, str]]
+        :type fields: Iterable[str]
 
         :return: Tuple containing HTTP status, list of entity profiles, and a message
         :rtype: Tuple[HTTPStatus, List[EntitySchema], str]
         """
         try:
-            entities: List[Entity] = Entity.batch_get(item_keys)
-            processed_entities = []
-            entity_id_to_entity_map = {}
+            range_keys, attributes_to_get = self._get_projection(fields)
+            keys_to_get = [
+                {'hashKey': {'S': hash_key}, 'rangeKey': {'S': range_key}}
+                for hash_key, range_key in set(item_keys)
+                if range_key in range_keys
+            ]
 
-            # Process all entities, regardless of order
-            for entity in entities:
-                hash_key = entity.hashKey
-                entity_type = hash_key.split('#')[0]
-                entity_id = hash_key.split('#')[1]
-                range_key = entity.rangeKey
-                entity_dict = entity.to_simple_dict()
-
-                # Get or create entity object from map
-                if entity_id not in entity_id_to_entity_map:
-                    entity_id_to_entity_map[entity_id] = {
-                        'startupId' if entity_type == 'STARTUP' else 'enablerId': entity_id,
-                        '__typename': 'Startup' if entity_type == 'STARTUP' else 'Enabler',
-                    }
+            chunks = [
+                keys_to_get[chunk_start : chunk_start + self.batch_get_page_limit]
+                for chunk_start in range(0, len(keys_to_get), self.batch_get_page_limit)
+            ]
 
-                current_entity = entity_id_to_entity_map[entity_id]
-
-                # Add item data based on rangeKey and entity type
-                if entity_type == 'STARTUP':
-                    if range_key == 'STARTUP#METADATA':
-                        current_entity.update(
-                            {
-                                'startUpName': entity.startUpName,
-                                'email': entity.email,
-                                'logoObjectKey': entity.logoObjectKey,
-                                'dateFounded': entity.dateFounded,
-                                'startupStage': entity.startupStage,
-                                'description': entity.description,
-                                'location': entity_dict.get('location'),
-                                'revenueModel': entity.revenueModel,
-                                'createdAt': entity.createdAt,
-                                'industries': entity.industries,
-                            }
-                        )
-                    elif range_key == 'STARTUP#CONTACTS':
-                        current_entity['contacts'] = entity_dict['contacts']
-                    elif range_key == 'STARTUP#MILESTONES':
-                        current_entity['milestones'] = entity_dict['milestones']
-                    elif range_key == 'STARTUP#FOUNDERS':
-                        current_entity['founders'] = entity_dict['founders']
-
-                elif entity_type == 'ENABLER':
-                    if range_key == 'ENABLER#METADATA':
-                        current_entity.update(
-                            {
-                                'enablerName': entity.enablerName,
-                                'email': entity.email,
-                                'logoObjectKey': entity.logoObjectKey,
-                                'dateFounded': entity.dateFounded,
-                                'organizationType': entity.organizationType,
-                                'description': entity.description,
-                                'location': entity_dict.get('location'),
-                                'industryFocus': entity.industryFocus,
-                                'supportType': entity.supportType,
-                                'fundingStageFocus': entity.fundingStageFocus,
-                                'investmentAmount': entity.investmentAmount,
-                                'startupStagePreference': entity.startupStagePreference,
-                                'preferredBusinessModels': entity.preferredBusinessModels,
-                            }
-                        )
-                    elif range_key == 'ENABLER#CONTACTS':
-                        current_entity['contacts'] = entity_dict['contacts']
-                    elif range_key == 'ENABLER#INVESTMENT_CRITERIA':
-                        current_entity['investmentCriteria'] = entity_dict['investmentCriteria']
-                    elif range_key == 'ENABLER#PORTFOLIO':
-                        current_entity['portfolio'] = entity_dict['portfolio']
+            # Fetch all chunks in one parallel round-trip and process items, regardless of order
+            start_time = time.perf_counter()
+            total_retries = 0
+            entity_id_to_entity_map = {}
+            if chunks:
+                with ThreadPoolExecutor(
+                    max_workers=min(len(chunks), self.batch_get_workers)
+                ) as executor:
+                    futures = [
+                        executor.submit(self._batch_get_chunk, chunk, attributes_to_get)
+                        for chunk in chunks
+                    ]
+                    for future in as_completed(futures):
+                        items, retries = future.result()
+                        total_retries += retries
+                        for item in items:
+                            self.entity_assembler.assemble(entity_id_to_entity_map, item)
+
+            self.logger.info(
+                {
+                    'message': 'Batch get entities completed',
+                    'key_count': len(keys_to_get),
+                    'chunk_count': len(chunks),
+                    'retry_count': total_retries,
+                    'latency_ms': round((time.perf_counter() - start_time) * 1000, 2),
+                }
+            )
 
             # Convert all entities in the map to EntitySchema objects
             processed_entities = [
-                EntitySchema(**entity_data) for entity_data in entity_id_to_entity_map.values()
+                self.entity_assembler.to_schema(entity_data)
+                for entity_data in entity_id_to_entity_map.values()
             ]
 
             return HTTPStatus.OK, processed_entities, 'Success'
@@ -237,32 +707,172 @@ class EntityRepository:
             self.logger.error(f'Table does not exist: {e}')
             return HTTPStatus.INTERNAL_SERVER_ERROR, [], str(e)
 
+    def get_pending_suggestion_entities(self) -> Tuple[HTTPStatus, Dict[str, Optional[str]], str]:
+        """Get the entities flagged for suggestion generation from the sparse GSI4PK index.
+
+        :return: Tuple containing HTTP status, a map of entity hashKey to its METADATA updatedAt,
+            and a message
+        :rtype: Tuple[HTTPStatus, Dict[str, Optional[str]], str]
+        """
+        try:
+            pending_entities = {
+                item.hashKey: item.updatedAt
+                for item in Entity.gsi4_index.query(EntityConstants.PENDING_SUGGESTION_GSI4PK)
+            }
+            return HTTPStatus.OK, pending_entities, 'Success'
+
+        except QueryError as e:
+            self.logger.error(f'Error querying pending suggestion entities: {e}')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {}, str(e)
+
+        except PynamoDBConnectionError as e:
+            self.logger.error(f'Error connecting to DynamoDB: {e}')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {}, str(e)
+
+        except TableDoesNotExist as e:
+            self.logger.error(f'Table does not exist: {e}')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {}, str(e)
+
+    def get_suggestion_fingerprints(
+        self, entity_hash_keys: List[str]
+    ) -> Tuple[HTTPStatus, Dict[str, Optional[str]], str]:
+        """Get the fingerprint of the matching fields each entity last got suggestions for.
+
+        :param entity_hash_keys: The hash keys of the entities
+        :type entity_hash_keys: List[str]
+
+        :return: Tuple containing HTTP status, a map of entity hashKey to its fingerprint, and a
+            message
+        :rtype: Tuple[HTTPStatus, Dict[str, Optional[str]], str]
+        """
+        try:
+            item_keys = [
+                (hash_key, f'{hash_key.split("#")[0]}#METADATA') for hash_key in entity_hash_keys
+            ]
+            fingerprints = {
+                item.hashKey: item.suggestionFingerprint
+                for item in Entity.batch_get(
+                    item_keys, attributes_to_get=['hashKey', 'suggestionFingerprint']
+                )
+            }
+            return HTTPStatus.OK, fingerprints, 'Success'
+
+        except GetError as e:
+            self.logger.error(f'Error getting suggestion fingerprints: {e}')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {}, str(e)
+
+        except PynamoDBConnectionError as e:
+            self.logger.error(f'Error connecting to DynamoDB: {e}')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {}, str(e)
+
+        except TableDoesNotExist as e:
+            self.logger.error(f'Table does not exist: {e}')
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {}, str(e)
+
+    def _update_suggestion_flag(
+        self, hash_key: str, actions: list, expected_updated_at: Optional[str] = None
+    ) -> bool:
+        """Update the suggestion generation attributes of one METADATA item.
+
+        :param hash_key: The hash key of the entity
+        :param actions: The update actions
+        :param expected_updated_at: Optional updatedAt the entity must still be at
+        :type hash_key: str
+        :type actions: list
+        :type expected_updated_at: Optional[str]
+
+        :return: True if the item was updated, False if it was edited since it was read
+        :rtype: bool
+        """
+        entity_type = hash_key.split('#')[0]
+        entity = Entity(hashKey=hash_key, rangeKey=f'{entity_type}#METADATA')
+
+        condition = Entity.hashKey.exists()
+        if expected_updated_at:
+            condition &= Entity.updatedAt == expected_updated_at
+
+        try:
+            entity.update(actions=actions, condition=condition)
+            return True
+
+        except UpdateError as e:
+            if e.cause_response_code != 'ConditionalCheckFailedException':
+                raise e
+            return False
+
     def update_entity_for_suggestion_generation(
-        self, entity_list: List[Entity], update_value: bool
+        self,
+        entity_hash_keys: List[str],
+        update_value: bool,
+        expected_updated_at: Optional[Dict[str, Optional[str]]] = None,
+        fingerprints: Optional[Dict[str, str]] = None,
     ) -> Tuple[HTTPStatus, str]:
         """Update the entity for suggestion generation.
 
-        :param entity_list: The list of entities to update
+        Each METADATA item gets a narrow conditional UpdateItem of the forSuggestionGeneration
+        flag and its sparse GSI4PK index key, run concurrently on the batch get workers. When
+        the updatedAt read with the pending entities is given, entities edited since are
+        skipped so they stay pending. Given fingerprints are stored in the same update.
+
+        The catalog version is not bumped. The flags are bookkeeping of suggestion generation,
+        which reads pending entities from the GSI4PK index, so cached entity snapshots keep
+        serving until a profile edit changes the version.
+
+        :param entity_hash_keys: The hash keys of the entities to update
         :param update_value: The value to update the entity for suggestion generation to
-        :type entity_list: List[Entity]
+        :param expected_updated_at: Optional map of hashKey to the updatedAt the entity was read at
+        :param fingerprints: Optional map of hashKey to the fingerprint of its matching fields
+        :type entity_hash_keys: List[str]
         :type update_value: bool
+        :type expected_updated_at: Dict[str, Optional[str]]
+        :type fingerprints: Dict[str, str]
 
         :return: Tuple containing HTTP status and a message
         :rtype: Tuple[HTTPStatus, str]
         """
-        try:
-            self.logger.info(f'Updating entity for suggestion generation: {entity_list}')
-            with Entity.batch_write() as batch:
-                for entity in entity_list:
-                    if 'METADATA' not in entity.rangeKey:
-                        continue
+        expected_updated_at = expected_updated_at or {}
+        fingerprints = fingerprints or {}
+        if update_value:
+            actions = [
+                Entity.forSuggestionGeneration.set(True),
+                Entity.GSI4PK.set(EntityConstants.PENDING_SUGGESTION_GSI4PK),
+            ]
+        else:
+            actions = [Entity.forSuggestionGeneration.set(False), Entity.GSI4PK.remove()]
 
-                    entity.forSuggestionGeneration = update_value
-                    batch.save(entity)
+        try:
+            self.logger.info(f'Updating entity for suggestion generation: {entity_hash_keys}')
+            skipped_hash_keys = []
+            if entity_hash_keys:
+                with ThreadPoolExecutor(
+                    max_workers=min(len(entity_hash_keys), self.batch_get_workers)
+                ) as executor:
+                    futures = {
+                        executor.submit(
+                            self._update_suggestion_flag,
+                            hash_key,
+                            actions + [Entity.suggestionFingerprint.set(fingerprints[hash_key])]
+                            if fingerprints.get(hash_key)
+                            else actions,
+                            expected_updated_at.get(hash_key),
+                        ): hash_key
+                        for hash_key in entity_hash_keys
+                    }
+                    for future in as_completed(futures):
+                        if not future.result():
+                            skipped_hash_keys.append(futures[future])
+
+            if skipped_hash_keys:
+                self.logger.info(
+                    {
+                        'message': 'Skipped entities edited during suggestion generation',
+                        'skipped_hash_keys': skipped_hash_keys,
+                    }
+                )
 
             return HTTPStatus.OK, 'Success'
 
-        except PutError as e:
+        except UpdateError as e:
             self.logger.error(f'Error updating entity for suggestion generation: {e}')
             return HTTPStatus.INTERNAL_SERVER_ERROR, str(e)
 
@@ -1,17 +1,17 @@
-import os
 from http import HTTPStatus
 from typing import List, Tuple
 
 from aws_lambda_powertools import Logger
-from pynamodb.connection import Connection
 from pynamodb.exceptions import PynamoDBConnectionError, QueryError, TableDoesNotExist
 from shared_modules.constants.entity_constants import EntityType
 from shared_modules.models.dynamodb.entity import Entity
+from shared_modules.utils.client_registry import client_registry
 
 
 class ProfilesRepository:
     def __init__(self):
-        self.conn = Connection(region=os.getenv('REGION'))
+        self.conn = client_registry.get_connection()
+        client_registry.bind_model(Entity)
         self.logger = Logger()
         self.range_key_discriminator = 'SAVED_PROFILE'
 
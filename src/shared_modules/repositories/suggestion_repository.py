@@ -1,25 +1,28 @@
-import os
 from datetime import datetime
 from http import HTTPStatus
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 from uuid import uuid4
 
 import pytz
 from aws_lambda_powertools import Logger
-from pynamodb.connection import Connection
-from pynamodb.exceptions import PynamoDBConnectionError, QueryError, TableDoesNotExist
+from pynamodb.exceptions import GetError, PynamoDBConnectionError, QueryError, TableDoesNotExist
 from shared_modules.constants.entity_constants import EntityType
 from shared_modules.models.dynamodb.entity import Entity
 from shared_modules.models.dynamodb.suggestions import Suggestions
 from shared_modules.models.schema.suggestions import SuggestionMatchList
+from shared_modules.utils.client_registry import client_registry
 
 
 class SuggestionRepository:
     def __init__(self):
-        self.conn = Connection(region=os.getenv('REGION'))
+        self.conn = client_registry.get_connection()
+        client_registry.bind_model(Entity)
+        client_registry.bind_model(Suggestions)
         self.logger = Logger()
         self.suggestion_discriminator = 'SUGGESTION'
         self.saved_profile_discriminator = 'SAVED_PROFILE'
+        # Certainties equal at this many decimals count as unchanged
+        self.certainty_precision = 2
 
     def get_suggestions(
         self, entity_type: EntityType, entity_id: str
@@ -66,51 +69,114 @@ class SuggestionRepository:
             self.logger.error(error_msg)
             return HTTPStatus.INTERNAL_SERVER_ERROR, None, None, error_msg
 
+    def get_stored_suggestions(
+        self, item_keys: List[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], Suggestions]:
+        """
+        Get the stored suggestion items with the given keys.
+
+        Args:
+            item_keys (List[Tuple[str, str]]): The hash and range keys of the suggestions
+
+        Returns:
+            Dict[Tuple[str, str], Suggestions]: The stored suggestions keyed by hash and range key
+        """
+        return {
+            (suggestion.hashKey, suggestion.rangeKey): suggestion
+            for suggestion in Suggestions.batch_get(item_keys)
+        }
+
+    def is_unchanged(self, stored: Optional[Suggestions], suggestion: Suggestions) -> bool:
+        """
+        Check if a stored suggestion already holds the same pair, certainty and rationale.
+
+        A missing certainty on either side counts as changed, so the suggestion is rewritten.
+        Rationales are compared with their whitespace collapsed.
+
+        Args:
+            stored (Optional[Suggestions]): The stored suggestion, None if there is none
+            suggestion (Suggestions): The newly generated suggestion
+        """
+        if stored is None or stored.certainty is None or suggestion.certainty is None:
+            return False
+
+        return (
+            stored.matchPairName == suggestion.matchPairName
+            and round(stored.certainty, self.certainty_precision)
+            == round(suggestion.certainty, self.certainty_precision)
+            and ' '.join((stored.rationale or '').split())
+            == ' '.join((suggestion.rationale or '').split())
+        )
+
     def save_suggestions(self, suggestion_list: SuggestionMatchList) -> Tuple[HTTPStatus, str]:
         """
         Save suggestion matches using batch write operation.
 
+        Suggestions are compared with the stored ones first. Pairs whose certainty and
+        rationale have not changed are skipped, and pairs that are rewritten keep their
+        suggestionId and createdAt.
+
         Args:
             suggestion_list (SuggestionMatchList): List of suggestion matches to save
         """
         try:
-            # Track unique suggestion keys to prevent duplicates
-            unique_suggestions = set()
-
+            current_date = datetime.now(tz=pytz.timezone('Asia/Manila')).isoformat()
+
+            # One suggestion per entity in each pair, the first match of a pair wins
+            suggestions: Dict[Tuple[str, str], Suggestions] = {}
+            for match in suggestion_list.matches:
+                for i, entity in enumerate(match.matchPair):
+                    other_entity = match.matchPair[1 - i]  # Get the other entity in the pair
+                    match_pair_id = f'{other_entity.entityType}#{other_entity.entityId}'
+                    item_key = (
+                        f'{entity.entityType}#{entity.entityId}',
+                        f'{entity.entityType}#SUGGESTION#{match_pair_id}',
+                    )
+                    if item_key in suggestions:
+                        continue
+
+                    suggestions[item_key] = Suggestions(
+                        hashKey=item_key[0],
+                        rangeKey=item_key[1],
+                        suggestionId=str(uuid4()),
+                        matchPairId=match_pair_id,
+                        matchPairName=other_entity.name,
+                        matchPairType=other_entity.entityType,
+                        certainty=match.certainty,
+                        rationale=match.rationale,
+                        createdAt=current_date,
+                    )
+
+            stored_suggestions = self.get_stored_suggestions(list(suggestions))
+            written_count = 0
             with Suggestions.batch_write() as batch:
-                for match in suggestion_list.matches:
-                    # Create two suggestions (one for each entity in the pair)
-                    for i, entity in enumerate(match.matchPair):
-                        other_entity = match.matchPair[1 - i]  # Get the other entity in the pair
-
-                        # Create a unique key for this suggestion pair
-                        suggestion_key = f'{entity.entityType}#{entity.entityId}#{other_entity.entityType}#{other_entity.entityId}'
-
-                        # Skip if we've already processed this pair
-                        if suggestion_key in unique_suggestions:
-                            continue
-
-                        unique_suggestions.add(suggestion_key)
-
-                        suggestion_id = str(uuid4())
-                        current_date = datetime.now(tz=pytz.timezone('Asia/Manila')).isoformat()
-                        match_pair_id = f'{other_entity.entityType}#{other_entity.entityId}'
-
-                        suggestion = Suggestions(
-                            hashKey=f'{entity.entityType}#{entity.entityId}',
-                            rangeKey=f'{entity.entityType}#SUGGESTION#{match_pair_id}',
-                            suggestionId=suggestion_id,
-                            matchPairId=match_pair_id,
-                            matchPairName=other_entity.name,
-                            matchPairType=other_entity.entityType,
-                            certainty=match.certainty,
-                            rationale=match.rationale,
-                            createdAt=current_date,
-                        )
-                        batch.save(suggestion)
-
+                for item_key, suggestion in suggestions.items():
+                    stored = stored_suggestions.get(item_key)
+                    if self.is_unchanged(stored, suggestion):
+                        continue
+
+                    if stored is not None:
+                        suggestion.suggestionId = stored.suggestionId
+                        suggestion.createdAt = stored.createdAt
+                        suggestion.updatedAt = current_date
+                    batch.save(suggestion)
+                    written_count += 1
+
+            self.logger.info(
+                {
+                    'message': 'Saved changed suggestions',
+                    'suggestion_count': len(suggestions),
+                    'written_count': written_count,
+                    'unchanged_count': len(suggestions) - written_count,
+                }
+            )
             return HTTPStatus.OK, 'Suggestions saved successfully'
 
+        except GetError as e:
+            error_msg = f'Failed to read stored suggestions: {str(e)}'
+            self.logger.error(error_msg)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, error_msg
+
         except (PynamoDBConnectionError, TableDoesNotExist) as e:
             error_msg = f'Failed to save suggestions: {str(e)}'
             self.logger.error(error_msg)
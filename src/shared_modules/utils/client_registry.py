@@ -0,0 +1,183 @@
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple, Type
+
+import botocore.session
+from aws_lambda_powertools import Logger
+from botocore.config import Config
+from pynamodb.connection import Connection
+from pynamodb.models import Model
+
+
+class ClientRegistry:
+    """
+    Process-wide registry of pooled botocore clients and the pynamodb connection settings
+
+    Botocore clients are created from a single botocore session, once per service, region and
+    endpoint, so connection pools and TLS sessions are reused across usecases and warm
+    invocations.
+
+    DynamoDB goes through pynamodb, which creates its own session and client for every
+    connection and has no supported hook to inject a shared one. Every pynamodb model class
+    builds one TableConnection from its Meta on first use and keeps it across warm invocations,
+    so there is one DynamoDB client per model class, not per process. bind_model only tunes
+    these connections through the Meta settings, and get_connection shares one Connection per
+    region and endpoint for the calls made on a Connection directly, e.g. transactions.
+
+    Clients are tuned through environment variables:
+
+    - AWS_MAX_POOL_CONNECTIONS: Maximum pooled connections per client (default 50)
+    - AWS_TCP_KEEPALIVE: Enable TCP keep-alive on pooled connections (default true, botocore
+      clients only, pynamodb has no setting for it)
+    - AWS_RETRY_MODE: botocore retry mode, legacy, standard or adaptive (default standard,
+      botocore clients only, pynamodb always uses standard)
+    - AWS_MAX_ATTEMPTS: Total attempts per call, including the first one (default 3)
+    - AWS_CONNECT_TIMEOUT / AWS_READ_TIMEOUT: Timeouts in seconds (default 5 and 30)
+    """
+
+    def __init__(self):
+        self.max_pool_connections = int(os.getenv('AWS_MAX_POOL_CONNECTIONS') or 50)
+        self.tcp_keepalive = os.getenv('AWS_TCP_KEEPALIVE', 'true') != 'false'
+        self.retry_mode = os.getenv('AWS_RETRY_MODE') or 'standard'
+        self.max_attempts = int(os.getenv('AWS_MAX_ATTEMPTS') or 3)
+        self.connect_timeout = float(os.getenv('AWS_CONNECT_TIMEOUT') or 5)
+        self.read_timeout = float(os.getenv('AWS_READ_TIMEOUT') or 30)
+
+        self.lock = threading.Lock()
+        self.logger = Logger()
+        self.session: Optional[botocore.session.Session] = None
+        self.clients: Dict[Tuple[str, Optional[str], Optional[str]], Any] = {}
+        # Options of the config override each client was created with
+        self.client_options: Dict[Tuple[str, Optional[str], Optional[str]], dict] = {}
+        self.connections: Dict[Tuple[Optional[str], Optional[str]], Connection] = {}
+
+    def get_config(self, service_name: str) -> Config:
+        """Get the tuned client config of a service.
+
+        :param str service_name: The AWS service name, e.g. 'dynamodb'
+        :return Config: The botocore client config
+        """
+        return Config(
+            # Requests are built by pynamodb, skip botocore validation like pynamodb does
+            parameter_validation=service_name != 'dynamodb',
+            max_pool_connections=self.max_pool_connections,
+            tcp_keepalive=self.tcp_keepalive,
+            connect_timeout=self.connect_timeout,
+            read_timeout=self.read_timeout,
+            retries={'mode': self.retry_mode, 'total_max_attempts': self.max_attempts},
+        )
+
+    def get_client(
+        self,
+        service_name: str,
+        region_name: Optional[str] = None,
+        endpoint_url: Optional[str] = None,
+        config: Optional[Config] = None,
+    ) -> Any:
+        """Get the shared client of a service, creating it on first use.
+
+        botocore clients are thread-safe, client creation is not, so creation is locked.
+
+        :param str service_name: The AWS service name, e.g. 'dynamodb' or 'bedrock-runtime'
+        :param str region_name: Optional region, the REGION environment variable by default
+        :param str endpoint_url: Optional endpoint override, e.g. for a local stand-in
+        :param Config config: Optional settings merged over the tuned config when the client is
+            created, e.g. longer read timeouts for streaming calls. A cached client keeps the
+            config it was created with, a different one is logged as a warning.
+        :return Any: The botocore client
+        """
+        region_name = region_name or os.getenv('REGION')
+        client_key = (service_name, region_name, endpoint_url)
+        client = self.clients.get(client_key)
+        if client is not None:
+            if config and self.get_options(config) != self.client_options[client_key]:
+                self.logger.warning(
+                    {
+                        'message': 'Cached client requested with a different config, '
+                        'the config it was created with is kept',
+                        'service_name': service_name,
+                        'region_name': region_name,
+                    }
+                )
+            return client
+
+        with self.lock:
+            if client_key not in self.clients:
+                if self.session is None:
+                    self.session = botocore.session.get_session()
+
+                self.clients[client_key] = self.session.create_client(
+                    service_name,
+                    region_name=region_name,
+                    endpoint_url=endpoint_url,
+                    config=self.get_config(service_name).merge(config)
+                    if config
+                    else self.get_config(service_name),
+                )
+                self.client_options[client_key] = self.get_options(config)
+            return self.clients[client_key]
+
+    @staticmethod
+    def get_options(config: Optional[Config]) -> dict:
+        """Get the options of a client config, for comparing configs.
+
+        :param Config config: The botocore client config
+        :return dict: The config options, empty when no config is given
+        """
+        if config is None:
+            return {}
+        return {option: getattr(config, option) for option in Config.OPTION_DEFAULTS}
+
+    def get_connection_settings(self) -> dict:
+        """Get the tuned pynamodb connection settings.
+
+        :return dict: The Connection and Model Meta settings
+        """
+        return {
+            'connect_timeout_seconds': self.connect_timeout,
+            'read_timeout_seconds': self.read_timeout,
+            # pynamodb counts retries after the first attempt
+            'max_retry_attempts': max(self.max_attempts - 1, 0),
+            'max_pool_connections': self.max_pool_connections,
+        }
+
+    def get_connection(
+        self, region: Optional[str] = None, host: Optional[str] = None
+    ) -> Connection:
+        """Get the shared pynamodb Connection of a region and endpoint, creating it on first use.
+
+        The Connection creates its client on the first request and keeps it, so every
+        repository sharing the Connection reuses one client and connection pool.
+
+        :param str region: Optional region, the REGION environment variable by default
+        :param str host: Optional endpoint override, e.g. for a local stand-in
+        :return Connection: The pynamodb connection
+        """
+        connection_key = (region or os.getenv('REGION'), host)
+        connection = self.connections.get(connection_key)
+        if connection is not None:
+            return connection
+
+        with self.lock:
+            if connection_key not in self.connections:
+                self.connections[connection_key] = Connection(
+                    region=connection_key[0], host=host, **self.get_connection_settings()
+                )
+            return self.connections[connection_key]
+
+    def bind_model(self, model: Type[Model]) -> None:
+        """Apply the tuned connection settings to a pynamodb model through its Meta.
+
+        pynamodb builds the connection of a model once, from its Meta, on the first request,
+        so models must be bound before they are used. The connection and its client are kept
+        on the model class and reused across warm invocations, but they are not shared with
+        other model classes or with get_connection.
+
+        :param Type[Model] model: The pynamodb model class
+        """
+        for name, value in self.get_connection_settings().items():
+            setattr(model.Meta, name, value)
+
+
+# Shared by every repository in the process, so clients are kept across warm invocations
+client_registry = ClientRegistry()
@@ -0,0 +1,139 @@
+import base64
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from shared_modules.constants.entity_constants import EntityConstants
+from shared_modules.models.schema.entity import EntitySchema
+
+
+def _deserialize_list(values: list) -> list:
+    return [deserialize_attribute(value) for value in values]
+
+
+def _deserialize_map(values: dict) -> dict:
+    return {key: deserialize_attribute(value) for key, value in values.items()}
+
+
+def _deserialize_number(value: str) -> Union[int, Decimal]:
+    # Parsed exactly like the boto3 TypeDeserializer, with integral numbers as int
+    number = Decimal(value)
+    return int(number) if number == number.to_integral_value() else number
+
+
+def _deserialize_binary(value: Union[str, bytes]) -> bytes:
+    # Stream records carry binary values base64 encoded, API responses as raw bytes
+    return base64.b64decode(value) if isinstance(value, str) else bytes(value)
+
+
+# DynamoDB attribute value type to Python value converters
+ATTRIBUTE_DESERIALIZERS: Dict[str, Callable[[Any], Any]] = {
+    'S': str,
+    'N': _deserialize_number,
+    'B': _deserialize_binary,
+    'BOOL': bool,
+    'NULL': lambda _: None,
+    'L': _deserialize_list,
+    'M': _deserialize_map,
+    'SS': list,
+    'NS': lambda values: [_deserialize_number(value) for value in values],
+    'BS': lambda values: [_deserialize_binary(value) for value in values],
+}
+
+
+def encode_json_value(value: Any) -> Any:
+    """Convert a deserialized value json.dumps does not handle (Decimal, bytes) to JSON.
+
+    :param Any value: The value
+    :return Any: A JSON serializable value
+    """
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode('ascii')
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def deserialize_attribute(value: Dict[str, Any]) -> Any:
+    """Convert a raw DynamoDB attribute value (e.g. {'S': 'value'}) to a Python value.
+
+    :param dict value: The raw DynamoDB attribute value
+    :return Any: The Python value
+    """
+    for type_name, raw_value in value.items():
+        return ATTRIBUTE_DESERIALIZERS[type_name](raw_value)
+
+
+class EntityAssembler:
+    """
+    Assembles EntitySchema objects from raw DynamoDB profile items
+
+    Each profile item rangeKey (STARTUP#METADATA, ENABLER#CONTACTS, etc.) is mapped to the
+    attributes it holds through a dispatch table compiled once from
+    EntityConstants.PROFILE_ITEM_FIELDS. Items are read straight from the raw
+    DynamoDB response, so every attribute is deserialized exactly once.
+    """
+
+    def __init__(self):
+        self.item_fields: Dict[str, Tuple[str, ...]] = dict(EntityConstants.PROFILE_ITEM_FIELDS)
+
+    def is_profile_item(self, item: Dict[str, Any]) -> bool:
+        """Check if a raw item is a profile item and not a saved profile, suggestion
+        or request item sharing the hashKey.
+
+        :param dict item: The raw DynamoDB item
+        :return bool: True if the item holds profile data
+        """
+        return item['rangeKey']['S'] in self.item_fields
+
+    def new_entity_data(self, item: Dict[str, Any]) -> dict:
+        """Create the base entity data for the entity the raw item belongs to.
+
+        :param dict item: The raw DynamoDB item
+        :return dict: The base entity data
+        """
+        hash_key = item['hashKey']['S']
+        entity_type, entity_id = hash_key.split('#')[:2]
+        return {
+            'startupId' if entity_type == 'STARTUP' else 'enablerId': entity_id,
+            '__typename': 'Startup' if entity_type == 'STARTUP' else 'Enabler',
+            'hashKey': hash_key,
+            'rangeKey': item['rangeKey']['S'],
+        }
+
+    def apply_item(self, entity_data: dict, item: Dict[str, Any]) -> None:
+        """Add the attributes of a raw profile item to its entity data.
+
+        :param dict entity_data: The entity data to update
+        :param dict item: The raw DynamoDB profile item
+        """
+        for field in self.item_fields.get(item['rangeKey']['S'], ()):
+            value = item.get(field)
+            entity_data[field] = deserialize_attribute(value) if value is not None else None
+
+    def assemble(
+        self, entity_map: Dict[str, dict], item: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Add a raw item to the entity data of its hashKey, creating it when needed.
+
+        :param dict entity_map: Map of hashKey to entity data
+        :param dict item: The raw DynamoDB item
+        :return Optional[dict]: The updated entity data, None if the item is not a profile item
+        """
+        if not self.is_profile_item(item):
+            return None
+
+        hash_key = item['hashKey']['S']
+        entity_data = entity_map.get(hash_key)
+        if entity_data is None:
+            entity_data = entity_map[hash_key] = self.new_entity_data(item)
+
+        self.apply_item(entity_data, item)
+        return entity_data
+
+    def to_schema(self, entity_data: dict) -> EntitySchema:
+        """Build the EntitySchema of the assembled entity data.
+
+        :param dict entity_data: The assembled entity data
+        :return EntitySchema: The entity profile
+        """
+        return EntitySchema(**entity_data)
@@ -0,0 +1,240 @@
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from itertools import zip_longest
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from shared_modules.models.schema.entity import EntitySchema
+from shared_modules.utils.token_estimator import estimate_tokens
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+STOPWORDS = frozenset(
+    (
+        'a about an and any are as at be by can do for from has have how i in is it me my of on '
+        'or our so that the their them there these they this to us was we what which who will '
+        'with you your'
+    ).split()
+)
+
+# Entity fields searched by the ranker and the weight of their terms. Names and the fields
+# describing what an entity does or offers count more than free text descriptions.
+FIELD_WEIGHTS: Tuple[Tuple[str, int], ...] = (
+    ('startUpName', 3),
+    ('enablerName', 3),
+    ('industries', 2),
+    ('industryFocus', 2),
+    ('supportType', 2),
+    ('organizationType', 2),
+    ('startupStage', 1),
+    ('startupStagePreference', 1),
+    ('fundingStageFocus', 1),
+    ('revenueModel', 1),
+    ('preferredBusinessModels', 1),
+    ('description', 1),
+)
+
+
+def normalize_term(term: str) -> Optional[str]:
+    """Normalize a lowercase word to a search term, dropping stopwords and plural endings.
+
+    :param str term: The lowercase word
+    :return Optional[str]: The search term, None if the word is not searchable
+    """
+    if term in STOPWORDS or len(term) < 2:
+        return None
+    if len(term) > 3 and term.endswith('s') and not term.endswith('ss'):
+        return term[:-1]
+    return term
+
+
+def tokenize(text: str) -> List[str]:
+    """Split a text into lowercase search terms, dropping stopwords and plural endings.
+
+    :param str text: The text to tokenize
+    :return List[str]: The search terms
+    """
+    terms = (normalize_term(term) for term in TOKEN_PATTERN.findall(text.lower()))
+    return [term for term in terms if term]
+
+
+class EntityRanker:
+    """
+    In-process BM25 ranking of entities against a chat query
+
+    Each entity is indexed as a bag of terms from its name, industries, support types, stages
+    and description, with per-field weights, and added to an inverted index. The index is kept
+    across warm invocations, so only new or changed entities are tokenized and a query only
+    visits the entities sharing one of its terms.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.documents: Dict[str, Tuple[EntitySchema, Dict[str, int], int]] = {}
+        self.postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self.normalized_terms: Dict[str, Optional[str]] = {}
+        self.lock = threading.Lock()
+
+    def get_term_counts(self, entity: EntitySchema) -> Dict[str, int]:
+        """Count the weighted search terms of an entity.
+
+        :param EntitySchema entity: The entity
+        :return Dict[str, int]: Map of search term to its weighted count
+        """
+        weighted_texts: Dict[int, List[str]] = defaultdict(list)
+        for field, weight in FIELD_WEIGHTS:
+            value = getattr(entity, field, None)
+            if value:
+                weighted_texts[weight].extend(value if isinstance(value, list) else [str(value)])
+
+        term_counts = Counter(['startup' if entity.startupId else 'enabler'])
+        for weight, texts in weighted_texts.items():
+            words = Counter(TOKEN_PATTERN.findall(' '.join(texts).lower()))
+            for word, count in words.items():
+                if word not in self.normalized_terms:
+                    self.normalized_terms[word] = normalize_term(word)
+                term = self.normalized_terms[word]
+                if term:
+                    term_counts[term] += count * weight
+
+        return term_counts
+
+    def index_entity(self, entity: EntitySchema) -> Tuple[str, int]:
+        """Add an entity to the index, or replace it if it changed since it was indexed.
+
+        :param EntitySchema entity: The entity
+        :return Tuple[str, int]: The document key and the weighted document length
+        """
+        document_key = entity.hashKey or entity.startupId or entity.enablerId or str(id(entity))
+        document = self.documents.get(document_key)
+        if document and (document[0] is entity or document[0] == entity):
+            return document_key, document[2]
+
+        term_counts = self.get_term_counts(entity)
+        document_length = sum(term_counts.values())
+        with self.lock:
+            if document:
+                for term in document[1]:
+                    self.postings[term].pop(document_key, None)
+            for term, count in term_counts.items():
+                self.postings[term][document_key] = count
+            self.documents[document_key] = (entity, term_counts, document_length)
+
+        return document_key, document_length
+
+    def score(
+        self, query_terms: Dict[str, float], entities: List[EntitySchema]
+    ) -> List[Tuple[float, EntitySchema]]:
+        """Score entities against weighted query terms with BM25.
+
+        :param dict query_terms: Map of query term to its weight
+        :param List[EntitySchema] entities: The entities to score
+        :return List[Tuple[float, EntitySchema]]: The entities with a positive score, best first
+        """
+        candidates: Dict[str, Tuple[EntitySchema, int]] = {}
+        for entity in entities:
+            document_key, document_length = self.index_entity(entity)
+            candidates[document_key] = (entity, document_length)
+
+        if not candidates or not query_terms:
+            return []
+
+        entity_count = len(candidates)
+        average_length = sum(length for _, length in candidates.values()) / entity_count or 1
+        length_norms = {
+            document_key: self.k1 * (1 - self.b + self.b * length / average_length)
+            for document_key, (_, length) in candidates.items()
+        }
+        # Other threads may be indexing entities, so read the postings under the lock
+        with self.lock:
+            term_postings = {
+                term: list(self.postings[term].items())
+                for term in query_terms
+                if term in self.postings
+            }
+
+        scores: Dict[str, float] = defaultdict(float)
+        for term, query_weight in query_terms.items():
+            posting = [
+                (document_key, count)
+                for document_key, count in term_postings.get(term, [])
+                if document_key in candidates
+            ]
+            if not posting:
+                continue
+
+            idf = math.log(1 + (entity_count - len(posting) + 0.5) / (len(posting) + 0.5))
+            term_weight = query_weight * idf * (self.k1 + 1)
+            for document_key, count in posting:
+                scores[document_key] += term_weight * count / (count + length_norms[document_key])
+
+        ranked_keys = sorted(scores, key=scores.get, reverse=True)
+        return [(scores[document_key], candidates[document_key][0]) for document_key in ranked_keys]
+
+    @staticmethod
+    def get_fallback_entities(entities: List[EntitySchema]) -> List[EntitySchema]:
+        """Order entities by alternating startups and enablers, keeping their order within a type.
+
+        :param List[EntitySchema] entities: The candidate entities
+        :return List[EntitySchema]: The entities, startups and enablers interleaved
+        """
+        startups = [entity for entity in entities if entity.startupId]
+        enablers = [entity for entity in entities if not entity.startupId]
+        return [entity for pair in zip_longest(startups, enablers) for entity in pair if entity]
+
+    def select(
+        self,
+        query: str,
+        entities: List[EntitySchema],
+        top_k: int,
+        token_budget: int,
+        history: Optional[Iterable[str]] = None,
+        history_weight: float = 0.3,
+        fallback_k: int = 0,
+    ) -> List[EntitySchema]:
+        """Select the entities most relevant to a query that fit in a token budget.
+
+        When no entity shares a term with the query, up to fallback_k entities are selected by
+        alternating startups and enablers, so the prompt still has some ecosystem context.
+
+        :param str query: The user query
+        :param List[EntitySchema] entities: The candidate entities
+        :param int top_k: The maximum number of entities to select
+        :param int token_budget: The maximum estimated tokens of the selected entities' JSON
+        :param Iterable[str] history: Optional recent chat messages, their terms count less
+        :param float history_weight: The weight of history terms relative to query terms
+        :param int fallback_k: The maximum number of entities to select when none matches
+        :return List[EntitySchema]: The selected entities, most relevant first
+        """
+        query_terms: Dict[str, float] = {}
+        for text in history or []:
+            for term in tokenize(text):
+                query_terms[term] = history_weight
+        for term in tokenize(query):
+            query_terms[term] = 1.0
+
+        ranked_entities = [entity for _, entity in self.score(query_terms, entities)]
+        if not ranked_entities:
+            ranked_entities = self.get_fallback_entities(entities)
+            top_k = min(top_k, fallback_k)
+
+        selected = []
+        used_tokens = 0
+        for entity in ranked_entities:
+            if len(selected) >= top_k:
+                break
+
+            entity_tokens = estimate_tokens(entity.model_dump_json(exclude_none=True))
+            if used_tokens + entity_tokens > token_budget:
+                continue
+
+            selected.append(entity)
+            used_tokens += entity_tokens
+
+        return selected
+
+
+# Shared by every LLMUsecase in the process, so the index is kept across warm invocations
+entity_ranker = EntityRanker()
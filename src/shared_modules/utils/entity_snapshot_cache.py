@@ -0,0 +1,101 @@
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from shared_modules.models.schema.entity import EntitySchema
+
+
+class EntitySnapshotCache:
+    """
+    In-process cache of entity catalog snapshots
+
+    A single instance lives at module scope so snapshots survive across warm Lambda
+    invocations. Each snapshot is stored with the catalog version it was read at and is only
+    served while that version is still current and the snapshot is younger than its TTL.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None):
+        self.ttl_seconds = (
+            ttl_seconds
+            if ttl_seconds is not None
+            else float(os.getenv('ENTITY_SNAPSHOT_TTL_SECONDS') or 300)
+        )
+        # Snapshots read from an eventually consistent index may miss a write that was already
+        # committed, so they are only kept for this long
+        self.scan_ttl_seconds = min(
+            float(os.getenv('ENTITY_SNAPSHOT_SCAN_TTL_SECONDS') or 30), self.ttl_seconds
+        )
+        self.snapshots: Dict[Tuple[str, ...], Tuple[Optional[str], float, List[EntitySchema]]] = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_snapshot_key(fields: Optional[Iterable[str]] = None) -> Tuple[str, ...]:
+        """Get the key of the snapshot holding the given entity fields.
+
+        :param Iterable[str] fields: The entity fields of the snapshot, all fields when not provided
+        :return Tuple[str, ...]: The snapshot key
+        """
+        return tuple(sorted(set(fields))) if fields else ()
+
+    def get(
+        self, catalog_version: Optional[str], fields: Optional[Iterable[str]] = None
+    ) -> Optional[List[EntitySchema]]:
+        """Get the entities of a snapshot if it is still fresh.
+
+        :param Optional[str] catalog_version: The current catalog version
+        :param Iterable[str] fields: The entity fields of the snapshot, all fields when not provided
+        :return Optional[List[EntitySchema]]: A copy of the cached entity list, None on a miss
+        """
+        if self.ttl_seconds <= 0:
+            return None
+
+        with self.lock:
+            snapshot = self.snapshots.get(self.get_snapshot_key(fields))
+
+        if not snapshot:
+            return None
+
+        snapshot_version, expires_at, entities = snapshot
+        is_expired = time.monotonic() >= expires_at
+        if is_expired or snapshot_version != catalog_version:
+            return None
+
+        return list(entities)
+
+    def put(
+        self,
+        catalog_version: Optional[str],
+        entities: List[EntitySchema],
+        fields: Optional[Iterable[str]] = None,
+        ttl_seconds: Optional[float] = None,
+    ) -> None:
+        """Store the entities read at the given catalog version.
+
+        The catalog version must be read before the entities so a mutation made during the read
+        leaves the snapshot on an older version and is picked up by the next call.
+
+        :param Optional[str] catalog_version: The catalog version read before the entities
+        :param List[EntitySchema] entities: The entities read
+        :param Iterable[str] fields: The entity fields of the snapshot, all fields when not provided
+        :param Optional[float] ttl_seconds: The TTL of the snapshot, the cache TTL when not provided
+        """
+        ttl_seconds = min(ttl_seconds, self.ttl_seconds) if ttl_seconds else self.ttl_seconds
+        if ttl_seconds <= 0:
+            return
+
+        with self.lock:
+            self.snapshots[self.get_snapshot_key(fields)] = (
+                catalog_version,
+                time.monotonic() + ttl_seconds,
+                list(entities),
+            )
+
+    def clear(self) -> None:
+        """Drop all snapshots."""
+        with self.lock:
+            self.snapshots.clear()
+
+
+# Shared by every EntityRepository in the process, so it is kept across warm invocations
+entity_snapshot_cache = EntitySnapshotCache()
@@ -0,0 +1,82 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class FlushPolicy(ABC):
+    """
+    Decides when buffered stream text is flushed downstream
+
+    The stream calls add for every delta, flushes when add returns True and then calls
+    record_flush. A policy instance holds the state of one stream, so use a new one per stream.
+    """
+
+    @abstractmethod
+    def add(self, text: str, now: float) -> bool:
+        """Buffer a delta and check if the buffer should be flushed.
+
+        :param str text: The delta text
+        :param float now: The current monotonic time in seconds
+        :return bool: True if the buffer should be flushed
+        """
+
+    @abstractmethod
+    def record_flush(self, now: float) -> None:
+        """Record that the buffer was flushed.
+
+        :param float now: The current monotonic time in seconds
+        """
+
+
+class CountFlushPolicy(FlushPolicy):
+    """Flushes every fixed number of deltas, whatever their size or timing."""
+
+    def __init__(self, max_deltas: int):
+        self.max_deltas = max_deltas
+        self.pending_deltas = 0
+
+    def add(self, text: str, now: float) -> bool:
+        self.pending_deltas += 1
+        return self.pending_deltas >= self.max_deltas
+
+    def record_flush(self, now: float) -> None:
+        self.pending_deltas = 0
+
+
+class AdaptiveFlushPolicy(FlushPolicy):
+    """
+    Flushes when enough text is buffered or the oldest buffered text has waited too long
+
+    Slow streams are flushed by the latency bound, so text never waits more than
+    max_latency_seconds plus the gap to the next delta. Fast streams are flushed by size, and
+    every flush is held back until 1 / max_flushes_per_second after the previous one, which caps
+    the mutation rate.
+    """
+
+    def __init__(self, max_latency_seconds: float, min_bytes: int, max_flushes_per_second: float):
+        self.max_latency_seconds = max_latency_seconds
+        self.min_bytes = min_bytes
+        self.min_flush_interval = 1 / max_flushes_per_second if max_flushes_per_second else 0
+        self.pending_bytes = 0
+        self.pending_since: Optional[float] = None
+        self.last_flush_at: Optional[float] = None
+
+    def add(self, text: str, now: float) -> bool:
+        if not text:
+            return False
+
+        self.pending_bytes += len(text.encode('utf-8'))
+        if self.pending_since is None:
+            self.pending_since = now
+
+        if self.last_flush_at is not None and now - self.last_flush_at < self.min_flush_interval:
+            return False
+
+        return (
+            self.pending_bytes >= self.min_bytes
+            or now - self.pending_since >= self.max_latency_seconds
+        )
+
+    def record_flush(self, now: float) -> None:
+        self.pending_bytes = 0
+        self.pending_since = None
+        self.last_flush_at = now
@@ -0,0 +1,109 @@
+from typing import Dict, List
+
+from shared_modules.models.schema.prompt import PromptSection
+from shared_modules.utils.token_estimator import estimate_tokens, truncate_to_tokens
+
+# A single oversized entry is truncated rather than dropped when at least this many tokens fit
+MIN_TRUNCATED_ITEM_TOKENS = 50
+
+
+class PromptBudgeter:
+    """
+    Fits prompt sections into a total token budget
+
+    Every trimmable section is first cut down to its own allowance. Budget left unused by small
+    sections is then lent to the trimmable sections in priority order, and if the prompt is still
+    over budget, sections are trimmed from the lowest priority up. Trimming drops entries from
+    the end of a section and notes how many were dropped, so entries must be passed most
+    important first.
+    """
+
+    def __init__(self, token_budget: int):
+        self.token_budget = token_budget
+
+    def get_allocations(
+        self, sections: List[PromptSection], reserved_tokens: int = 0
+    ) -> Dict[str, int]:
+        """Get the token allocation of every trimmable section.
+
+        :param List[PromptSection] sections: The prompt sections
+        :param int reserved_tokens: Tokens used by the fixed prompt text around the sections
+        :return Dict[str, int]: Map of section name to its token allocation
+        """
+        needed = {
+            section.name: sum(estimate_tokens(item + section.separator) for item in section.items)
+            for section in sections
+        }
+        trimmable = sorted(
+            (section for section in sections if section.max_tokens is not None),
+            key=lambda section: section.priority,
+            reverse=True,
+        )
+
+        available = self.token_budget - reserved_tokens
+        available -= sum(needed[section.name] for section in sections if section.max_tokens is None)
+        allocations = {
+            section.name: min(needed[section.name], section.max_tokens) for section in trimmable
+        }
+        leftover = available - sum(allocations.values())
+
+        if leftover > 0:
+            for section in trimmable:
+                extra = min(leftover, needed[section.name] - allocations[section.name])
+                allocations[section.name] += extra
+                leftover -= extra
+
+        for section in reversed(trimmable):
+            if leftover >= 0:
+                break
+            cut = min(-leftover, allocations[section.name])
+            allocations[section.name] -= cut
+            leftover += cut
+
+        return allocations
+
+    def render_section(self, section: PromptSection, max_tokens: int) -> str:
+        """Render the entries of a section that fit in a token allocation.
+
+        :param PromptSection section: The prompt section
+        :param int max_tokens: The token allocation of the section
+        :return str: The section text
+        """
+        item_tokens_list = [estimate_tokens(item + section.separator) for item in section.items]
+        if sum(item_tokens_list) <= max_tokens:
+            return section.separator.join(section.items)
+
+        # Entries will be dropped, so keep room for the omission note
+        limit = max_tokens - estimate_tokens((section.omission_note or '') + section.separator)
+        items = []
+        used_tokens = 0
+        for item, item_tokens in zip(section.items, item_tokens_list):
+            if used_tokens + item_tokens <= limit:
+                items.append(item)
+                used_tokens += item_tokens
+                continue
+
+            if not items and limit >= MIN_TRUNCATED_ITEM_TOKENS:
+                items.append(truncate_to_tokens(item, limit - 1))
+            break
+
+        omitted_count = len(section.items) - len(items)
+        if omitted_count and section.omission_note:
+            items.append(section.omission_note.format(count=omitted_count))
+
+        return section.separator.join(items)
+
+    def fit(self, sections: List[PromptSection], reserved_tokens: int = 0) -> Dict[str, str]:
+        """Fit the sections into the token budget.
+
+        :param List[PromptSection] sections: The prompt sections
+        :param int reserved_tokens: Tokens used by the fixed prompt text around the sections
+        :return Dict[str, str]: Map of section name to its fitted text
+        """
+        allocations = self.get_allocations(sections, reserved_tokens)
+        return {
+            section.name: section.separator.join(section.items)
+            if section.max_tokens is None
+            else self.render_section(section, allocations[section.name])
+            for section in sections
+        }
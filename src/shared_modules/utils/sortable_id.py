@@ -0,0 +1,85 @@
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+# Crockford base32, the ULID alphabet. Its characters sort in the same order as their values.
+ULID_ALPHABET = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+ULID_LENGTH = 26
+RANDOM_BITS = 80
+
+
+def encode_ulid(value: int) -> str:
+    """Encode a 128-bit integer as a 26 character ULID string.
+
+    :param int value: The ULID value, the millisecond timestamp in the top 48 bits
+    :return str: The ULID string
+    """
+    characters = []
+    for _ in range(ULID_LENGTH):
+        characters.append(ULID_ALPHABET[value & 31])
+        value >>= 5
+    return ''.join(reversed(characters))
+
+
+def decode_ulid_timestamp(ulid: str) -> int:
+    """Get the millisecond timestamp a ULID was generated at.
+
+    :param str ulid: The ULID string
+    :return int: The Unix timestamp in milliseconds
+    """
+    value = 0
+    for character in ulid:
+        value = (value << 5) | ULID_ALPHABET.index(character)
+    return value >> RANDOM_BITS
+
+
+def is_ulid(value: str) -> bool:
+    """Check if a string is a ULID.
+
+    :param str value: The string to check
+    :return bool: True if the string is a ULID
+    """
+    return len(value) == ULID_LENGTH and all(character in ULID_ALPHABET for character in value)
+
+
+class UlidGenerator:
+    """
+    Generates ULIDs, 26 character IDs that sort lexicographically by creation time
+
+    IDs generated in the same millisecond by the same process increment the random part of the
+    previous ID, so they still sort in generation order.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.last_timestamp_ms = -1
+        self.last_random = 0
+
+    def generate(self, created_at: Optional[datetime] = None) -> str:
+        """Generate a ULID for now, or for a past creation time.
+
+        :param datetime created_at: Optional creation time, e.g. when migrating existing items
+        :return str: The ULID string
+        """
+        if created_at is not None:
+            timestamp_ms = int(created_at.timestamp() * 1000)
+            random_part = int.from_bytes(os.urandom(10), 'big')
+            return encode_ulid((timestamp_ms << RANDOM_BITS) | random_part)
+
+        with self.lock:
+            timestamp_ms = time.time_ns() // 1_000_000
+            if timestamp_ms <= self.last_timestamp_ms:
+                timestamp_ms = self.last_timestamp_ms
+                random_part = (self.last_random + 1) & ((1 << RANDOM_BITS) - 1)
+            else:
+                random_part = int.from_bytes(os.urandom(10), 'big')
+
+            self.last_timestamp_ms = timestamp_ms
+            self.last_random = random_part
+
+        return encode_ulid((timestamp_ms << RANDOM_BITS) | random_part)
+
+
+ulid_generator = UlidGenerator()
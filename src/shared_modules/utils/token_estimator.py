@@ -0,0 +1,33 @@
+import math
+
+# Claude tokenizers average about 3.5 characters per token on English prose and JSON, so
+# estimates run slightly high, which keeps budgets on the safe side
+CHARS_PER_TOKEN = 3.5
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of model tokens in a text without calling a tokenizer.
+
+    :param str text: The text to estimate
+    :return int: The estimated token count
+    """
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, max_tokens: int, marker: str = '...') -> str:
+    """Cut a text down to an estimated token count, keeping its beginning.
+
+    :param str text: The text to truncate
+    :param int max_tokens: The maximum estimated tokens of the result, marker included
+    :param str marker: Appended to the text when it is cut
+    :return str: The text, truncated if it was over the limit
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    max_chars = int(max_tokens * CHARS_PER_TOKEN) - len(marker)
+    if max_chars <= 0:
+        return ''
+    return text[:max_chars].rstrip() + marker
@@ -0,0 +1,65 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLLRUCache:
+    """
+    Thread-safe in-process LRU cache whose entries expire after a TTL
+
+    A single instance lives at module scope so entries survive across warm Lambda invocations.
+    When the cache is full the least recently used entry is evicted.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a value if it is cached and not expired.
+
+        :param Hashable key: The cache key
+        :return Optional[Any]: The cached value, None on a miss
+        """
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return None
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self.entries[key]
+                return None
+
+            self.entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Cache a value, evicting the least recently used entry when full.
+
+        :param Hashable key: The cache key
+        :param Any value: The value to cache
+        :param float ttl_seconds: Optional TTL of this entry, the cache TTL by default
+        """
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+
+        expires_at = time.monotonic() + (
+            ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        )
+        with self.lock:
+            self.entries[key] = (expires_at, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self.lock:
+            self.entries.clear()